@@ -0,0 +1,66 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.18;
+
+import "./RentalAgreementV2.sol";
+
+// Implementação usada pelos clones: mesma lógica da v2, mas o estado é
+// definido por initialize() em vez do construtor.
+contract RentalAgreementClone is RentalAgreementBase {
+    error AlreadyInitialized();
+
+    constructor() {
+        // Trava a própria implementação; só os clones são inicializados
+        s_initialized = true;
+    }
+
+    function initialize(
+        address _locador,
+        address _inquilino,
+        uint256 _rentAmount,
+        uint256 _deposit,
+        uint256 _startTimestamp,
+        uint256 _endTimestamp
+    ) external {
+        if (s_initialized) revert AlreadyInitialized();
+        _initialize(_locador, _inquilino, _rentAmount, _deposit, _startTimestamp, _endTimestamp);
+    }
+}
+
+// Cria contratos de aluguel como proxies mínimos (EIP-1167) apontando para
+// uma única implementação, em vez de implantar o bytecode completo a cada vez.
+contract RentalAgreementFactory {
+    address public immutable implementation;
+
+    event AgreementCreated(address indexed agreement, address indexed locador, address indexed inquilino);
+
+    error CloneFailed();
+
+    constructor() {
+        implementation = address(new RentalAgreementClone());
+    }
+
+    function createAgreement(
+        address _inquilino,
+        uint256 _rentAmount,
+        uint256 _deposit,
+        uint256 _startTimestamp,
+        uint256 _endTimestamp
+    ) external returns (address agreement) {
+        agreement = _clone(implementation);
+        // Clone e inicialização na mesma transação: ninguém consegue inicializar antes
+        RentalAgreementClone(agreement).initialize(
+            msg.sender, _inquilino, _rentAmount, _deposit, _startTimestamp, _endTimestamp
+        );
+        emit AgreementCreated(agreement, msg.sender, _inquilino);
+    }
+
+    function _clone(address target) private returns (address instance) {
+        // Bytecode do proxy mínimo EIP-1167 com o endereço da implementação embutido
+        assembly {
+            mstore(0x00, or(shr(0xe8, shl(0x60, target)), 0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000))
+            mstore(0x20, or(shl(0x78, target), 0x5af43d82803e903d91602b57fd5bf3))
+            instance := create(0, 0x09, 0x37)
+        }
+        if (instance == address(0)) revert CloneFailed();
+    }
+}
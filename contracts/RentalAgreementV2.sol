@@ -0,0 +1,309 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.18;
+
+// Versão 2 do RentalAgreement: mesma ABI de funções e eventos usada pelas
+// views, com o estado compactado em quatro slots e erros customizados no
+// lugar das mensagens de revert. A lógica fica na base abstrata, usada tanto
+// pelo contrato implantado diretamente quanto pelos clones da fábrica.
+abstract contract RentalAgreementBase {
+    // slot 0: locador (20 bytes) + início (8 bytes) + flags (4 bytes)
+    address private s_locador;
+    uint64 private s_startTimestamp;
+    bool private s_isTerminated;
+    bool private s_locadorSigned;
+    bool private s_inquilinoSigned;
+    bool private s_isActive;
+
+    // slot 1: inquilino (20 bytes) + término (8 bytes)
+    address private s_inquilino;
+    uint64 private s_endTimestamp;
+
+    // slot 2: valores em wei
+    uint128 private s_rentAmount;
+    uint128 private s_deposit;
+
+    // slot 3: datas de vencimento/renovação, duração e flag de inicialização
+    uint64 private s_dataVencimentoAluguel;
+    uint64 private s_dataTerminoContrato;
+    uint64 private s_duracaoContratoSegundos;
+    bool internal s_initialized;
+
+    event RentPaid(address indexed inquilino, uint256 amount);
+    event DepositPaid(address indexed inquilino, uint256 amount);
+    event ContractTerminated(address indexed locador, address indexed inquilino);
+    event AgreementSigned(address signer);
+    event ContractRenewed(address indexed locador, address indexed inquilino, uint256 newEndDate);
+    event RentPaymentPending(address indexed inquilino, uint256 dueDate);
+    event ContractExpired(address indexed locador, address indexed inquilino);
+    event PaymentLate(address indexed inquilino, uint256 daysLate);
+    event TimeSimulation(uint256 simulatedTimestamp);
+
+    error OnlyTenant();
+    error OnlyLandlord();
+    error OnlyParties();
+    error IncorrectValue(uint256 expected, uint256 received);
+    error AgreementAlreadyTerminated();
+    error NotFullySigned();
+    error AlreadyFullySigned();
+    error AlreadySigned();
+    error NotActive();
+    error NotExpired();
+    error ValueOutOfRange();
+    error InvalidSignature();
+
+    // EIP-712: as duas partes assinam os termos fora da cadeia e uma única
+    // transação registra as duas assinaturas
+    bytes32 private constant DOMAIN_TYPEHASH =
+        keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)");
+    bytes32 private constant TERMS_TYPEHASH =
+        keccak256("RentalTerms(address locador,address inquilino,uint256 rentAmount,uint256 deposit)");
+
+    function _initialize(
+        address _locador,
+        address _inquilino,
+        uint256 _rentAmount,
+        uint256 _deposit,
+        uint256 _startTimestamp,
+        uint256 _endTimestamp
+    ) internal {
+        if (
+            _rentAmount > type(uint128).max ||
+            _deposit > type(uint128).max ||
+            _endTimestamp > type(uint64).max ||
+            _startTimestamp > _endTimestamp
+        ) revert ValueOutOfRange();
+
+        s_initialized = true;
+        s_locador = _locador;
+        s_inquilino = _inquilino;
+        s_rentAmount = uint128(_rentAmount);
+        s_deposit = uint128(_deposit);
+        s_startTimestamp = uint64(_startTimestamp);
+        s_endTimestamp = uint64(_endTimestamp);
+        s_duracaoContratoSegundos = uint64(_endTimestamp - _startTimestamp);
+    }
+
+    function payRent() external payable {
+        _checkPayment(s_rentAmount);
+        payable(s_locador).transfer(msg.value);
+        emit RentPaid(msg.sender, msg.value);
+    }
+
+    function payDeposit() external payable {
+        _checkPayment(s_deposit);
+        payable(s_locador).transfer(msg.value);
+        emit DepositPaid(msg.sender, msg.value);
+    }
+
+    function _checkPayment(uint256 expected) private view {
+        if (msg.sender != s_inquilino) revert OnlyTenant();
+        if (msg.value != expected) revert IncorrectValue(expected, msg.value);
+        if (s_isTerminated) revert AgreementAlreadyTerminated();
+        if (!(s_locadorSigned && s_inquilinoSigned)) revert NotFullySigned();
+    }
+
+    function terminateContract() external {
+        if (msg.sender != s_locador) revert OnlyLandlord();
+        if (s_isTerminated) revert AgreementAlreadyTerminated();
+
+        s_isTerminated = true;
+        emit ContractTerminated(s_locador, s_inquilino);
+    }
+
+    function signAgreement() external {
+        // Uma leitura do slot 0 traz locador e todas as flags
+        bool landlordSigned = s_locadorSigned;
+        bool tenantSigned = s_inquilinoSigned;
+        if (s_isTerminated) revert AgreementAlreadyTerminated();
+        if (landlordSigned && tenantSigned) revert AlreadyFullySigned();
+
+        if (msg.sender == s_locador) {
+            if (landlordSigned) revert AlreadySigned();
+            landlordSigned = true;
+            s_locadorSigned = true;
+        } else if (msg.sender == s_inquilino) {
+            if (tenantSigned) revert AlreadySigned();
+            tenantSigned = true;
+            s_inquilinoSigned = true;
+        } else {
+            revert OnlyParties();
+        }
+        emit AgreementSigned(msg.sender);
+
+        if (landlordSigned && tenantSigned) {
+            s_isActive = true;
+        }
+    }
+
+    function signAgreementWithSignatures(bytes calldata landlordSignature, bytes calldata tenantSignature) external {
+        if (s_isTerminated) revert AgreementAlreadyTerminated();
+        if (s_locadorSigned && s_inquilinoSigned) revert AlreadyFullySigned();
+
+        bytes32 digest = termsDigest();
+        if (_recover(digest, landlordSignature) != s_locador) revert InvalidSignature();
+        if (_recover(digest, tenantSignature) != s_inquilino) revert InvalidSignature();
+
+        s_locadorSigned = true;
+        s_inquilinoSigned = true;
+        s_isActive = true;
+        emit AgreementSigned(s_locador);
+        emit AgreementSigned(s_inquilino);
+    }
+
+    function termsDigest() public view returns (bytes32) {
+        bytes32 domainSeparator = keccak256(
+            abi.encode(
+                DOMAIN_TYPEHASH,
+                keccak256("RentalAgreement"),
+                keccak256("2"),
+                block.chainid,
+                address(this)
+            )
+        );
+        bytes32 structHash = keccak256(
+            abi.encode(TERMS_TYPEHASH, s_locador, s_inquilino, uint256(s_rentAmount), uint256(s_deposit))
+        );
+        return keccak256(abi.encodePacked("\x19\x01", domainSeparator, structHash));
+    }
+
+    function _recover(bytes32 digest, bytes calldata signature) private pure returns (address signer) {
+        if (signature.length != 65) revert InvalidSignature();
+        bytes32 r = bytes32(signature[0:32]);
+        bytes32 s = bytes32(signature[32:64]);
+        uint8 v = uint8(signature[64]);
+        // Rejeita assinaturas maleáveis (s na metade superior da curva)
+        if (uint256(s) > 0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF5D576E7357A4501DDFE92F46681B20A0) revert InvalidSignature();
+        signer = ecrecover(digest, v, r, s);
+        if (signer == address(0)) revert InvalidSignature();
+    }
+
+    function configurarDataVencimento(uint256 dias) external {
+        if (msg.sender != s_locador) revert OnlyLandlord();
+        uint256 vencimento = block.timestamp + (dias * 1 days);
+        if (vencimento > type(uint64).max) revert ValueOutOfRange();
+        s_dataVencimentoAluguel = uint64(vencimento);
+    }
+
+    function verificarPagamento() external {
+        if (block.timestamp > s_dataVencimentoAluguel && !s_isTerminated) {
+            emit RentPaymentPending(s_inquilino, s_dataVencimentoAluguel);
+        }
+    }
+
+    function autoRenew() public {
+        if (s_isTerminated) revert AgreementAlreadyTerminated();
+        if (!s_isActive) revert NotActive();
+        if (block.timestamp < s_dataTerminoContrato) revert NotExpired();
+
+        uint64 newEndTimestamp = s_dataTerminoContrato + s_duracaoContratoSegundos;
+        s_dataTerminoContrato = newEndTimestamp;
+
+        emit ContractRenewed(s_locador, s_inquilino, newEndTimestamp);
+    }
+
+    function checkAndRenew() external {
+        if (block.timestamp < s_endTimestamp) revert NotExpired();
+        autoRenew();
+    }
+
+    // Getters com os mesmos nomes e tipos de retorno da versão 1
+
+    function locador() external view returns (address) {
+        return s_locador;
+    }
+
+    function inquilino() external view returns (address) {
+        return s_inquilino;
+    }
+
+    function rentAmount() external view returns (uint256) {
+        return s_rentAmount;
+    }
+
+    function deposit() external view returns (uint256) {
+        return s_deposit;
+    }
+
+    function isTerminated() external view returns (bool) {
+        return s_isTerminated;
+    }
+
+    function locadorSigned() external view returns (bool) {
+        return s_locadorSigned;
+    }
+
+    function inquilinoSigned() external view returns (bool) {
+        return s_inquilinoSigned;
+    }
+
+    function isActive() external view returns (bool) {
+        return s_isActive;
+    }
+
+    function dataVencimentoAluguel() external view returns (uint256) {
+        return s_dataVencimentoAluguel;
+    }
+
+    function dataTerminoContrato() external view returns (uint256) {
+        return s_dataTerminoContrato;
+    }
+
+    function duracaoContratoSegundos() external view returns (uint256) {
+        return s_duracaoContratoSegundos;
+    }
+
+    function startTimestamp() external view returns (uint256) {
+        return s_startTimestamp;
+    }
+
+    function endTimestamp() external view returns (uint256) {
+        return s_endTimestamp;
+    }
+
+    function getDepositAmount() external view returns (uint256) {
+        return s_deposit;
+    }
+
+    function getRentAmount() external view returns (uint256) {
+        return s_rentAmount;
+    }
+
+    function getContractEndDate() external view returns (uint256) {
+        return s_dataTerminoContrato;
+    }
+
+    function isFullySigned() external view returns (bool) {
+        return s_locadorSigned && s_inquilinoSigned;
+    }
+
+    function isContractActive() external view returns (bool) {
+        return !s_isTerminated;
+    }
+
+    function getContractState() external view returns (
+        address, address, uint256, uint256, bool, bool, bool, bool
+    ) {
+        return (
+            s_locador,
+            s_inquilino,
+            s_rentAmount,
+            s_deposit,
+            s_isTerminated,
+            s_locadorSigned,
+            s_inquilinoSigned,
+            s_isActive
+        );
+    }
+}
+
+contract RentalAgreementV2 is RentalAgreementBase {
+    constructor(
+        address _inquilino,
+        uint256 _rentAmount,
+        uint256 _deposit,
+        uint256 _startTimestamp,
+        uint256 _endTimestamp
+    ) {
+        _initialize(msg.sender, _inquilino, _rentAmount, _deposit, _startTimestamp, _endTimestamp);
+    }
+}
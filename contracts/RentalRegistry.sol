@@ -0,0 +1,249 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.18;
+
+// Registro único com vários contratos de aluguel: criar um acordo é uma
+// escrita em storage em vez de uma implantação, e todos os eventos saem de
+// um só endereço. As operações são as do RentalAgreement com o id do acordo
+// como primeiro argumento.
+contract RentalRegistry {
+    struct Agreement {
+        // slot 0: locador + início + flags
+        address locador;
+        uint64 startTimestamp;
+        bool isTerminated;
+        bool locadorSigned;
+        bool inquilinoSigned;
+        bool isActive;
+        // slot 1: inquilino + término
+        address inquilino;
+        uint64 endTimestamp;
+        // slot 2: valores em wei
+        uint128 rentAmount;
+        uint128 deposit;
+        // slot 3: renovação
+        uint64 dataTerminoContrato;
+        uint64 duracaoContratoSegundos;
+    }
+
+    uint256 public nextAgreementId = 1;
+    mapping(uint256 => Agreement) private s_agreements;
+
+    event AgreementCreated(uint256 indexed agreementId, address indexed locador, address indexed inquilino);
+    event RentPaid(uint256 indexed agreementId, address indexed inquilino, uint256 amount);
+    event DepositPaid(uint256 indexed agreementId, address indexed inquilino, uint256 amount);
+    event ContractTerminated(uint256 indexed agreementId, address indexed locador, address indexed inquilino);
+    event AgreementSigned(uint256 indexed agreementId, address signer);
+    event ContractRenewed(uint256 indexed agreementId, uint256 newEndDate);
+
+    error UnknownAgreement();
+    error OnlyTenant();
+    error OnlyLandlord();
+    error OnlyParties();
+    error IncorrectValue(uint256 expected, uint256 received);
+    error AgreementAlreadyTerminated();
+    error NotFullySigned();
+    error AlreadyFullySigned();
+    error AlreadySigned();
+    error NotActive();
+    error NotExpired();
+    error ValueOutOfRange();
+    error InvalidSignature();
+
+    bytes32 private constant DOMAIN_TYPEHASH =
+        keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)");
+    bytes32 private constant TERMS_TYPEHASH =
+        keccak256("RentalTerms(uint256 agreementId,address locador,address inquilino,uint256 rentAmount,uint256 deposit)");
+
+    function createAgreement(
+        address _inquilino,
+        uint256 _rentAmount,
+        uint256 _deposit,
+        uint256 _startTimestamp,
+        uint256 _endTimestamp
+    ) external returns (uint256 agreementId) {
+        if (
+            _rentAmount > type(uint128).max ||
+            _deposit > type(uint128).max ||
+            _endTimestamp > type(uint64).max ||
+            _startTimestamp > _endTimestamp
+        ) revert ValueOutOfRange();
+
+        agreementId = nextAgreementId++;
+        Agreement storage agreement = s_agreements[agreementId];
+        agreement.locador = msg.sender;
+        agreement.inquilino = _inquilino;
+        agreement.rentAmount = uint128(_rentAmount);
+        agreement.deposit = uint128(_deposit);
+        agreement.startTimestamp = uint64(_startTimestamp);
+        agreement.endTimestamp = uint64(_endTimestamp);
+        agreement.duracaoContratoSegundos = uint64(_endTimestamp - _startTimestamp);
+
+        emit AgreementCreated(agreementId, msg.sender, _inquilino);
+    }
+
+    function signAgreement(uint256 agreementId) external {
+        Agreement storage agreement = _get(agreementId);
+        bool landlordSigned = agreement.locadorSigned;
+        bool tenantSigned = agreement.inquilinoSigned;
+        if (agreement.isTerminated) revert AgreementAlreadyTerminated();
+        if (landlordSigned && tenantSigned) revert AlreadyFullySigned();
+
+        if (msg.sender == agreement.locador) {
+            if (landlordSigned) revert AlreadySigned();
+            landlordSigned = true;
+            agreement.locadorSigned = true;
+        } else if (msg.sender == agreement.inquilino) {
+            if (tenantSigned) revert AlreadySigned();
+            tenantSigned = true;
+            agreement.inquilinoSigned = true;
+        } else {
+            revert OnlyParties();
+        }
+        emit AgreementSigned(agreementId, msg.sender);
+
+        if (landlordSigned && tenantSigned) {
+            agreement.isActive = true;
+        }
+    }
+
+    // Registra de uma vez as assinaturas EIP-712 do locador e do inquilino
+    function signAgreementWithSignatures(
+        uint256 agreementId,
+        bytes calldata landlordSignature,
+        bytes calldata tenantSignature
+    ) external {
+        Agreement storage agreement = _get(agreementId);
+        if (agreement.isTerminated) revert AgreementAlreadyTerminated();
+        if (agreement.locadorSigned && agreement.inquilinoSigned) revert AlreadyFullySigned();
+
+        bytes32 digest = termsDigest(agreementId);
+        if (_recover(digest, landlordSignature) != agreement.locador) revert InvalidSignature();
+        if (_recover(digest, tenantSignature) != agreement.inquilino) revert InvalidSignature();
+
+        agreement.locadorSigned = true;
+        agreement.inquilinoSigned = true;
+        agreement.isActive = true;
+        emit AgreementSigned(agreementId, agreement.locador);
+        emit AgreementSigned(agreementId, agreement.inquilino);
+    }
+
+    function termsDigest(uint256 agreementId) public view returns (bytes32) {
+        Agreement storage agreement = s_agreements[agreementId];
+        bytes32 domainSeparator = keccak256(
+            abi.encode(DOMAIN_TYPEHASH, keccak256("RentalRegistry"), keccak256("1"), block.chainid, address(this))
+        );
+        bytes32 structHash = keccak256(
+            abi.encode(
+                TERMS_TYPEHASH,
+                agreementId,
+                agreement.locador,
+                agreement.inquilino,
+                uint256(agreement.rentAmount),
+                uint256(agreement.deposit)
+            )
+        );
+        return keccak256(abi.encodePacked("\x19\x01", domainSeparator, structHash));
+    }
+
+    function payRent(uint256 agreementId) external payable {
+        Agreement storage agreement = _get(agreementId);
+        _checkPayment(agreement, agreement.rentAmount);
+        payable(agreement.locador).transfer(msg.value);
+        emit RentPaid(agreementId, msg.sender, msg.value);
+    }
+
+    function payDeposit(uint256 agreementId) external payable {
+        Agreement storage agreement = _get(agreementId);
+        _checkPayment(agreement, agreement.deposit);
+        payable(agreement.locador).transfer(msg.value);
+        emit DepositPaid(agreementId, msg.sender, msg.value);
+    }
+
+    function terminateContract(uint256 agreementId) external {
+        Agreement storage agreement = _get(agreementId);
+        if (msg.sender != agreement.locador) revert OnlyLandlord();
+        if (agreement.isTerminated) revert AgreementAlreadyTerminated();
+
+        agreement.isTerminated = true;
+        emit ContractTerminated(agreementId, agreement.locador, agreement.inquilino);
+    }
+
+    function autoRenew(uint256 agreementId) public {
+        Agreement storage agreement = _get(agreementId);
+        if (agreement.isTerminated) revert AgreementAlreadyTerminated();
+        if (!agreement.isActive) revert NotActive();
+        if (block.timestamp < agreement.dataTerminoContrato) revert NotExpired();
+
+        uint64 newEndTimestamp = agreement.dataTerminoContrato + agreement.duracaoContratoSegundos;
+        agreement.dataTerminoContrato = newEndTimestamp;
+        emit ContractRenewed(agreementId, newEndTimestamp);
+    }
+
+    function checkAndRenew(uint256 agreementId) external {
+        if (block.timestamp < _get(agreementId).endTimestamp) revert NotExpired();
+        autoRenew(agreementId);
+    }
+
+    function getContractState(uint256 agreementId) external view returns (
+        address, address, uint256, uint256, bool, bool, bool, bool
+    ) {
+        Agreement storage agreement = s_agreements[agreementId];
+        return (
+            agreement.locador,
+            agreement.inquilino,
+            agreement.rentAmount,
+            agreement.deposit,
+            agreement.isTerminated,
+            agreement.locadorSigned,
+            agreement.inquilinoSigned,
+            agreement.isActive
+        );
+    }
+
+    function isFullySigned(uint256 agreementId) external view returns (bool) {
+        Agreement storage agreement = s_agreements[agreementId];
+        return agreement.locadorSigned && agreement.inquilinoSigned;
+    }
+
+    function isContractActive(uint256 agreementId) external view returns (bool) {
+        return !s_agreements[agreementId].isTerminated;
+    }
+
+    function getRentAmount(uint256 agreementId) external view returns (uint256) {
+        return s_agreements[agreementId].rentAmount;
+    }
+
+    function getDepositAmount(uint256 agreementId) external view returns (uint256) {
+        return s_agreements[agreementId].deposit;
+    }
+
+    function endTimestamp(uint256 agreementId) external view returns (uint256) {
+        return s_agreements[agreementId].endTimestamp;
+    }
+
+    function getContractEndDate(uint256 agreementId) external view returns (uint256) {
+        return s_agreements[agreementId].dataTerminoContrato;
+    }
+
+    function _get(uint256 agreementId) private view returns (Agreement storage agreement) {
+        agreement = s_agreements[agreementId];
+        if (agreement.locador == address(0)) revert UnknownAgreement();
+    }
+
+    function _recover(bytes32 digest, bytes calldata signature) private pure returns (address signer) {
+        if (signature.length != 65) revert InvalidSignature();
+        bytes32 r = bytes32(signature[0:32]);
+        bytes32 s = bytes32(signature[32:64]);
+        uint8 v = uint8(signature[64]);
+        if (uint256(s) > 0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF5D576E7357A4501DDFE92F46681B20A0) revert InvalidSignature();
+        signer = ecrecover(digest, v, r, s);
+        if (signer == address(0)) revert InvalidSignature();
+    }
+
+    function _checkPayment(Agreement storage agreement, uint256 expected) private view {
+        if (msg.sender != agreement.inquilino) revert OnlyTenant();
+        if (msg.value != expected) revert IncorrectValue(expected, msg.value);
+        if (agreement.isTerminated) revert AgreementAlreadyTerminated();
+        if (!(agreement.locadorSigned && agreement.inquilinoSigned)) revert NotFullySigned();
+    }
+}
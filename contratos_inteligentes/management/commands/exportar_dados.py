@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from contratos_inteligentes.utils.export import EXPORT_DATASETS, EXPORT_FORMATS, stream_export
+from contratos_inteligentes.utils.pagination import parse_date_param
+
+
+class Command(BaseCommand):
+    help = "Exporta contratos, pagamentos ou eventos em NDJSON ou CSV, sem carregar tudo em memória."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(EXPORT_DATASETS), help="Conjunto a exportar.")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson", help="Formato da saída.")
+        parser.add_argument("--since", help="Data inicial (AAAA-MM-DD).")
+        parser.add_argument("--until", help="Data final, inclusiva (AAAA-MM-DD).")
+        parser.add_argument("--status", help="Status do contrato.")
+        parser.add_argument("--output", help="Arquivo de saída (padrão: saída padrão).")
+        parser.add_argument("--chunk-size", type=int, help="Linhas lidas do banco por vez.")
+
+    def handle(self, *args, **options):
+        try:
+            lines = stream_export(
+                options["dataset"],
+                options["format"],
+                since=parse_date_param(options["since"]),
+                until=parse_date_param(options["until"], end_of_day=True),
+                contract_status=options["status"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        rows = -1 if options["format"] == "csv" else 0  # o cabeçalho do CSV não conta
+        with open(options["output"], "w", encoding="utf-8", newline="") as output:
+            for line in lines:
+                output.write(line)
+                rows += 1
+        self.stderr.write(f"{rows} linhas exportadas para {options['output']}.")
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from contratos_inteligentes.utils.check_connection import check_connection
+from contratos_inteligentes.utils.load_contract_data import (
+    FACTORY_ARTIFACT_NAME,
+    REGISTRY_ARTIFACT_NAME,
+    get_contract_artifact,
+)
+from contratos_inteligentes.utils.transaction_sender import send_transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Implanta a fábrica de clones RentalAgreementFactory (ou, com --registro, o RentalRegistry) "
+        "e exibe o endereço a configurar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--private-key", required=True, help="Chave privada da conta que paga a implantação.")
+        parser.add_argument("--gas", type=int, help="Gás enviado na implantação (padrão: estimativa da rede).")
+        parser.add_argument("--registro", action="store_true", help="Implanta o RentalRegistry em vez da fábrica.")
+
+    def handle(self, *args, **options):
+        name, setting = (
+            (REGISTRY_ARTIFACT_NAME, "RENTAL_REGISTRY_ADDRESS")
+            if options["registro"]
+            else (FACTORY_ARTIFACT_NAME, "RENTAL_FACTORY_ADDRESS")
+        )
+        try:
+            artifact = get_contract_artifact(name)
+        except FileNotFoundError:
+            raise CommandError(f"Artefato {name} não encontrado; execute scripts/compilar_contrato.py.")
+
+        web3 = check_connection()
+        account = web3.eth.account.from_key(options["private_key"])
+        deployer = web3.eth.contract(abi=artifact.abi, bytecode=artifact.bytecode)
+
+        tx_hash = send_transaction(web3, deployer.constructor(), account, gas=options["gas"])
+        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        if receipt["status"] != 1:
+            raise CommandError(f"Falha na implantação de {name} (tx {tx_hash.hex()}).")
+
+        self.stdout.write(f"{name} implantado em {receipt['contractAddress']} (gás usado: {receipt['gasUsed']}).")
+        self.stdout.write(f"Defina {setting}={receipt['contractAddress']}.")
@@ -0,0 +1,76 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+
+from contratos_inteligentes.utils.check_connection import check_connection
+from contratos_inteligentes.utils.event_backfill import run_backfill
+from contratos_inteligentes.utils.event_indexer import run_indexer
+from contratos_inteligentes.utils.load_contract_data import get_contract_artifact
+
+
+class Command(BaseCommand):
+    help = "Indexa os eventos on-chain dos contratos de aluguel em ContractEvent."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--to-block", type=int, help="Último bloco a indexar (padrão: topo da cadeia).")
+        parser.add_argument("--block-range", type=int, help="Quantidade de blocos por chamada eth_getLogs.")
+        parser.add_argument("--loop", action="store_true", help="Continua indexando novos blocos.")
+        parser.add_argument("--interval", type=float, default=15, help="Segundos entre execuções no modo --loop.")
+        parser.add_argument("--backfill", action="store_true", help="Indexação histórica em paralelo, por fragmentos.")
+        parser.add_argument("--from-block", type=int, help="Primeiro bloco do backfill.")
+        parser.add_argument("--workers", type=int, default=4, help="Processos usados no backfill.")
+        parser.add_argument("--shard-size", type=int, default=5000, help="Blocos por fragmento do backfill.")
+        parser.add_argument("--job", help="Nome do backfill, para retomar uma execução interrompida.")
+
+    def handle(self, *args, **options):
+        contract_abi = get_contract_artifact().abi
+
+        if options["backfill"]:
+            self._backfill(contract_abi, options)
+            return
+
+        while True:
+            web3 = check_connection()
+            summary = run_indexer(
+                web3,
+                contract_abi,
+                to_block=options["to_block"],
+                block_range=options["block_range"],
+            )
+            self.stdout.write(
+                f"Blocos {summary['from_block']}-{summary['to_block']}: "
+                f"{summary['events']} eventos em {summary['ranges']} intervalos."
+            )
+
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def _backfill(self, contract_abi, options):
+        if options["from_block"] is None:
+            raise CommandError("Informe --from-block para o backfill.")
+
+        web3 = check_connection()
+        to_block = options["to_block"] if options["to_block"] is not None else web3.eth.block_number
+
+        # Cada processo abre a própria conexão HTTP; a cadeia em memória do
+        # TEST_ENV só existe neste processo
+        workers = options["workers"]
+        source = os.getenv("GANACHE_URL")
+        if os.getenv("TEST_ENV") == "true" or not source:
+            source, workers = web3, 1
+
+        summary = run_backfill(
+            contract_abi,
+            options["from_block"],
+            to_block,
+            source,
+            workers=workers,
+            shard_size=options["shard_size"],
+            job=options["job"],
+        )
+        self.stdout.write(
+            f"Backfill {summary['job']}: {summary['events']} eventos em {summary['shards']} fragmentos "
+            f"({summary['splits']} divididos, {summary['failed']} com falha)."
+        )
@@ -0,0 +1,114 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0007_usuario"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingTransaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tx_hash", models.CharField(max_length=66, unique=True)),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("create", "Create Contract"),
+                            ("sign", "Sign Contract"),
+                            ("pay_rent", "Pay Rent"),
+                            ("pay_deposit", "Pay Deposit"),
+                            ("terminate", "Terminate Contract"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendente"),
+                            ("confirmed", "Confirmada"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, null=True)),
+                ("block_number", models.BigIntegerField(blank=True, null=True)),
+                ("gas_used", models.BigIntegerField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("resolved_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "transacoes_pendentes",
+            },
+        ),
+        migrations.AddField(
+            model_name="usuario",
+            name="private_key",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="end_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="rent_due_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="simulated_time",
+            field=models.DateTimeField(
+                blank=True, default=django.utils.timezone.now, null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="start_date",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(fields=["status"], name="contratos_status_48b9f4_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(fields=["tenant"], name="contratos_tenant_da7a58_idx"),
+        ),
+        migrations.AddField(
+            model_name="pendingtransaction",
+            name="contract",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="pending_transactions",
+                to="contratos_inteligentes.rentalcontract",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pendingtransaction",
+            index=models.Index(fields=["status"], name="transacoes__status_67cb6d_idx"),
+        ),
+    ]
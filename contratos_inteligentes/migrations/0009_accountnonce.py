@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0008_pendingtransaction"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccountNonce",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("address", models.CharField(max_length=42, unique=True)),
+                ("next_nonce", models.BigIntegerField(default=0)),
+                ("needs_resync", models.BooleanField(default=False)),
+                ("synced_at", models.DateTimeField(blank=True, null=True)),
+                ("reserved_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "nonces_contas",
+            },
+        ),
+    ]
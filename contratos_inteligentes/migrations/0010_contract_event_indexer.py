@@ -0,0 +1,67 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0009_accountnonce"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexerCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_block", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "checkpoints_indexador",
+            },
+        ),
+        migrations.AddField(
+            model_name="contractevent",
+            name="log_index",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="contractevent",
+            name="event_type",
+            field=models.CharField(
+                choices=[
+                    ("create", "Create Contract"),
+                    ("sign", "Sign Contract"),
+                    ("pay_rent", "Pay Rent"),
+                    ("pay_deposit", "Pay Deposit"),
+                    ("execute", "Execute Contract"),
+                    ("terminate", "Terminate Contract"),
+                    ("partial_payment", "Partial Payment"),
+                    ("failure", "Failure"),
+                    ("auto_renew", "Auto Renew"),
+                    ("error", "Error"),
+                    ("rent_pending", "Rent Payment Pending"),
+                    ("expired", "Contract Expired"),
+                    ("payment_late", "Payment Late"),
+                    ("time_simulation", "Time Simulation"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contractevent",
+            constraint=models.UniqueConstraint(
+                fields=("transaction_hash", "log_index"), name="evento_unico_por_log"
+            ),
+        ),
+    ]
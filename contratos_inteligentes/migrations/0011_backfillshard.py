@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0010_contract_event_indexer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackfillShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("job", models.CharField(max_length=50)),
+                ("from_block", models.BigIntegerField()),
+                ("to_block", models.BigIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendente"),
+                            ("done", "Concluído"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("events", models.IntegerField(default=0)),
+                ("error", models.TextField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "fragmentos_backfill",
+                "indexes": [
+                    models.Index(
+                        fields=["job", "status"], name="fragmentos__job_dd98eb_idx"
+                    )
+                ],
+            },
+        ),
+    ]
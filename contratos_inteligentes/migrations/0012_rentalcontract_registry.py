@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0011_backfillshard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rentalcontract",
+            name="agreement_id",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="contract_address",
+            field=models.CharField(max_length=42),
+        ),
+        migrations.AddConstraint(
+            model_name="rentalcontract",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("agreement_id__isnull", True)),
+                fields=("contract_address",),
+                name="contrato_endereco_unico",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="rentalcontract",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("agreement_id__isnull", False)),
+                fields=("contract_address", "agreement_id"),
+                name="acordo_unico_por_registro",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0012_rentalcontract_registry"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="pendingtransaction",
+            name="action",
+            field=models.CharField(
+                choices=[
+                    ("create", "Create Contract"),
+                    ("sign", "Sign Contract"),
+                    ("sign_offchain", "Sign With EIP-712 Signatures"),
+                    ("pay_rent", "Pay Rent"),
+                    ("pay_deposit", "Pay Deposit"),
+                    ("terminate", "Terminate Contract"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0013_pendingtransaction_sign_offchain"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="rentalcontract",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("deploying", "Deploying"),
+                    ("pending", "Pending"),
+                    ("active", "Active"),
+                    ("terminated", "Terminated"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0014_rentalcontract_deploying_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContractChainState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("landlord_signed", models.BooleanField(default=False)),
+                ("tenant_signed", models.BooleanField(default=False)),
+                ("is_terminated", models.BooleanField(default=False)),
+                ("is_active", models.BooleanField(default=False)),
+                ("rent_amount", models.DecimalField(decimal_places=0, max_digits=38)),
+                (
+                    "deposit_amount",
+                    models.DecimalField(decimal_places=0, max_digits=38),
+                ),
+                ("end_timestamp", models.BigIntegerField(blank=True, null=True)),
+                ("block_number", models.BigIntegerField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "contract",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="chain_state",
+                        to="contratos_inteligentes.rentalcontract",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "estado_contrato_blockchain",
+                "indexes": [
+                    models.Index(
+                        fields=["is_terminated", "is_active"],
+                        name="estado_cont_is_term_a4bdff_idx",
+                    ),
+                    models.Index(
+                        fields=["updated_at"], name="estado_cont_updated_b1bd21_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
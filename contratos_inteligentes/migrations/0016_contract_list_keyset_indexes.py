@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0015_contractchainstate"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="rentalcontract",
+            name="contratos_status_48b9f4_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="rentalcontract",
+            name="contratos_tenant_da7a58_idx",
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(
+                fields=["created_at", "id"], name="contratos_created_dbfdee_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(
+                fields=["status", "created_at", "id"],
+                name="contratos_status_3a4794_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(
+                fields=["tenant", "created_at", "id"],
+                name="contratos_tenant_d3ab7d_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="rentalcontract",
+            index=models.Index(
+                fields=["landlord", "created_at", "id"],
+                name="contratos_landlor_ddb627_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0016_contract_list_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="contractevent",
+            index=models.Index(
+                fields=["contract", "timestamp", "id"],
+                name="eventos_con_contrac_beaafd_idx",
+            ),
+        ),
+    ]
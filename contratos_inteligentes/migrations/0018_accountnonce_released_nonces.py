@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0017_contractevent_contract_timestamp_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountnonce",
+            name="released_nonces",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
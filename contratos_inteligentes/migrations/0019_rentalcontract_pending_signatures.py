@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0018_accountnonce_released_nonces"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rentalcontract",
+            name="pending_landlord_signature",
+            field=models.CharField(blank=True, max_length=132),
+        ),
+        migrations.AddField(
+            model_name="rentalcontract",
+            name="pending_tenant_signature",
+            field=models.CharField(blank=True, max_length=132),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:30
+
+import os
+
+from django.db import migrations, models
+
+
+def backfill_contract_artifact(apps, schema_editor):
+    # Acordos do registro têm agreement_id; os demais contratos eram operados
+    # com a ABI do artefato configurado na instalação (RENTAL_AGREEMENT_ARTIFACT)
+    RentalContract = apps.get_model("contratos_inteligentes", "RentalContract")
+    RentalContract.objects.filter(agreement_id__isnull=False).update(contract_artifact="RentalRegistry")
+    RentalContract.objects.filter(agreement_id__isnull=True).update(
+        contract_artifact=os.getenv("RENTAL_AGREEMENT_ARTIFACT", "RentalAgreement")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0019_rentalcontract_pending_signatures"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="rentalcontract",
+            name="contract_artifact",
+            field=models.CharField(default="RentalAgreement", max_length=64),
+        ),
+        migrations.RunPython(backfill_contract_artifact, migrations.RunPython.noop),
+    ]
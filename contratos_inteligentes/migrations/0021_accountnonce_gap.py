@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contratos_inteligentes", "0020_rentalcontract_contract_artifact"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountnonce",
+            name="gap_nonce",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="accountnonce",
+            name="gap_seen_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
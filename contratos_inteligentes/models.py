@@ -14,7 +14,13 @@ class RentalContract(models.Model):
     tenant = models.CharField(max_length=42)
     rent_amount = models.DecimalField(max_digits=38, decimal_places=2)
     deposit_amount = models.DecimalField(max_digits=38, decimal_places=2)
-    contract_address = models.CharField(max_length=42, unique=True)
+    contract_address = models.CharField(max_length=42)
+    # Preenchido no backend de registro: contract_address é o RentalRegistry
+    agreement_id = models.PositiveBigIntegerField(null=True, blank=True)
+    # Artefato cuja ABI opera o contrato: a v1/v2 implantada diretamente, o
+    # clone da fábrica ou o RentalRegistry. Definido na criação, não muda
+    # quando a configuração da instalação muda depois.
+    contract_artifact = models.CharField(max_length=64, default="RentalAgreement")
     start_date = models.DateTimeField(default=timezone.now)
     end_date = models.DateTimeField(null=True, blank=True)
     rent_due_date = models.DateTimeField(null=True, blank=True)
@@ -25,14 +31,20 @@ class RentalContract(models.Model):
     status = models.CharField(
         max_length=10,
         choices=[
+            ("deploying", "Deploying"),
             ("pending", "Pending"),
             ("active", "Active"),
             ("terminated", "Terminated"),
+            ("failed", "Failed"),
         ],
         default="pending",
     )
     landlord_signature = models.CharField(max_length=132, blank=True)
     tenant_signature = models.CharField(max_length=132, blank=True)
+    # Assinaturas EIP-712 recebidas e ainda não registradas on-chain; só passam
+    # para landlord_signature/tenant_signature depois do recibo da transação
+    pending_landlord_signature = models.CharField(max_length=132, blank=True)
+    pending_tenant_signature = models.CharField(max_length=132, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     simulated_time = models.DateTimeField(default=timezone.now, null=True, blank=True)  # Incluindo horário
 
@@ -69,8 +81,24 @@ class RentalContract(models.Model):
     class Meta:
         db_table = "contratos"
         indexes = [
-        models.Index(fields=["status"]),
-        models.Index(fields=["tenant"]),
+            # Paginação por cursor em (created_at, id), com ou sem filtro
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["status", "created_at", "id"]),
+            models.Index(fields=["tenant", "created_at", "id"]),
+            models.Index(fields=["landlord", "created_at", "id"]),
+        ]
+        constraints = [
+            # Um contrato por endereço, ou um por (registro, acordo) no backend de registro
+            models.UniqueConstraint(
+                fields=["contract_address"],
+                condition=models.Q(agreement_id__isnull=True),
+                name="contrato_endereco_unico",
+            ),
+            models.UniqueConstraint(
+                fields=["contract_address", "agreement_id"],
+                condition=models.Q(agreement_id__isnull=False),
+                name="acordo_unico_por_registro",
+            ),
         ]
 
 class Usuario(models.Model):
@@ -132,6 +160,12 @@ class ContractEvent(models.Model):
         ("terminate", "Terminate Contract"),
         ("partial_payment", "Partial Payment"),
         ("failure", "Failure"),
+        ("auto_renew", "Auto Renew"),
+        ("error", "Error"),
+        ("rent_pending", "Rent Payment Pending"),
+        ("expired", "Contract Expired"),
+        ("payment_late", "Payment Late"),
+        ("time_simulation", "Time Simulation"),
     ]
 
     contract = models.ForeignKey(
@@ -144,6 +178,7 @@ class ContractEvent(models.Model):
     from_address = models.CharField(max_length=42, blank=True, null=True)
     gas_used = models.BigIntegerField(blank=True, null=True)
     block_number = models.BigIntegerField(blank=True, null=True)
+    log_index = models.IntegerField(blank=True, null=True)
     timestamp = models.DateTimeField(default=timezone.now)
     detalhes = models.TextField(blank=True, null=True)
 
@@ -152,3 +187,160 @@ class ContractEvent(models.Model):
 
     class Meta:
         db_table = "eventos_contrato"
+        indexes = [
+            # Eventos mais recentes de um contrato: varredura de intervalo no índice
+            models.Index(fields=["contract", "timestamp", "id"]),
+        ]
+        constraints = [
+            # Um log da blockchain vira no máximo um evento (indexação idempotente)
+            models.UniqueConstraint(
+                fields=["transaction_hash", "log_index"], name="evento_unico_por_log"
+            ),
+        ]
+
+class IndexerCheckpoint(models.Model):
+    """Último bloco processado por um indexador de eventos."""
+
+    name = models.CharField(max_length=50, unique=True)
+    last_block = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: bloco {self.last_block}"
+
+    class Meta:
+        db_table = "checkpoints_indexador"
+
+class PendingTransaction(models.Model):
+    """
+    Transação enviada em modo assíncrono. O worker Celery acompanha o recibo
+    e aplica os efeitos no banco quando a transação é minerada.
+    """
+
+    ACTIONS = [
+        ("create", "Create Contract"),
+        ("sign", "Sign Contract"),
+        ("sign_offchain", "Sign With EIP-712 Signatures"),
+        ("pay_rent", "Pay Rent"),
+        ("pay_deposit", "Pay Deposit"),
+        ("terminate", "Terminate Contract"),
+    ]
+    STATUS = [
+        ("pending", "Pendente"),
+        ("confirmed", "Confirmada"),
+        ("failed", "Falhou"),
+    ]
+
+    tx_hash = models.CharField(max_length=66, unique=True)
+    action = models.CharField(max_length=20, choices=ACTIONS)
+    contract = models.ForeignKey(
+        RentalContract,
+        on_delete=models.CASCADE,
+        related_name="pending_transactions",
+        null=True,
+        blank=True,
+    )
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS, default="pending")
+    error = models.TextField(blank=True, null=True)
+    block_number = models.BigIntegerField(blank=True, null=True)
+    gas_used = models.BigIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    resolved_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Transação {self.action} {self.tx_hash} ({self.status})"
+
+    class Meta:
+        db_table = "transacoes_pendentes"
+        indexes = [
+            models.Index(fields=["status"]),
+        ]
+
+class AccountNonce(models.Model):
+    """
+    Próximo nonce a ser usado por uma conta que assina transações no servidor.
+    A linha é bloqueada (SELECT ... FOR UPDATE) a cada reserva, garantindo
+    nonces distintos entre processos.
+    """
+
+    address = models.CharField(max_length=42, unique=True)
+    next_nonce = models.BigIntegerField(default=0)
+    needs_resync = models.BooleanField(default=False)
+    synced_at = models.DateTimeField(blank=True, null=True)
+    reserved_at = models.DateTimeField(blank=True, null=True)
+    # Nonces abaixo de next_nonce devolvidos sem transmissão, a reaproveitar
+    released_nonces = models.JSONField(default=list, blank=True)
+    # Menor nonce que a rede ainda não viu e desde quando a lacuna é observada
+    gap_nonce = models.BigIntegerField(blank=True, null=True)
+    gap_seen_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Nonce {self.next_nonce} de {self.address}"
+
+    class Meta:
+        db_table = "nonces_contas"
+
+class BackfillShard(models.Model):
+    """
+    Intervalo de blocos de uma indexação histórica. O progresso é salvo por
+    intervalo, então um backfill interrompido retoma só o que faltou.
+    """
+
+    STATUS = [
+        ("pending", "Pendente"),
+        ("done", "Concluído"),
+        ("failed", "Falhou"),
+    ]
+
+    job = models.CharField(max_length=50)
+    from_block = models.BigIntegerField()
+    to_block = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS, default="pending")
+    events = models.IntegerField(default=0)
+    error = models.TextField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.job}: blocos {self.from_block}-{self.to_block} ({self.status})"
+
+    class Meta:
+        db_table = "fragmentos_backfill"
+        indexes = [
+            models.Index(fields=["job", "status"]),
+        ]
+
+
+class ContractChainState(models.Model):
+    """
+    Último `getContractState()` lido de cada contrato, com o bloco da leitura.
+    Atualizado após cada escrita feita pela API e por uma varredura periódica,
+    para que listagens respondam perguntas da blockchain só com SQL.
+    """
+
+    contract = models.OneToOneField(
+        RentalContract, on_delete=models.CASCADE, related_name="chain_state"
+    )
+    landlord_signed = models.BooleanField(default=False)
+    tenant_signed = models.BooleanField(default=False)
+    is_terminated = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=False)
+    rent_amount = models.DecimalField(max_digits=38, decimal_places=0)
+    deposit_amount = models.DecimalField(max_digits=38, decimal_places=0)
+    end_timestamp = models.BigIntegerField(blank=True, null=True)
+    block_number = models.BigIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def is_fully_signed(self):
+        return self.landlord_signed and self.tenant_signed
+
+    def __str__(self):
+        return f"Estado on-chain do contrato {self.contract_id} no bloco {self.block_number}"
+
+    class Meta:
+        db_table = "estado_contrato_blockchain"
+        indexes = [
+            models.Index(fields=["is_terminated", "is_active"]),
+            models.Index(fields=["updated_at"]),
+        ]
@@ -1,7 +1,16 @@
 from rest_framework import serializers
-from .models import RentalContract
+from .models import ContractChainState, RentalContract
+
+class ContractChainStateSerializer(serializers.ModelSerializer):
+    is_fully_signed = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = ContractChainState
+        exclude = ["id", "contract"]
 
 class RentalContractSerializer(serializers.ModelSerializer):
+    chain_state = ContractChainStateSerializer(read_only=True, default=None)
+
     class Meta:
         model = RentalContract
         fields = "__all__"
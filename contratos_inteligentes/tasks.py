@@ -1,22 +1,170 @@
 from celery import shared_task # type: ignore
-from .models import RentalContract
-from .utils import check_connection
+from django.conf import settings # type: ignore
+from django.db import transaction # type: ignore
+from django.utils import timezone # type: ignore
+from hexbytes import HexBytes # type: ignore
+from web3.exceptions import TransactionNotFound # type: ignore
+from .models import PendingTransaction, RentalContract
+from .utils.blockchain_connector import invalidate_on_failure
+from .utils.chain_state import refresh_after_write, sweep_chain_states
+from .utils.check_connection import check_connection
+from .utils.contract_deployer import get_rental_contract
+from .utils.event_indexer import run_indexer
+from .utils.load_contract_data import get_contract_artifact
+from .utils.transaction_effects import apply_transaction_effects
 from datetime import datetime
 from dateutil.relativedelta import relativedelta # type: ignore
+import logging
 import pytz
+import time
+
+logger = logging.getLogger(__name__)
 
 @shared_task
-def renovar_contratos_automaticamente():
+def renovar_contratos_automaticamente(chunk_size=None):
+    """
+    Estende por `contract_duration` meses os contratos ativos já vencidos.
+    Os contratos são lidos em lotes por chave primária (só id, end_date e
+    contract_duration) e cada lote é gravado com um `bulk_update` de
+    end_date, em uma transação própria. Retorna as métricas da execução.
+    """
+    started = time.monotonic()
+    chunk_size = chunk_size or settings.RENEWAL_CHUNK_SIZE
     brazil_tz = pytz.timezone("America/Sao_Paulo")
     now = datetime.now(brazil_tz)
 
-    contratos = RentalContract.objects.filter(status="active", end_date__lte=now)
+    due = (
+        RentalContract.objects.filter(status="active", end_date__lte=now)
+        .only("id", "end_date", "contract_duration")
+        .order_by("pk")
+    )
+    metrics = {"scanned": 0, "renewed": 0, "failed": 0}
+    last_pk = 0
+    while True:
+        chunk = list(due.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        metrics["scanned"] += len(chunk)
+
+        renewed = []
+        for contrato in chunk:
+            try:
+                contrato.end_date += relativedelta(months=contrato.contract_duration)
+            except Exception as e:
+                metrics["failed"] += 1
+                logger.warning("Erro ao renovar contrato %s: %s", contrato.id, e)
+                continue
+            renewed.append(contrato)
+
+        try:
+            with transaction.atomic():
+                RentalContract.objects.bulk_update(renewed, fields=["end_date"])
+        except Exception as e:
+            metrics["failed"] += len(renewed)
+            logger.error("Erro ao gravar lote de renovações até o contrato %s: %s", last_pk, e)
+            continue
+        metrics["renewed"] += len(renewed)
+
+    metrics["duration_seconds"] = round(time.monotonic() - started, 3)
+    logger.info(
+        "Renovação automática: %(renewed)s de %(scanned)s contratos renovados, "
+        "%(failed)s com falha, em %(duration_seconds)ss.",
+        metrics,
+    )
+    return metrics
+
+
+@shared_task(bind=True, max_retries=120)
+def acompanhar_transacao(self, pending_id):
+    """
+    Consulta uma vez o recibo de uma transação enviada em modo assíncrono e,
+    se ainda não foi minerada, reagenda a tarefa para daqui a
+    TRANSACTION_RECEIPT_POLL_SECONDS sem ocupar o worker esperando. Com o
+    recibo, aplica os efeitos no banco (contrato, pagamento, eventos,
+    encerramento) com a linha da transação pendente bloqueada, de modo que
+    execuções duplicadas da tarefa não apliquem os efeitos duas vezes.
+    """
+    pending = PendingTransaction.objects.get(id=pending_id)
+    if pending.status != "pending":
+        return pending.status
+
+    web3 = check_connection()
+    try:
+        with invalidate_on_failure():
+            receipt = web3.eth.get_transaction_receipt(HexBytes(pending.tx_hash))
+    except TransactionNotFound as exc:
+        if self.request.retries >= self.max_retries:
+            with transaction.atomic():
+                pending = _bloquear_transacao_pendente(pending_id)
+                if pending.status == "pending":
+                    _marcar_transacao_falha(pending, "Recibo da transação não encontrado.")
+            return pending.status
+        raise self.retry(exc=exc, countdown=settings.TRANSACTION_RECEIPT_POLL_SECONDS)
+
+    with transaction.atomic():
+        pending = _bloquear_transacao_pendente(pending_id)
+        if pending.status != "pending":
+            # Outra execução da tarefa já resolveu a transação
+            return pending.status
+
+        if receipt["status"] != 1:
+            _marcar_transacao_falha(pending, "Falha na execução da transação.", receipt)
+            return pending.status
+
+        smart_contract = None
+        if pending.contract_id:
+            smart_contract = get_rental_contract(web3, pending.contract)
 
-    for contrato in contratos:
         try:
-            # Lógica de renovação
-            contrato.end_date += relativedelta(months=contrato.contract_duration)
-            contrato.save()
-            print(f"Contrato {contrato.id} renovado até {contrato.end_date}")
+            with transaction.atomic():
+                apply_transaction_effects(pending, receipt, smart_contract)
         except Exception as e:
-            print(f"Erro ao renovar contrato {contrato.id}: {str(e)}")
+            # Descarta o que os efeitos desfeitos deixaram na instância
+            pending.refresh_from_db()
+            _marcar_transacao_falha(pending, str(e), receipt)
+            return pending.status
+
+    refresh_after_write(web3, [pending.contract])
+    return pending.status
+
+
+def _bloquear_transacao_pendente(pending_id):
+    # Só a linha da transação pendente: o contrato é opcional (LEFT JOIN) e não pode ser bloqueado junto
+    return PendingTransaction.objects.select_for_update().get(id=pending_id)
+
+
+def _marcar_transacao_falha(pending, error, receipt=None):
+    if pending.action == "create" and pending.contract and pending.contract.status == "deploying":
+        # Criação otimista: a linha com o endereço previsto não corresponde a nenhum contrato
+        pending.contract.status = "failed"
+        pending.contract.save(update_fields=["status"])
+
+    pending.status = "failed"
+    pending.error = error
+    if receipt is not None:
+        pending.block_number = receipt["blockNumber"]
+        pending.gas_used = receipt["gasUsed"]
+    pending.resolved_at = timezone.now()
+    pending.save()
+
+
+@shared_task
+def indexar_eventos_blockchain():
+    """
+    Lê os logs dos contratos conhecidos desde o último checkpoint e grava os
+    eventos em ContractEvent.
+    """
+    web3 = check_connection()
+    contract_abi = get_contract_artifact().abi
+    return run_indexer(web3, contract_abi)
+
+
+@shared_task
+def atualizar_estado_blockchain():
+    """
+    Relê o estado on-chain de todos os contratos em lotes e atualiza os
+    snapshots em ContractChainState.
+    """
+    web3 = check_connection()
+    return sweep_chain_states(web3)
@@ -1,24 +1,56 @@
 import json
 import os
+from io import StringIO
 from datetime import date, datetime, timedelta
+from unittest import skipIf
 from unittest.mock import mock_open, patch, MagicMock, Mock
 
+from celery.exceptions import Retry  # type: ignore
 from dateutil.relativedelta import relativedelta  # type: ignore
+from django.conf import settings  # type: ignore
 from django.core.exceptions import ValidationError  # type: ignore
-from django.test import TestCase  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
 from django.urls import reverse  # type: ignore
 from django.utils import timezone  # type: ignore
-from rest_framework.test import APIClient  # type: ignore
+from rest_framework.test import APIClient, APIRequestFactory  # type: ignore
+from eth_abi import encode  # type: ignore
 from web3 import Web3  # type: ignore
-
-from contratos_inteligentes.models import (ContractEvent, Payment,
-                                           RentalContract, Usuario)
+from web3.exceptions import ContractCustomError, TransactionNotFound, Web3TypeError  # type: ignore
+
+from contratos_inteligentes.models import (AccountNonce, BackfillShard,
+                                           ContractChainState, ContractEvent, IndexerCheckpoint,
+                                           Payment,
+                                           PendingTransaction, RentalContract,
+                                           Usuario)
+from contratos_inteligentes.tasks import acompanhar_transacao, renovar_contratos_automaticamente
+from contratos_inteligentes.utils.chain_state import refresh_chain_state, sweep_chain_states
 from contratos_inteligentes.utils.check_connection import check_connection
-from contratos_inteligentes.utils.load_contract_data import load_contract_data
-from contratos_inteligentes.utils.log_contract_event import log_contract_event
+from contratos_inteligentes.utils.load_contract_data import (artifact_path, content_hash, get_contract_artifact,
+                                                             load_contract_data)
+from contratos_inteligentes.utils.log_contract_event import buffered_events, log_contract_event
 from contratos_inteligentes.utils.normalize_address import normalize_address
 from web3.providers.eth_tester import EthereumTesterProvider  # type: ignore
-from contratos_inteligentes.utils.blockchain_connector import BlockchainConnector
+from contratos_inteligentes.utils.blockchain_connector import BlockchainConnector, ConnectionPool, get_connection_pool
+from contratos_inteligentes.utils.contract_deployer import (AGREEMENT_CREATED_TOPIC,
+                                                            REGISTRY_AGREEMENT_CREATED_TOPIC, RegistryAgreement,
+                                                            build_create_call, created_agreement, get_rental_contract,
+                                                            created_contract_address)
+from contratos_inteligentes.utils.contract_factory import ContractCache
+from contratos_inteligentes.utils.contract_reader import (ContractState, ViewCallCache, batch_call, cached_call,
+                                                         get_view_cache, read_contract_state,
+                                                         read_payment_terms, read_sign_preflight)
+from contratos_inteligentes.utils.event_backfill import run_backfill
+from contratos_inteligentes.utils.fee_oracle import FeeOracle, GasEstimator, get_gas_estimator, suggest_fees
+from contratos_inteligentes.utils.event_indexer import fetch_logs, known_contracts, run_indexer, watched_addresses
+from contratos_inteligentes.utils.nonce_manager import mark_for_resync, release_nonce, reserve_nonce
+from contratos_inteligentes.utils.transaction_preflight import TransactionReverted, decode_revert, simulate_transaction
+from contratos_inteligentes.utils.transaction_effects import register_offchain_signatures, register_payments
+from contratos_inteligentes.utils.transaction_sender import send_batch, send_transaction
+from contratos_inteligentes.utils.typed_signatures import (is_offchain_signature, recover_signer, sign_terms,
+                                                          supports_offchain_signatures, terms_typed_data)
+from contratos_inteligentes.views import check_and_auto_renew
+from web3.providers.base import JSONBaseProvider  # type: ignore
 
 from .utils.load_contract_data import load_contract_data
 
@@ -38,6 +70,86 @@ def mock_check_connection():
 
     return mock_web3
 
+LANDLORD_PRIVATE_KEY = "0x851e3cf1a6db1937de7ab71ee0ec25607649d87184d6e5cf199ce72c2263c45c"
+TENANT_PRIVATE_KEY = "0x5990c131de45024a70bed095da1e58a48972ed815694719b4f251a8b6d59e24b"
+TENANT_ADDRESS = "0xC7d62268F8700eaF20047EAC54c142408301606d"
+
+def deploy_rental_contract(web3, rent_amount=1, deposit_amount=2):
+    # Implanta o RentalAgreement na cadeia de teste e retorna o contrato vinculado
+    account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+    transaction = web3.eth.contract(abi=contract_abi, bytecode=bytecode).constructor(
+        TENANT_ADDRESS, rent_amount, deposit_amount, 1, 100
+    ).build_transaction(
+        {
+            "from": account.address,
+            "nonce": web3.eth.get_transaction_count(account.address),
+            "gas": 3000000,
+            "gasPrice": web3.to_wei("20", "gwei"),
+        }
+    )
+    tx_hash = web3.eth.send_raw_transaction(account.sign_transaction(transaction).raw_transaction)
+    receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    return web3.eth.contract(address=receipt.contractAddress, abi=contract_abi)
+
+def send_contract_transaction(web3, contract_function, private_key=LANDLORD_PRIVATE_KEY, value=0, gas=300000):
+    account = web3.eth.account.from_key(private_key)
+    transaction = contract_function.build_transaction(
+        {
+            "from": account.address,
+            "nonce": web3.eth.get_transaction_count(account.address),
+            "gas": gas,
+            "gasPrice": web3.to_wei("20", "gwei"),
+            "value": value,
+        }
+    )
+    tx_hash = web3.eth.send_raw_transaction(account.sign_transaction(transaction).raw_transaction)
+    return web3.eth.wait_for_transaction_receipt(tx_hash)
+
+def create_signed_rental_contract(web3):
+    # Contrato assinado pelas duas partes na cadeia de teste e registrado no banco
+    smart_contract = deploy_rental_contract(web3, rent_amount=1, deposit_amount=2)
+    landlord = send_contract_transaction(web3, smart_contract.functions.signAgreement())
+    tenant = send_contract_transaction(web3, smart_contract.functions.signAgreement(), TENANT_PRIVATE_KEY)
+    return RentalContract.objects.create(
+        landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+        tenant=TENANT_ADDRESS,
+        rent_amount=1,
+        deposit_amount=2,
+        start_date=timezone.now(),
+        end_date=timezone.now(),
+        contract_address=smart_contract.address,
+        landlord_signature=landlord["from"],
+        tenant_signature=tenant["from"],
+        status="active",
+    )
+
+def requires_artifact(*names):
+    # Contratos ainda não compilados para build/ (scripts/compilar_contrato.py precisa do solc)
+    missing = [name for name in names if not os.path.exists(artifact_path(name))]
+    return skipIf(missing, f"Sem artefato em build/ para {', '.join(missing)}; execute scripts/compilar_contrato.py.")
+
+def deploy_artifact(web3, name, *constructor_args):
+    # Implanta um artefato de build/ pela conta do locador e retorna o contrato vinculado
+    artifact = get_contract_artifact(name)
+    deployer = web3.eth.contract(abi=artifact.abi, bytecode=artifact.bytecode)
+    receipt = send_contract_transaction(web3, deployer.constructor(*constructor_args), gas=3000000)
+    return web3.eth.contract(address=receipt.contractAddress, abi=artifact.abi)
+
+class BatchingTesterProvider(JSONBaseProvider):
+    """Provider de teste que aceita lotes JSON-RPC e conta quantos foram enviados."""
+
+    def __init__(self, inner):
+        super().__init__()
+        self.inner = inner
+        self.batches = 0
+
+    def make_request(self, method, params):
+        return self.inner.make_request(method, params)
+
+    def make_batch_request(self, requests):
+        self.batches += 1
+        return [self.inner.make_request(method, params) for method, params in requests]
+
 class ContractAPITestCase(TestCase):
     def setUp(self):
         # Configurações iniciais para os testes
@@ -578,6 +690,7 @@ class UtilsTests(TestCase):
     @patch("contratos_inteligentes.utils.blockchain_connector.BlockchainConnector.connect", side_effect=Exception("Não conectado à rede Ethereum"))
     def test_check_connection_failure(self, mock_connect):
         """Verifica se `check_connection` falha corretamente."""
+        get_connection_pool().reset()
         with self.assertRaises(Exception) as context:
             check_connection()
         self.assertIn("Não conectado à rede Ethereum", str(context.exception))
@@ -612,6 +725,16 @@ class UtilsTests(TestCase):
         with self.assertRaises(json.JSONDecodeError):
             load_contract_data()
 
+    def test_contract_artifact_is_loaded_once(self):
+        """O artefato enxuto é lido no primeiro uso e reaproveitado depois."""
+        artifact = get_contract_artifact()
+        with patch("builtins.open", side_effect=FileNotFoundError):
+            self.assertIs(get_contract_artifact(), artifact)
+
+        contract_abi, bytecode = load_contract_data()
+        self.assertEqual(artifact.abi, contract_abi)
+        self.assertEqual(artifact.content_hash, content_hash(contract_abi, bytecode))
+
     ######################## LOG DE EVENTOS ########################
     def test_log_contract_event_success(self):
         event_type = "create"
@@ -651,6 +774,55 @@ class UtilsTests(TestCase):
             str(context.exception), "O endereço do usuário não pode ser vazio."
         )
 
+    def test_buffered_events_flush_in_bulk(self):
+        """Dentro de buffered_events os eventos saem em bulk_create, no limite e no commit."""
+        user_address = "0xabcdef1234567890abcdef1234567890abcdef12"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with buffered_events(flush_size=3) as buffer:
+                with self.assertNumQueries(1):
+                    for _ in range(4):
+                        log_contract_event(self.contract, "error", user_address)
+                self.assertEqual(ContractEvent.objects.count(), 3)
+                self.assertEqual(len(buffer.pending), 1)
+
+            # Dentro da transação do teste, o restante só é gravado no commit
+            self.assertEqual(ContractEvent.objects.count(), 3)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(ContractEvent.objects.count(), 4)
+        self.assertEqual(buffer.written, 4)
+
+        # Fora do bloco, a gravação volta a ser imediata
+        log_contract_event(self.contract, "create", user_address)
+        self.assertEqual(ContractEvent.objects.count(), 5)
+
+    def test_payment_and_offchain_signature_events_use_active_buffer(self):
+        user_address = "0xabcdef1234567890abcdef1234567890abcdef12"
+        with self.captureOnCommitCallbacks(execute=True):
+            with buffered_events(flush_size=10) as buffer:
+                register_payments(
+                    [(self.contract, 1, "Aluguel", user_address, "0x01"), (self.contract, 2, "Depósito", user_address, "0x02")]
+                )
+                register_offchain_signatures(self.contract, "0x03")
+                self.assertEqual(ContractEvent.objects.count(), 0)
+                self.assertEqual(len(buffer.pending), 4)
+
+        self.assertEqual(
+            sorted(ContractEvent.objects.values_list("event_type", flat=True)), ["pay_deposit", "pay_rent", "sign", "sign"]
+        )
+
+    def test_buffered_events_discarded_on_exception(self):
+        """Uma exceção no bloco sobe intacta e os eventos pendentes não são gravados."""
+        user_address = "0xabcdef1234567890abcdef1234567890abcdef12"
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaisesMessage(RuntimeError, "falha no bloco"):
+                with buffered_events(flush_size=10):
+                    log_contract_event(self.contract, "error", user_address)
+                    raise RuntimeError("falha no bloco")
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ContractEvent.objects.count(), 0)
+
     def test_valid_address(self):
         valid_address = "0x32Be343B94f860124dC4fEe278FDCBD38C102D88"
         result = normalize_address(valid_address)
@@ -802,3 +974,1309 @@ class BlockchainConnectorTests(TestCase):
             connector.connect()
 
         self.assertIn("Não conectado à rede Ethereum", str(context.exception))
+
+class ConnectionPoolTests(TestCase):
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def test_reuses_connection_between_calls(self):
+        """Verifica que o pool devolve a mesma instância Web3 sem reconectar."""
+        pool = ConnectionPool(health_check_interval=60)
+        first = pool.get_web3()
+        second = pool.get_web3()
+
+        self.assertIs(first, second)
+        stats = pool.get_stats()
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["reuses"], 1)
+        self.assertTrue(stats["connected"])
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def test_reconnects_when_connection_is_unhealthy(self):
+        """Verifica a reconexão preguiçosa após uma falha de saúde da conexão."""
+        pool = ConnectionPool(health_check_interval=60)
+        first = pool.get_web3()
+
+        pool.invalidate()
+        with patch.object(ConnectionPool, "_is_healthy", return_value=False):
+            second = pool.get_web3()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.get_stats()["reconnects"], 1)
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def test_healthy_check_clears_stale_flag(self):
+        """Após uma verificação bem-sucedida, o uso seguinte não verifica de novo."""
+        pool = ConnectionPool(health_check_interval=60)
+        pool.get_web3()
+
+        pool.invalidate()
+        pool.get_web3()
+        pool.get_web3()
+
+        self.assertEqual(pool.get_stats()["health_checks"], 1)
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def test_transport_error_invalidates_pool(self):
+        """Uma falha de transporte numa chamada RPC marca o pool para verificação."""
+        pool = ConnectionPool(health_check_interval=60)
+        web3 = pool.get_web3()
+        smart_contract = web3.eth.contract(address=Web3.to_checksum_address("0x" + "ab" * 20), abi=load_contract_data()[0])
+
+        with patch("contratos_inteligentes.utils.blockchain_connector.get_connection_pool", return_value=pool), \
+                patch.object(web3, "batch_requests", side_effect=Web3TypeError), \
+                patch("contratos_inteligentes.utils.contract_reader._call", side_effect=ConnectionError("recusada")):
+            with self.assertRaises(ConnectionError):
+                batch_call(web3, [smart_contract.functions.getContractState()])
+
+        pool.get_web3()
+        self.assertEqual(pool.get_stats()["health_checks"], 1)
+
+    @patch("contratos_inteligentes.utils.blockchain_connector.BlockchainConnector.connect", side_effect=Exception("Não conectado à rede Ethereum"))
+    def test_failure_is_counted(self, mock_connect):
+        pool = ConnectionPool()
+        with self.assertRaises(Exception):
+            pool.get_web3()
+        self.assertEqual(pool.get_stats()["failures"], 1)
+        self.assertFalse(pool.get_stats()["connected"])
+
+class ContractCacheTests(TestCase):
+
+    def setUp(self):
+        self.web3 = Web3(EthereumTesterProvider())
+        self.contract_abi, _ = load_contract_data()
+        self.address = "0x" + "ab" * 20
+
+    def test_reuses_bound_contract(self):
+        """Verifica que o mesmo endereço/ABI devolve a instância em cache, mesmo em minúsculas."""
+        cache = ContractCache(maxsize=4)
+        first = cache.get(self.web3, self.address, self.contract_abi)
+        second = cache.get(self.web3, Web3.to_checksum_address(self.address), self.contract_abi)
+
+        self.assertIs(first, second)
+        self.assertEqual(first.address, Web3.to_checksum_address(self.address))
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = ContractCache(maxsize=2)
+        addresses = ["0x" + digit * 40 for digit in "123"]
+        first = cache.get(self.web3, addresses[0], self.contract_abi)
+        cache.get(self.web3, addresses[1], self.contract_abi)
+        cache.get(self.web3, addresses[2], self.contract_abi)
+
+        self.assertIsNot(first, cache.get(self.web3, addresses[0], self.contract_abi))
+        self.assertEqual(cache.get_stats()["evictions"], 2)
+
+    def test_abi_change_creates_new_entry(self):
+        """Uma ABI diferente (artefato recompilado) não reaproveita a instância antiga."""
+        cache = ContractCache(maxsize=4)
+        first = cache.get(self.web3, self.address, self.contract_abi)
+        second = cache.get(self.web3, self.address, self.contract_abi[:-1])
+
+        self.assertIsNot(first, second)
+
+
+class ContractReaderTests(TestCase):
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def setUp(self):
+        self.web3 = BlockchainConnector().connect()
+        self.smart_contract = deploy_rental_contract(self.web3, rent_amount=1, deposit_amount=2)
+
+    def test_read_contract_state(self):
+        state = read_contract_state(self.web3, self.smart_contract)
+
+        self.assertIsInstance(state, ContractState)
+        self.assertEqual(state.tenant, TENANT_ADDRESS)
+        self.assertEqual(state.rent_amount, 1)
+        self.assertEqual(state.deposit_amount, 2)
+        self.assertFalse(state.is_fully_signed)
+        self.assertTrue(state.is_contract_active)
+
+    def test_read_sign_preflight_uses_single_batch(self):
+        """As leituras do preflight de assinatura devem sair em um único lote JSON-RPC."""
+        batching_web3 = Web3(BatchingTesterProvider(self.web3.provider))
+        batching_web3.eth.default_account = self.web3.eth.account.from_key(LANDLORD_PRIVATE_KEY).address
+        smart_contract = batching_web3.eth.contract(address=self.smart_contract.address, abi=contract_abi)
+
+        preflight = read_sign_preflight(batching_web3, smart_contract)
+
+        self.assertTrue(preflight.is_deployed)
+        self.assertFalse(preflight.state.is_fully_signed)
+        self.assertEqual(batching_web3.provider.batches, 1)
+
+    def test_view_cache_follows_blocks_and_local_writes(self):
+        cache = ViewCallCache(block_poll_interval=0)
+        address = self.smart_contract.address
+        rent = self.smart_contract.functions.getRentAmount()
+        state = self.smart_contract.functions.getContractState()
+        cache.store(self.web3, rent, 1)
+        cache.store(self.web3, state, "bloco atual")
+
+        self.assertEqual(cache.lookup(self.web3, state), (True, "bloco atual"))
+
+        cache.invalidate_address(address)
+        self.assertEqual(cache.lookup(self.web3, state), (False, None))
+
+        cache.store(self.web3, state, "bloco atual")
+        send_contract_transaction(self.web3, self.smart_contract.functions.signAgreement())
+        self.assertEqual(cache.lookup(self.web3, state), (False, None))
+        self.assertEqual(cache.lookup(self.web3, rent), (True, 1))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["write_invalidations"], 1)
+        self.assertEqual(stats["block_invalidations"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+
+class ContractDeployerTests(TestCase):
+    FACTORY = "0x" + "fa" * 20
+    CLONE = "0x" + "c1" * 20
+
+    def _factory_receipt(self, emitter):
+        return {
+            "contractAddress": None,
+            "logs": [
+                {
+                    "address": emitter,
+                    "topics": [
+                        AGREEMENT_CREATED_TOPIC,
+                        bytes(12) + bytes.fromhex(self.CLONE[2:]),
+                        bytes(12) + bytes.fromhex(TENANT_ADDRESS[2:]),
+                    ],
+                }
+            ],
+        }
+
+    @override_settings(RENTAL_FACTORY_ADDRESS=FACTORY)
+    def test_clone_address_comes_from_factory_event(self):
+        """Na criação por clone, o endereço vem do evento AgreementCreated da fábrica."""
+        receipt = self._factory_receipt(self.FACTORY)
+        self.assertEqual(created_contract_address(receipt), Web3.to_checksum_address(self.CLONE))
+
+    @override_settings(RENTAL_FACTORY_ADDRESS=FACTORY)
+    def test_ignores_event_from_other_emitter(self):
+        receipt = self._factory_receipt("0x" + "ee" * 20)
+        self.assertIsNone(created_contract_address(receipt))
+
+    @override_settings(RENTAL_FACTORY_ADDRESS=None)
+    def test_direct_deploy_without_factory(self):
+        web3 = Web3(EthereumTesterProvider())
+        create_call, artifact_name = build_create_call(web3, TENANT_ADDRESS, 1, 2, 1700000000, 1800000000)
+
+        tx_hash = create_call.transact({"from": web3.eth.accounts[0]})
+        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        self.assertEqual(created_contract_address(receipt), receipt["contractAddress"])
+        self.assertEqual(artifact_name, "RentalAgreement")
+
+    @override_settings(RENTAL_FACTORY_ADDRESS=FACTORY)
+    def test_existing_v1_contract_keeps_its_abi_after_factory_is_configured(self):
+        """Ligar a fábrica não troca a ABI de contratos v1 já implantados: a v1 não tem assinatura off-chain."""
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        rental_contract = RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335", tenant=TENANT_ADDRESS,
+            rent_amount=1, deposit_amount=2, contract_address=smart_contract.address,
+        )
+
+        bound = get_rental_contract(web3, rental_contract)
+
+        self.assertEqual(bound.abi, contract_abi)
+        self.assertFalse(supports_offchain_signatures(bound))
+
+
+    @override_settings(RENTAL_REGISTRY_ADDRESS=FACTORY)
+    def test_registry_receipt_returns_agreement_id(self):
+        """No backend de registro, a criação devolve (registro, id do acordo)."""
+        receipt = {
+            "contractAddress": None,
+            "logs": [
+                {
+                    "address": self.FACTORY,
+                    "topics": [
+                        REGISTRY_AGREEMENT_CREATED_TOPIC,
+                        (7).to_bytes(32, "big"),
+                        bytes(12) + bytes.fromhex(TENANT_ADDRESS[2:]),
+                    ],
+                }
+            ],
+        }
+        self.assertEqual(created_agreement(receipt), (Web3.to_checksum_address(self.FACTORY), 7))
+
+    def test_registry_agreement_injects_id(self):
+        """Um acordo do registro é usado como um contrato comum: o id vira o primeiro argumento."""
+        registry = MagicMock(address=self.FACTORY)
+        agreement = RegistryAgreement(registry, 7)
+
+        agreement.functions.payRent()
+        agreement.functions.getContractState()
+
+        registry.functions.payRent.assert_called_once_with(7)
+        registry.functions.getContractState.assert_called_once_with(7)
+        self.assertEqual(agreement.address, self.FACTORY)
+
+    def test_registry_agreements_share_one_watched_address(self):
+        for agreement_id in (1, 2):
+            RentalContract.objects.create(
+                landlord=TENANT_ADDRESS, tenant=TENANT_ADDRESS, rent_amount=1, deposit_amount=1,
+                contract_address=self.FACTORY, agreement_id=agreement_id, contract_artifact="RentalRegistry",
+            )
+        contracts = known_contracts()
+
+        self.assertEqual(watched_addresses(contracts), [Web3.to_checksum_address(self.FACTORY)])
+        self.assertEqual(contracts[(Web3.to_checksum_address(self.FACTORY), 2)].agreement_id, 2)
+
+
+@requires_artifact("RentalAgreementV2")
+class RentalAgreementV2Tests(TestCase):
+    def setUp(self):
+        self.web3 = check_connection()
+        self.smart_contract = deploy_artifact(self.web3, "RentalAgreementV2", TENANT_ADDRESS, 1, 2, 1, 100)
+
+    def test_sign_and_pay(self):
+        """A v2 compilada tem as mesmas funções da v1 usadas pelas views."""
+        send_contract_transaction(self.web3, self.smart_contract.functions.signAgreement())
+        send_contract_transaction(self.web3, self.smart_contract.functions.signAgreement(), TENANT_PRIVATE_KEY)
+        receipt = send_contract_transaction(self.web3, self.smart_contract.functions.payRent(), TENANT_PRIVATE_KEY, value=1)
+
+        self.assertEqual(receipt["status"], 1)
+        state = read_contract_state(self.web3, self.smart_contract)
+        self.assertEqual((state.landlord, state.tenant), ("0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335", TENANT_ADDRESS))
+        self.assertEqual((state.rent_amount, state.deposit_amount), (1, 2))
+        self.assertTrue(state.is_active)
+        self.assertEqual(self.smart_contract.functions.endTimestamp().call(), 100)
+
+    def test_offchain_signatures_activate_contract(self):
+        state = read_contract_state(self.web3, self.smart_contract)
+        typed_data = terms_typed_data(self.web3.eth.chain_id, self.smart_contract, state)
+        signatures = [sign_terms(typed_data, key) for key in (LANDLORD_PRIVATE_KEY, TENANT_PRIVATE_KEY)]
+
+        send_contract_transaction(self.web3, self.smart_contract.functions.signAgreementWithSignatures(*signatures))
+
+        self.assertTrue(supports_offchain_signatures(self.smart_contract))
+        self.assertTrue(self.smart_contract.functions.isFullySigned().call())
+
+    def test_custom_error_is_decoded_from_abi(self):
+        """Os erros customizados da ABI são decodificados com os argumentos."""
+        tenant = self.web3.eth.account.from_key(TENANT_PRIVATE_KEY)
+        with self.assertRaises(TransactionReverted) as raised:
+            simulate_transaction(self.smart_contract.functions.payRent(), tenant, value=5)
+
+        self.assertEqual(raised.exception.reason, "IncorrectValue")
+        self.assertEqual(raised.exception.arguments, {"expected": 1, "received": 5})
+
+
+@requires_artifact("RentalAgreementClone", "RentalAgreementFactory")
+class RentalAgreementFactoryTests(TestCase):
+    def setUp(self):
+        self.web3 = check_connection()
+        self.factory = deploy_artifact(self.web3, "RentalAgreementFactory")
+        self.implementation = self.web3.eth.contract(
+            address=self.factory.functions.implementation().call(),
+            abi=get_contract_artifact("RentalAgreementClone").abi,
+        )
+
+    def create_clone(self):
+        with override_settings(RENTAL_FACTORY_ADDRESS=self.factory.address):
+            create_call, artifact_name = build_create_call(self.web3, TENANT_ADDRESS, 1, 2, 1, 100)
+            receipt = send_contract_transaction(self.web3, create_call)
+            address, agreement_id = created_agreement(receipt)
+        self.assertIsNone(agreement_id)
+        return RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335", tenant=TENANT_ADDRESS,
+            rent_amount=1, deposit_amount=2, contract_address=address, contract_artifact=artifact_name,
+        )
+
+    def test_clone_is_bound_with_implementation_abi(self):
+        """O clone usa a ABI da implementação gravada na criação, mesmo com a v1 como artefato padrão."""
+        rental_contract = self.create_clone()
+        clone = get_rental_contract(self.web3, rental_contract)
+
+        self.assertEqual(clone.abi, get_contract_artifact("RentalAgreementClone").abi)
+        self.assertTrue(supports_offchain_signatures(clone))
+        self.assertEqual(clone.functions.locador().call(), "0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335")
+
+        send_contract_transaction(self.web3, clone.functions.signAgreement())
+        send_contract_transaction(self.web3, clone.functions.signAgreement(), TENANT_PRIVATE_KEY)
+        receipt = send_contract_transaction(self.web3, clone.functions.payDeposit(), TENANT_PRIVATE_KEY, value=2)
+        self.assertEqual(receipt["status"], 1)
+
+    def test_clones_cannot_be_initialized_again(self):
+        clone = get_rental_contract(self.web3, self.create_clone())
+
+        landlord = self.web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        for contract in (clone, self.implementation):
+            with self.assertRaises(TransactionReverted) as raised:
+                simulate_transaction(
+                    contract.functions.initialize(TENANT_ADDRESS, TENANT_ADDRESS, 1, 2, 1, 100), landlord
+                )
+            self.assertEqual(raised.exception.reason, "AlreadyInitialized")
+
+
+@requires_artifact("RentalRegistry")
+class RentalRegistryFlowTests(TestCase):
+    """Criação, assinatura e pagamento pelas views com o backend de registro."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.web3 = check_connection()
+        self.registry = deploy_artifact(self.web3, "RentalRegistry")
+
+    def post(self, name, data, *args):
+        return self.client.post(reverse(name, args=args), data=data, format="json")
+
+    def test_create_sign_and_pay_through_views(self):
+        with override_settings(RENTAL_BACKEND="registry", RENTAL_REGISTRY_ADDRESS=self.registry.address):
+            response = self.post(
+                "create_contract",
+                {
+                    "landlord": "0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+                    "tenant": TENANT_ADDRESS,
+                    "rent_amount": 1,
+                    "deposit_amount": 2,
+                    "start_date": 1730419200,
+                    "end_date": 1735603200,
+                    "private_key": LANDLORD_PRIVATE_KEY,
+                },
+            )
+            self.assertEqual(response.status_code, 201, response.data)
+            self.assertEqual(response.data["contract_address"], self.registry.address)
+            contract_id = response.data["id"]
+            agreement_id = response.data["agreement_id"]
+
+            for user_type, key in (("landlord", LANDLORD_PRIVATE_KEY), ("tenant", TENANT_PRIVATE_KEY)):
+                response = self.post("sign_contract", {"user_type": user_type, "private_key": key}, contract_id)
+                self.assertEqual(response.status_code, 200, response.content)
+
+            response = self.post(
+                "register_payment",
+                {"private_key": TENANT_PRIVATE_KEY, "payment_type": "Aluguel", "amount": 1},
+                contract_id,
+            )
+            self.assertEqual(response.status_code, 200, response.data)
+
+            summary = run_indexer(self.web3, contract_abi)
+
+        rental_contract = RentalContract.objects.get(id=contract_id)
+        self.assertEqual(rental_contract.agreement_id, agreement_id)
+        self.assertEqual(rental_contract.contract_artifact, "RentalRegistry")
+        self.assertEqual(rental_contract.status, "active")
+        self.assertTrue(self.registry.functions.isFullySigned(agreement_id).call())
+        self.assertTrue(Payment.objects.filter(contract=rental_contract, payment_type="rent").exists())
+
+        # Os eventos do registro (com o id do acordo) são atribuídos ao acordo certo
+        self.assertGreaterEqual(summary["events"], 3)
+        indexed = ContractEvent.objects.filter(contract=rental_contract, block_number__isnull=False)
+        self.assertEqual(sorted(indexed.values_list("event_type", flat=True)), ["pay_rent", "sign", "sign"])
+
+    def test_unknown_agreement_reverts_with_custom_error(self):
+        tenant = self.web3.eth.account.from_key(TENANT_PRIVATE_KEY)
+        with self.assertRaises(TransactionReverted) as raised:
+            simulate_transaction(self.registry.functions.payRent(99), tenant, value=1)
+
+        self.assertEqual(raised.exception.reason, "UnknownAgreement")
+
+
+class OffchainSignatureTests(TestCase):
+    def setUp(self):
+        self.web3 = check_connection()
+        self.smart_contract = deploy_rental_contract(self.web3)
+        self.state = read_contract_state(self.web3, self.smart_contract)
+
+    def test_typed_signature_recovers_signer(self):
+        """A assinatura EIP-712 dos termos recupera o endereço de quem assinou."""
+        typed_data = terms_typed_data(self.web3.eth.chain_id, self.smart_contract, self.state)
+        signature = sign_terms(typed_data, LANDLORD_PRIVATE_KEY)
+
+        self.assertTrue(is_offchain_signature(signature))
+        self.assertEqual(recover_signer(typed_data, signature), self.state.landlord)
+        self.assertEqual(typed_data["domain"]["verifyingContract"], self.smart_contract.address)
+
+    def test_registry_terms_include_agreement_id(self):
+        registry = MagicMock(address=self.smart_contract.address)
+        typed_data = terms_typed_data(1, RegistryAgreement(registry, 9), self.state)
+
+        self.assertEqual(typed_data["message"]["agreementId"], 9)
+        self.assertEqual(typed_data["domain"]["name"], "RentalRegistry")
+
+    def test_v1_contract_rejects_offchain_flow(self):
+        """A v1 não tem signAgreementWithSignatures; a API recusa antes de guardar a assinatura."""
+        rental_contract = RentalContract.objects.create(
+            landlord=self.state.landlord, tenant=TENANT_ADDRESS, rent_amount=1, deposit_amount=2,
+            contract_address=self.smart_contract.address,
+        )
+        response = APIClient().post(
+            reverse("offchain_sign_contract", args=[rental_contract.id]),
+            data={"user_type": "landlord", "private_key": LANDLORD_PRIVATE_KEY},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        rental_contract.refresh_from_db()
+        self.assertEqual(rental_contract.landlord_signature, "")
+
+    @override_settings(RELAYER_PRIVATE_KEY=None)
+    @patch("contratos_inteligentes.views.supports_offchain_signatures", return_value=True)
+    def test_signatures_stay_pending_until_transaction_confirms(self, mock_supports):
+        """Sem relayer a transação não sai: as assinaturas ficam pendentes e o contrato não conta como assinado."""
+        rental_contract = RentalContract.objects.create(
+            landlord=self.state.landlord, tenant=self.state.tenant, rent_amount=1, deposit_amount=2,
+            contract_address=self.smart_contract.address,
+        )
+        typed_data = terms_typed_data(self.web3.eth.chain_id, self.smart_contract, self.state)
+        url = reverse("offchain_sign_contract", args=[rental_contract.id])
+        APIClient().post(url, data={"user_type": "landlord", "private_key": LANDLORD_PRIVATE_KEY}, format="json")
+        response = APIClient().post(
+            url,
+            data={"user_type": "tenant", "signature": sign_terms(typed_data, TENANT_PRIVATE_KEY)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400, response.data)
+        rental_contract.refresh_from_db()
+        self.assertFalse(rental_contract.is_fully_signed())
+        self.assertTrue(is_offchain_signature(rental_contract.pending_landlord_signature))
+        self.assertTrue(is_offchain_signature(rental_contract.pending_tenant_signature))
+
+        register_offchain_signatures(rental_contract, "0x" + "ab" * 32)
+        rental_contract.refresh_from_db()
+        self.assertTrue(rental_contract.is_fully_signed())
+        self.assertEqual(rental_contract.status, "active")
+        self.assertEqual((rental_contract.pending_landlord_signature, rental_contract.pending_tenant_signature), ("", ""))
+
+
+class AsyncTransactionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.create_data = {
+            "landlord": "0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            "tenant": TENANT_ADDRESS,
+            "rent_amount": 1,
+            "deposit_amount": 2,
+            "start_date": 1730419200,
+            "end_date": 1735603200,
+            "private_key": LANDLORD_PRIVATE_KEY,
+            "async": True,
+        }
+
+    @patch("contratos_inteligentes.views.acompanhar_transacao.delay", side_effect=lambda pending_id: acompanhar_transacao.apply(args=[pending_id]))
+    def test_async_create_returns_202_and_worker_confirms(self, mock_delay):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("create_contract"), data=self.create_data, format="json")
+
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertIn("tx_hash", response.data)
+        self.assertIn("status_url", response.data)
+        mock_delay.assert_called_once()
+
+        pending = PendingTransaction.objects.get(tx_hash=response.data["tx_hash"])
+        self.assertEqual(pending.status, "confirmed")
+        self.assertIsNotNone(pending.contract)
+        self.assertEqual(pending.contract.status, "pending")
+        self.assertIsNotNone(pending.block_number)
+
+        status_response = self.client.get(reverse("transaction_status", args=[pending.tx_hash]))
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.data["status"], "confirmed")
+        self.assertEqual(status_response.data["contract_id"], pending.contract.id)
+
+    @patch("contratos_inteligentes.views.acompanhar_transacao.delay")
+    def test_async_create_does_not_touch_contracts_before_receipt(self, mock_delay):
+        response = self.client.post(reverse("create_contract"), data=self.create_data, format="json")
+
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual(RentalContract.objects.count(), 0)
+        self.assertEqual(PendingTransaction.objects.get().status, "pending")
+
+    def test_transaction_status_not_found(self):
+        response = self.client.get(reverse("transaction_status", args=["0xdeadbeef"]))
+        self.assertEqual(response.status_code, 404)
+
+    @patch("contratos_inteligentes.views.acompanhar_transacao.delay", side_effect=lambda pending_id: acompanhar_transacao.apply(args=[pending_id]))
+    def test_optimistic_create_returns_predicted_address(self, mock_delay):
+        data = {**self.create_data, "async": False, "optimistic": True}
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse("create_contract"), data=data, format="json")
+
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual(response.data["status"], "deploying")
+        rental_contract = RentalContract.objects.get(id=response.data["id"])
+        self.assertEqual(rental_contract.status, "deploying")
+        self.assertEqual(rental_contract.contract_address, response.data["contract_address"])
+
+        for callback in callbacks:
+            callback()
+
+        rental_contract.refresh_from_db()
+        self.assertEqual(rental_contract.status, "pending")
+        self.assertEqual(rental_contract.contract_address, response.data["contract_address"])
+        self.assertEqual(RentalContract.objects.count(), 1)
+        self.assertEqual(PendingTransaction.objects.get().status, "confirmed")
+
+    @patch("contratos_inteligentes.views.predicts_address", return_value=False)
+    @patch("contratos_inteligentes.views.send_transaction")
+    def test_optimistic_create_rejected_without_predictable_address(self, mock_send, mock_predicts):
+        """Com fábrica ou registro, "optimistic": true é recusado em vez de ignorado."""
+        data = {**self.create_data, "async": False, "optimistic": True}
+        response = self.client.post(reverse("create_contract"), data=data, format="json")
+
+        self.assertEqual(response.status_code, 400, response.data)
+        mock_send.assert_not_called()
+        self.assertEqual(RentalContract.objects.count(), 0)
+
+    def test_failed_optimistic_create_marks_contract_failed(self):
+        rental_contract = RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            tenant=TENANT_ADDRESS,
+            rent_amount=1,
+            deposit_amount=2,
+            start_date=timezone.now(),
+            end_date=timezone.now(),
+            contract_address="0x0000000000000000000000000000000000000001",
+            status="deploying",
+        )
+        pending = PendingTransaction.objects.create(
+            tx_hash="0x" + "ab" * 32, action="create", contract=rental_contract, payload={}
+        )
+        receipt = {"status": 0, "blockNumber": 1, "gasUsed": 21000}
+        with patch("contratos_inteligentes.tasks.check_connection") as mock_connection:
+            mock_connection.return_value.eth.get_transaction_receipt.return_value = receipt
+            acompanhar_transacao.apply(args=[pending.id])
+
+        rental_contract.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "failed")
+        self.assertEqual(rental_contract.status, "failed")
+
+    def test_worker_does_not_apply_effects_twice(self):
+        """Uma segunda execução da tarefa encontra a transação resolvida e não duplica o contrato."""
+        pending = PendingTransaction.objects.create(
+            tx_hash="0x" + "cd" * 32, action="create", payload={}
+        )
+        receipt = {"status": 1, "blockNumber": 1, "gasUsed": 21000}
+
+        def apply_effects(pending, receipt, smart_contract):
+            pending.status = "confirmed"
+            pending.save()
+
+        with patch("contratos_inteligentes.tasks.check_connection") as mock_connection, \
+                patch("contratos_inteligentes.tasks.apply_transaction_effects", side_effect=apply_effects) as mock_apply, \
+                patch("contratos_inteligentes.tasks.refresh_after_write"):
+            mock_connection.return_value.eth.get_transaction_receipt.return_value = receipt
+            acompanhar_transacao.apply(args=[pending.id])
+            # Duplicata que passou pela checagem inicial antes da primeira terminar
+            with patch.object(PendingTransaction.objects, "get", return_value=PendingTransaction(id=pending.id, status="pending", tx_hash=pending.tx_hash)):
+                acompanhar_transacao.apply(args=[pending.id])
+
+        self.assertEqual(mock_apply.call_count, 1)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "confirmed")
+
+    def test_worker_reschedules_until_receipt_exists(self):
+        """Sem recibo, a tarefa é reagendada em vez de bloquear o worker esperando."""
+        pending = PendingTransaction.objects.create(tx_hash="0x" + "ef" * 32, action="create", payload={})
+        with patch("contratos_inteligentes.tasks.check_connection") as mock_connection, \
+                patch.object(acompanhar_transacao, "retry", side_effect=Retry()) as mock_retry:
+            mock_connection.return_value.eth.get_transaction_receipt.side_effect = TransactionNotFound("sem recibo")
+            acompanhar_transacao.apply(args=[pending.id])
+
+        mock_connection.return_value.eth.wait_for_transaction_receipt.assert_not_called()
+        self.assertEqual(mock_retry.call_args.kwargs["countdown"], settings.TRANSACTION_RECEIPT_POLL_SECONDS)
+        pending.refresh_from_db()
+        self.assertEqual(pending.status, "pending")
+
+class BatchCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.spec = {
+            "landlord": "0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            "tenant": TENANT_ADDRESS,
+            "rent_amount": 1,
+            "deposit_amount": 2,
+            "start_date": 1730419200,
+            "end_date": 1735603200,
+        }
+
+    def test_batch_create_deploys_with_consecutive_nonces(self):
+        data = {"private_key": LANDLORD_PRIVATE_KEY, "contracts": [self.spec] * 3}
+        response = self.client.post(reverse("batch_create_contracts"), data=data, format="json")
+
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 3)
+        items = response.data["items"]
+        self.assertEqual([item["status"] for item in items], ["created"] * 3)
+        self.assertEqual(len({item["contract_address"] for item in items}), 3)
+        self.assertEqual(RentalContract.objects.count(), 3)
+
+        web3 = check_connection()
+        nonces = [web3.eth.get_transaction(item["tx_hash"])["nonce"] for item in items]
+        self.assertEqual(nonces, list(range(nonces[0], nonces[0] + 3)))
+
+    def test_batch_create_validates_every_item_before_sending(self):
+        invalid = {**self.spec, "end_date": self.spec["start_date"]}
+        data = {"private_key": LANDLORD_PRIVATE_KEY, "contracts": [self.spec, invalid, {"tenant": TENANT_ADDRESS}]}
+        with patch("contratos_inteligentes.views.send_batch") as mock_send:
+            response = self.client.post(reverse("batch_create_contracts"), data=data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([item["index"] for item in response.data["items"]], [1, 2])
+        mock_send.assert_not_called()
+        self.assertEqual(RentalContract.objects.count(), 0)
+
+    def test_send_batch_skips_unsigned_calls_and_releases_their_nonces(self):
+        web3 = Mock()
+        web3.eth.get_transaction_count.return_value = 7
+        web3.eth.send_raw_transaction.side_effect = lambda raw: raw
+        account = Mock(address="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335")
+        account.sign_transaction.side_effect = lambda tx: Mock(raw_transaction=tx["nonce"])
+        call = Mock()
+        call.build_transaction.side_effect = lambda params: params
+        broken_call = Mock()
+        broken_call.build_transaction.side_effect = ValueError("argumento inválido")
+
+        results = send_batch(web3, [(call, 100, None), (broken_call, 100, None), (call, 100, None)], account)
+
+        self.assertEqual(results, [(7, None), (None, "argumento inválido"), (8, None)])
+        self.assertEqual(reserve_nonce(web3, account.address), 9)
+
+class ContractListTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for index in range(5):
+            RentalContract.objects.create(
+                landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+                tenant=TENANT_ADDRESS if index % 2 else "0x0000000000000000000000000000000000000001",
+                rent_amount=1000,
+                deposit_amount=2000,
+                contract_address=f"0x{index:040x}",
+            )
+
+    def test_contract_list_pages_with_cursor_newest_first(self):
+        ids, cursor, pages = [], None, 0
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            response = self.client.get(reverse("contract_list"), params)
+            self.assertEqual(response.status_code, 200)
+            ids += [contract["id"] for contract in response.data["results"]]
+            cursor = response.data["next_cursor"]
+            pages += 1
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, list(RentalContract.objects.order_by("-created_at", "-id").values_list("id", flat=True)))
+
+    def test_contract_list_projects_fields_and_filters(self):
+        response = self.client.get(reverse("contract_list"), {"fields": "id,tenant", "tenant": TENANT_ADDRESS})
+
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(set(response.data["results"][0]), {"id", "tenant"})
+
+    @override_settings(CONTRACT_LIST_MAX_LIMIT=3)
+    def test_contract_list_caps_limit_and_rejects_bad_parameters(self):
+        response = self.client.get(reverse("contract_list"), {"limit": 1000})
+        self.assertEqual(len(response.data["results"]), 3)
+
+        for params in ({"limit": 0}, {"fields": "id,private_key"}, {"cursor": "inválido"}):
+            self.assertEqual(self.client.get(reverse("contract_list"), params).status_code, 400)
+
+class ContractEventsApiTests(TestCase):
+    def setUp(self):
+        self.contract = RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            tenant=TENANT_ADDRESS,
+            rent_amount=1000,
+            deposit_amount=2000,
+            contract_address="0x0000000000000000000000000000000000000001",
+        )
+        now = timezone.now()
+        # Dois eventos no mesmo instante: o id desempata a ordem
+        for days, event_type in [(0, "pay_rent"), (0, "pay_rent"), (10, "sign"), (40, "create"), (70, "pay_rent")]:
+            ContractEvent.objects.create(
+                contract=self.contract,
+                event_type=event_type,
+                user_address=TENANT_ADDRESS,
+                event_data={},
+                timestamp=now - timedelta(days=days),
+            )
+
+    def test_events_are_paged_newest_first_by_cursor(self):
+        url = reverse("contract_events", args=[self.contract.id])
+        ids, cursor = [], None
+        while True:
+            response = APIClient().get(url, {"limit": 2, **({"cursor": cursor} if cursor else {})})
+            ids += [event["id"] for event in response.data["results"]]
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = ContractEvent.objects.order_by("-timestamp", "-id").values_list("id", flat=True)
+        self.assertEqual(ids, list(expected))
+
+    def test_events_filter_by_type_and_window(self):
+        since = (timezone.now() - timedelta(days=50)).date().isoformat()
+        response = APIClient().get(
+            reverse("contract_events", args=[self.contract.id]), {"event_type": "pay_rent,sign", "since": since}
+        )
+
+        self.assertEqual([event["event_type"] for event in response.data["results"]], ["pay_rent", "pay_rent", "sign"])
+        self.assertIsNone(response.data["next_cursor"])
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for index, contract_status in enumerate(["active", "pending", "active"]):
+            contract = RentalContract.objects.create(
+                landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+                tenant=TENANT_ADDRESS,
+                rent_amount=1000,
+                deposit_amount=2000,
+                contract_address=f"0x{index:040x}",
+                status=contract_status,
+            )
+            Payment.objects.create(
+                contract=contract, amount=1000, payment_type="rent", transaction_hash=f"0x{index:064x}"
+            )
+            log_contract_event(contract, "create", TENANT_ADDRESS, event_data={"index": index})
+
+    def test_export_streams_ndjson_with_status_filter(self):
+        response = self.client.get(reverse("export", args=["payments"]), {"status": "active"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["amount"], "1000.00")
+
+    def test_export_csv_filters_by_date_range(self):
+        ContractEvent.objects.filter(event_data__index=0).update(timestamp=timezone.now() - timedelta(days=40))
+        since = (timezone.now() - timedelta(days=30)).date().isoformat()
+
+        response = self.client.get(reverse("export", args=["events"]), {"format": "csv", "since": since})
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "contract_id", "event_type"])
+        self.assertEqual(len(lines), 3)
+
+    def test_export_rejects_unknown_dataset_and_format(self):
+        self.assertEqual(self.client.get(reverse("export", args=["usuarios"])).status_code, 400)
+        self.assertEqual(self.client.get(reverse("export", args=["contracts"]), {"format": "xml"}).status_code, 400)
+
+    def test_export_command_writes_ndjson(self):
+        output = StringIO()
+        call_command("exportar_dados", "contracts", "--chunk-size", "1", stdout=output)
+
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([row["status"] for row in rows], ["active", "pending", "active"])
+
+class RenewalTaskTests(TestCase):
+    def create_contract(self, index, end_date, contract_status="active", contract_duration=12):
+        return RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            tenant=TENANT_ADDRESS,
+            rent_amount=1000,
+            deposit_amount=2000,
+            contract_address=f"0x{index:040x}",
+            end_date=end_date,
+            status=contract_status,
+            contract_duration=contract_duration,
+        )
+
+    def test_renewal_updates_due_contracts_in_chunks(self):
+        past = timezone.now() - timedelta(days=1)
+        future = timezone.now() + timedelta(days=30)
+        due = [self.create_contract(index, past) for index in range(5)]
+        broken = self.create_contract(5, past, contract_duration=None)
+        not_due = self.create_contract(6, future)
+        pending = self.create_contract(7, past, contract_status="pending")
+
+        metrics = renovar_contratos_automaticamente(chunk_size=2)
+
+        self.assertEqual({key: metrics[key] for key in ("scanned", "renewed", "failed")},
+                         {"scanned": 6, "renewed": 5, "failed": 1})
+        self.assertIn("duration_seconds", metrics)
+        for contract in due:
+            contract.refresh_from_db()
+            self.assertEqual(contract.end_date, past + relativedelta(months=12))
+        for contract, end_date in ((broken, past), (not_due, future), (pending, past)):
+            contract.refresh_from_db()
+            self.assertEqual(contract.end_date, end_date)
+
+class ChainStateTests(TestCase):
+    def test_refresh_stores_snapshot_used_by_contract_list(self):
+        web3 = check_connection()
+        rental_contract = create_signed_rental_contract(web3)
+
+        self.assertEqual(refresh_chain_state(web3, [rental_contract]), 1)
+        chain_state = ContractChainState.objects.get(contract=rental_contract)
+        self.assertTrue(chain_state.is_fully_signed)
+        self.assertFalse(chain_state.is_terminated)
+        self.assertEqual((chain_state.rent_amount, chain_state.deposit_amount), (1, 2))
+        end_timestamp = get_rental_contract(web3, rental_contract).functions.endTimestamp().call()
+        self.assertGreater(end_timestamp, 0)
+        self.assertEqual(chain_state.end_timestamp, end_timestamp)
+        self.assertEqual(chain_state.block_number, web3.eth.block_number)
+
+        with self.assertNumQueries(1):
+            response = APIClient().get(reverse("contract_list"), {"fully_signed": "true"})
+        results = response.data["results"]
+        self.assertEqual([contract["id"] for contract in results], [rental_contract.id])
+        self.assertTrue(results[0]["chain_state"]["is_fully_signed"])
+
+        response = APIClient().get(reverse("contract_list"), {"terminated": "true"})
+        self.assertEqual(response.data["results"], [])
+
+    def test_sweep_upserts_and_isolates_unreadable_contracts(self):
+        web3 = check_connection()
+        rental_contract = create_signed_rental_contract(web3)
+        RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            tenant=TENANT_ADDRESS,
+            rent_amount=1,
+            deposit_amount=2,
+            start_date=timezone.now(),
+            end_date=timezone.now(),
+            contract_address="0x000000000000000000000000000000000000dEaD",
+        )
+
+        summary = sweep_chain_states(web3, batch_size=10)
+        self.assertEqual(summary, {"contracts": 2, "updated": 1, "failed": 1})
+
+        send_contract_transaction(web3, get_rental_contract(web3, rental_contract).functions.terminateContract())
+        get_view_cache().clear()
+        sweep_chain_states(web3, batch_size=10)
+        self.assertEqual(ContractChainState.objects.count(), 1)
+        self.assertTrue(ContractChainState.objects.get(contract=rental_contract).is_terminated)
+
+class BatchPaymentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.web3 = check_connection()
+        get_view_cache().clear()
+
+    def test_batch_payment_reports_each_item_and_keeps_going(self):
+        first, second = create_signed_rental_contract(self.web3), create_signed_rental_contract(self.web3)
+        data = {
+            "private_key": TENANT_PRIVATE_KEY,
+            "payments": [
+                {"contract_id": first.id, "payment_type": "Aluguel", "amount": 1},
+                {"contract_id": second.id, "payment_type": "Depósito", "amount": 5},
+                {"contract_id": second.id, "payment_type": "Depósito", "amount": 2},
+                {"contract_id": 999999, "payment_type": "Aluguel", "amount": 1},
+            ],
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse("batch_register_payments"), data=data, format="json")
+
+        self.assertEqual(response.status_code, 207, response.data)
+        self.assertEqual([item["status"] for item in response.data["items"]], ["paid", "failed", "paid", "failed"])
+        self.assertIn("Esperado: 2 Wei", response.data["items"][1]["error"])
+        self.assertEqual(Payment.objects.count(), 2)
+        self.assertEqual(ContractEvent.objects.filter(event_type__in=["pay_rent", "pay_deposit"]).count(), 2)
+
+    def test_payment_terms_are_read_once_per_contract(self):
+        smart_contract = deploy_rental_contract(self.web3, rent_amount=3, deposit_amount=4)
+
+        with patch.object(self.web3.eth, "call", wraps=self.web3.eth.call) as mock_call:
+            first = read_payment_terms(self.web3, [smart_contract])
+            second = read_payment_terms(self.web3, [smart_contract, smart_contract])
+
+        self.assertEqual(first, [(3, 4)])
+        self.assertEqual(second, [(3, 4), (3, 4)])
+        self.assertEqual(mock_call.call_count, 2)
+
+class AutoRenewTests(TestCase):
+    def setUp(self):
+        self.web3 = check_connection()
+
+    def test_renewal_end_date_comes_from_mined_receipt(self):
+        """A nova data é a do evento ContractRenewed, não uma leitura em cache anterior à mineração."""
+        rental_contract = create_signed_rental_contract(self.web3)
+        Usuario.objects.create(login="locador", wallet_address=rental_contract.landlord, private_key="cifrada")
+        smart_contract = get_rental_contract(self.web3, rental_contract)
+        cached_call(self.web3, smart_contract.functions.getContractEndDate())
+
+        # A renovação fica pendente até alguém esperar pelo recibo
+        tester = self.web3.provider.ethereum_tester
+        tester.disable_auto_mine_transactions()
+        self.addCleanup(tester.enable_auto_mine_transactions)
+        wait_for_receipt = self.web3.eth.wait_for_transaction_receipt
+
+        def mine_and_wait(tx_hash, *args, **kwargs):
+            tester.mine_blocks()
+            return wait_for_receipt(tx_hash, *args, **kwargs)
+
+        with patch("contratos_inteligentes.views.decrypt_key", create=True, return_value=LANDLORD_PRIVATE_KEY), \
+                patch.object(self.web3.eth, "wait_for_transaction_receipt", side_effect=mine_and_wait):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = check_and_auto_renew(APIRequestFactory().post("/"))
+
+        self.assertEqual(response.status_code, 200)
+        new_end_date = smart_contract.functions.getContractEndDate().call()
+        self.assertEqual(new_end_date, 99)  # término inicial 0 + duração de 99 s
+        rental_contract.refresh_from_db()
+        self.assertEqual(rental_contract.end_date.timestamp(), new_end_date)
+        event = ContractEvent.objects.get(contract=rental_contract, event_type="auto_renew")
+        self.assertEqual(event.event_data["new_end_date"], new_end_date)
+
+
+class TransactionPreflightTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.web3 = check_connection()
+
+    def test_reverting_write_returns_reason_without_broadcasting(self):
+        rental_contract = create_signed_rental_contract(self.web3)
+        nonce_before = self.web3.eth.get_transaction_count(TENANT_ADDRESS)
+
+        response = self.client.post(
+            reverse("terminate_contract", args=[rental_contract.id]),
+            data={"private_key": TENANT_PRIVATE_KEY},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 422, response.data)
+        self.assertEqual(response.data["error"], "Apenas o locador pode encerrar o contrato.")
+        self.assertEqual(self.web3.eth.get_transaction_count(TENANT_ADDRESS), nonce_before)
+
+    def test_decodes_custom_errors_with_arguments(self):
+        error_abi = {
+            "type": "error",
+            "name": "IncorrectValue",
+            "inputs": [{"name": "expected", "type": "uint256"}, {"name": "received", "type": "uint256"}],
+        }
+        data = "0x" + (
+            Web3.keccak(text="IncorrectValue(uint256,uint256)")[:4] + encode(["uint256", "uint256"], [1, 5])
+        ).hex()
+
+        reverted = decode_revert(ContractCustomError(data, data=data), [error_abi])
+
+        self.assertIsInstance(reverted, TransactionReverted)
+        self.assertEqual(reverted.reason, "IncorrectValue")
+        self.assertEqual(reverted.arguments, {"expected": 1, "received": 5})
+
+class FeeOracleTests(TestCase):
+    def test_suggests_tiered_eip1559_fees(self):
+        history = {
+            "baseFeePerGas": [10, 12, 14],
+            "reward": [[1, 5, 9], [3, 7, 11], [2, 6, 10]],
+        }
+        fees = suggest_fees(history, min_priority_fee=4)
+
+        self.assertEqual(fees["slow"], {"maxFeePerGas": 32, "maxPriorityFeePerGas": 4})
+        self.assertEqual(fees["standard"], {"maxFeePerGas": 34, "maxPriorityFeePerGas": 6})
+        self.assertEqual(fees["fast"], {"maxFeePerGas": 38, "maxPriorityFeePerGas": 10})
+
+    def test_fee_params_reuse_recent_sample(self):
+        web3 = check_connection()
+        oracle = FeeOracle()
+
+        with patch.object(web3.eth, "fee_history", wraps=web3.eth.fee_history) as mock_history:
+            first = oracle.fee_params(web3, "fast")
+            second = oracle.fee_params(web3, "fast")
+
+        self.assertEqual(first, second)
+        self.assertIn("maxFeePerGas", first)
+        self.assertEqual(mock_history.call_count, 1)
+
+    @override_settings(GAS_ESTIMATE_MARGIN=1.5)
+    def test_gas_estimate_is_cached_per_function(self):
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        estimator = GasEstimator()
+
+        with patch.object(web3.eth, "estimate_gas", return_value=40000) as mock_estimate:
+            gas = estimator.gas_for(smart_contract.functions.terminateContract(), account)
+            estimator.gas_for(smart_contract.functions.terminateContract(), account)
+
+        self.assertEqual(gas, 60000)
+        self.assertEqual(mock_estimate.call_count, 1)
+        self.assertEqual(
+            estimator.get_stats(), {"size": 1, "hits": 1, "misses": 1, "refreshes": 0, "evictions": 0}
+        )
+
+    def test_gas_estimate_is_shared_by_contracts_of_same_abi(self):
+        """Cada contrato tem seu endereço: a estimativa é por função do artefato, não por contrato ou remetente."""
+        web3 = check_connection()
+        first_contract = deploy_rental_contract(web3)
+        second_contract = deploy_rental_contract(web3)
+        landlord = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        tenant = web3.eth.account.from_key(TENANT_PRIVATE_KEY)
+        estimator = GasEstimator()
+
+        with patch.object(web3.eth, "estimate_gas", return_value=40000) as mock_estimate:
+            estimator.gas_for(first_contract.functions.terminateContract(), landlord)
+            estimator.gas_for(second_contract.functions.terminateContract(), landlord)
+            estimator.gas_for(first_contract.functions.terminateContract(), tenant)
+
+        self.assertEqual(mock_estimate.call_count, 1)
+        self.assertEqual(estimator.get_stats()["hits"], 2)
+
+    @override_settings(GAS_ESTIMATE_MARGIN=1)
+    def test_keeps_highest_estimate_seen_in_window(self):
+        """O gás varia com o estado (ex.: primeira e segunda assinatura); a estimativa guardada é a maior."""
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        estimator = GasEstimator()
+
+        for estimate in (33000, 48000, 33000):
+            estimator.gas_for(smart_contract.functions.signAgreement(), account, estimate=estimate)
+
+        self.assertEqual(estimator.gas_for(smart_contract.functions.signAgreement(), account), 48000)
+
+    @override_settings(GAS_ESTIMATE_MARGIN=1, GAS_ESTIMATE_REFRESH_SECONDS=0)
+    def test_refresh_reestimates_last_seen_call(self):
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        estimator = GasEstimator()
+        estimator.gas_for(smart_contract.functions.terminateContract(), account, estimate=40000)
+
+        with patch.object(web3.eth, "estimate_gas", return_value=50000) as mock_estimate:
+            estimator.refresh()
+            gas = estimator.gas_for(smart_contract.functions.terminateContract(), account)
+
+        self.assertEqual(mock_estimate.call_count, 1)
+        self.assertEqual(gas, 50000)
+        self.assertEqual(estimator.get_stats()["refreshes"], 1)
+
+    @override_settings(GAS_ESTIMATE_MAX_ENTRIES=1)
+    def test_evicts_least_recently_used_estimates(self):
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        estimator = GasEstimator()
+
+        estimator.gas_for(smart_contract.functions.terminateContract(), account, estimate=40000)
+        estimator.gas_for(smart_contract.functions.signAgreement(), account, estimate=40000)
+
+        stats = estimator.get_stats()
+        self.assertEqual((stats["size"], stats["evictions"]), (1, 1))
+
+    def test_deploy_estimates_gas_once(self):
+        """A estimativa da simulação do construtor é usada no envio, sem um segundo eth_estimateGas."""
+        web3 = check_connection()
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        constructor = web3.eth.contract(abi=contract_abi, bytecode=bytecode).constructor(TENANT_ADDRESS, 1, 2, 1, 100)
+        get_gas_estimator().clear()
+
+        with patch.object(web3.eth, "estimate_gas", wraps=web3.eth.estimate_gas) as mock_estimate:
+            tx_hash = send_transaction(web3, constructor, account)
+
+        self.assertEqual(mock_estimate.call_count, 1)
+        self.assertEqual(web3.eth.wait_for_transaction_receipt(tx_hash)["status"], 1)
+
+    def test_function_write_is_simulated_once(self):
+        """A simulação da função é o próprio eth_estimateGas, reaproveitado como gás do envio."""
+        web3 = check_connection()
+        smart_contract = deploy_rental_contract(web3)
+        account = web3.eth.account.from_key(LANDLORD_PRIVATE_KEY)
+        get_gas_estimator().clear()
+
+        with patch.object(web3.eth, "estimate_gas", wraps=web3.eth.estimate_gas) as mock_estimate, \
+                patch.object(web3.eth, "call", wraps=web3.eth.call) as mock_call:
+            tx_hash = send_transaction(web3, smart_contract.functions.signAgreement(), account)
+
+        self.assertEqual(mock_estimate.call_count, 1)
+        self.assertEqual(mock_call.call_count, 0)
+        self.assertEqual(web3.eth.wait_for_transaction_receipt(tx_hash)["status"], 1)
+
+class NonceManagerTests(TestCase):
+    def setUp(self):
+        self.address = "0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335"
+        self.web3 = Mock()
+        self.web3.eth.get_transaction_count.return_value = 5
+
+    def test_reserves_consecutive_nonces_with_single_sync(self):
+        nonces = [reserve_nonce(self.web3, self.address) for _ in range(3)]
+
+        self.assertEqual(nonces, [5, 6, 7])
+        self.web3.eth.get_transaction_count.assert_called_once_with(self.address, "pending")
+
+    def test_reserve_block_of_nonces(self):
+        first = reserve_nonce(self.web3, self.address, count=10)
+        self.assertEqual(first, 5)
+        self.assertEqual(reserve_nonce(self.web3, self.address), 15)
+
+    def test_release_last_nonce_reuses_it(self):
+        nonce = reserve_nonce(self.web3, self.address)
+        release_nonce(self.address, nonce)
+        self.assertEqual(reserve_nonce(self.web3, self.address), nonce)
+
+    def test_released_gap_is_reused_without_reissuing_outstanding_nonces(self):
+        """A reserva 5 e B reserva 6; A devolve 5: o 5 é reaproveitado e o 6 de B não é reemitido."""
+        first = reserve_nonce(self.web3, self.address)
+        second = reserve_nonce(self.web3, self.address)
+        release_nonce(self.address, first)
+        self.assertEqual(AccountNonce.objects.get(address=self.address).released_nonces, [first])
+
+        mark_for_resync(self.address)
+        self.assertEqual(reserve_nonce(self.web3, self.address), first)
+        self.assertEqual(reserve_nonce(self.web3, self.address), second + 1)
+
+    def test_release_adjacent_to_end_rewinds_through_released_nonces(self):
+        first = reserve_nonce(self.web3, self.address)
+        second = reserve_nonce(self.web3, self.address)
+        release_nonce(self.address, first)
+        release_nonce(self.address, second)
+
+        record = AccountNonce.objects.get(address=self.address)
+        self.assertEqual((record.next_nonce, record.released_nonces), (first, []))
+
+    def test_resync_rewinds_only_when_no_reservation_is_in_flight(self):
+        reserve_nonce(self.web3, self.address)
+        reserve_nonce(self.web3, self.address)
+        mark_for_resync(self.address)
+
+        # A rede não viu o nonce 5, mas o 6 acabou de ser reservado por outra requisição
+        self.assertEqual(reserve_nonce(self.web3, self.address), 7)
+
+        mark_for_resync(self.address)
+        AccountNonce.objects.filter(address=self.address).update(reserved_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(reserve_nonce(self.web3, self.address), 5)
+
+    def test_gap_keeps_account_resyncing_until_closed(self):
+        reserve_nonce(self.web3, self.address)
+        reserve_nonce(self.web3, self.address)
+        mark_for_resync(self.address)
+        reserve_nonce(self.web3, self.address)
+        self.assertTrue(AccountNonce.objects.get(address=self.address).needs_resync)
+
+        self.web3.eth.get_transaction_count.return_value = 8
+        self.assertEqual(reserve_nonce(self.web3, self.address), 8)
+
+        record = AccountNonce.objects.get(address=self.address)
+        self.assertEqual(self.web3.eth.get_transaction_count.call_count, 3)
+        self.assertFalse(record.needs_resync)
+        self.assertIsNone(record.gap_nonce)
+
+    def test_missing_nonce_is_refilled_after_grace_without_rewinding(self):
+        """O 5 nunca chegou ao nó e outras reservas continuam: só o 5 é reemitido, uma vez."""
+        reserve_nonce(self.web3, self.address)
+        reserve_nonce(self.web3, self.address)
+        mark_for_resync(self.address)
+        self.assertEqual(reserve_nonce(self.web3, self.address), 7)
+
+        AccountNonce.objects.filter(address=self.address).update(gap_seen_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(reserve_nonce(self.web3, self.address), 5)
+        self.assertEqual(reserve_nonce(self.web3, self.address), 8)
+
+        record = AccountNonce.objects.get(address=self.address)
+        self.assertEqual((record.next_nonce, record.released_nonces, record.gap_nonce), (9, [], 5))
+        self.assertTrue(record.needs_resync)
+
+    def test_resync_follows_transactions_sent_elsewhere(self):
+        reserve_nonce(self.web3, self.address)
+        AccountNonce.objects.filter(address=self.address).update(synced_at=timezone.now() - timedelta(hours=1))
+
+        self.web3.eth.get_transaction_count.return_value = 20
+        self.assertEqual(reserve_nonce(self.web3, self.address), 20)
+
+class ContractLogsTestMixin:
+    """Contrato implantado, registrado no banco e assinado pelo locador."""
+
+    @patch.dict(os.environ, {"TEST_ENV": "true"})
+    def setUp(self):
+        self.web3 = BlockchainConnector().connect()
+        self.smart_contract = deploy_rental_contract(self.web3)
+        self.rental_contract = RentalContract.objects.create(
+            landlord="0x2efc7DFb5c7bbDd221a2060c83ED4C14d062F335",
+            tenant=TENANT_ADDRESS,
+            rent_amount=1,
+            deposit_amount=2,
+            contract_address=self.smart_contract.address,
+            end_date=timezone.now() + timedelta(days=30),
+        )
+        self.receipt = send_contract_transaction(self.web3, self.smart_contract.functions.signAgreement())
+
+class EventIndexerTests(ContractLogsTestMixin, TestCase):
+
+    def test_indexes_logs_and_saves_checkpoint(self):
+        summary = run_indexer(self.web3, contract_abi)
+
+        event = ContractEvent.objects.get(contract=self.rental_contract)
+        self.assertEqual(summary["events"], 1)
+        self.assertEqual(event.event_type, "sign")
+        self.assertEqual(event.block_number, self.receipt.blockNumber)
+        self.assertEqual(event.gas_used, self.receipt.gasUsed)
+        self.assertEqual(event.from_address, self.rental_contract.landlord)
+        self.assertEqual(
+            IndexerCheckpoint.objects.get(name="contract_events").last_block,
+            self.web3.eth.block_number,
+        )
+
+    def test_reindexing_is_idempotent(self):
+        run_indexer(self.web3, contract_abi)
+        IndexerCheckpoint.objects.update(last_block=-1)
+        run_indexer(self.web3, contract_abi)
+
+        self.assertEqual(ContractEvent.objects.filter(contract=self.rental_contract).count(), 1)
+
+    def test_completes_event_written_by_api(self):
+        tx_hash = self.receipt.transactionHash.hex()
+        ContractEvent.objects.create(
+            contract=self.rental_contract,
+            event_type="sign",
+            user_address=self.rental_contract.landlord,
+            event_data={"tx_hash": tx_hash, "user_type": "landlord"},
+            transaction_hash=tx_hash,
+        )
+
+        run_indexer(self.web3, contract_abi)
+
+        event = ContractEvent.objects.get(contract=self.rental_contract)
+        self.assertEqual(event.event_data["user_type"], "landlord")
+        self.assertEqual(event.block_number, self.receipt.blockNumber)
+        self.assertEqual(event.gas_used, self.receipt.gasUsed)
+
+    def test_reloads_contracts_for_each_block_range(self):
+        """Um contrato registrado no meio da execução tem os eventos dos intervalos seguintes indexados."""
+        calls = []
+
+        def registered_later():
+            calls.append(None)
+            return {} if len(calls) == 1 else known_contracts()
+
+        with patch("contratos_inteligentes.utils.event_indexer.known_contracts", side_effect=registered_later):
+            summary = run_indexer(self.web3, contract_abi, block_range=self.receipt.blockNumber)
+
+        self.assertEqual(summary["ranges"], len(calls))
+        self.assertGreater(summary["ranges"], 1)
+        self.assertEqual(summary["events"], 1)
+        self.assertTrue(ContractEvent.objects.filter(contract=self.rental_contract, event_type="sign").exists())
+
+class EventBackfillTests(ContractLogsTestMixin, TestCase):
+
+    def test_backfill_stores_events_and_records_shards(self):
+        head = self.web3.eth.block_number
+        summary = run_backfill(contract_abi, 0, head, self.web3, workers=1, shard_size=2, job="teste")
+
+        self.assertEqual(summary["events"], 1)
+        self.assertEqual(ContractEvent.objects.filter(contract=self.rental_contract).count(), 1)
+        self.assertFalse(BackfillShard.objects.filter(job="teste").exclude(status="done").exists())
+
+    def test_backfill_resumes_only_pending_shards(self):
+        head = self.web3.eth.block_number
+        run_backfill(contract_abi, 0, head, self.web3, workers=1, shard_size=2, job="teste")
+
+        summary = run_backfill(contract_abi, 0, head, self.web3, workers=1, shard_size=2, job="teste")
+        self.assertEqual(summary["shards"], 0)
+
+    def test_backfill_splits_shard_when_node_refuses_range(self):
+        def limited_fetch_logs(web3, addresses, from_block, to_block):
+            if to_block - from_block > 1:
+                raise ValueError("query returned more than 10000 results")
+            return fetch_logs(web3, addresses, from_block, to_block)
+
+        head = self.web3.eth.block_number
+        with patch("contratos_inteligentes.utils.event_backfill.fetch_logs", side_effect=limited_fetch_logs):
+            summary = run_backfill(contract_abi, 0, head, self.web3, workers=1, shard_size=head + 1, job="teste")
+
+        self.assertGreater(summary["splits"], 0)
+        self.assertEqual(summary["events"], 1)
+        shards = BackfillShard.objects.filter(job="teste")
+        self.assertTrue(all(shard.to_block - shard.from_block <= 1 for shard in shards))
+        self.assertFalse(shards.exclude(status="done").exists())
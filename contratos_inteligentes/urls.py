@@ -4,11 +4,21 @@ from . import views
 urlpatterns = [
     path("api/contracts/", views.contract_list_api, name="contract_list"),
     path("api/create/", views.create_contract_api, name="create_contract"),
+    path(
+        "api/contracts/batch_create/",
+        views.batch_create_contracts_api,
+        name="batch_create_contracts",
+    ),
     path(
         "api/contracts/<int:contract_id>/register_payment/",
         views.register_payment_api,
         name="register_payment",
     ),
+    path(
+        "api/payments/batch/",
+        views.batch_register_payments_api,
+        name="batch_register_payments",
+    ),
     path(
         "api/contracts/<int:contract_id>/terminate/",
         views.terminate_contract_api,
@@ -19,6 +29,16 @@ urlpatterns = [
         views.sign_contract_api,
         name="sign_contract",
     ),
+    path(
+        "api/contracts/<int:contract_id>/typed_data/",
+        views.contract_typed_data_api,
+        name="contract_typed_data",
+    ),
+    path(
+        "api/contracts/<int:contract_id>/offchain_sign/",
+        views.offchain_sign_contract_api,
+        name="offchain_sign_contract",
+    ),
     path(
         "api/contracts/<int:contract_id>/events/",
         views.contract_events_api,
@@ -33,5 +53,12 @@ urlpatterns = [
     ),
     path('api/login/', views.login, name='login'),
     path("api/get_landlord_address/", views.get_landlord_address, name="get_landlord_address"),
+    path(
+        "api/transactions/<str:tx_hash>/",
+        views.transaction_status_api,
+        name="transaction_status",
+    ),
+    path("api/export/<str:dataset>/", views.export_api, name="export"),
+    path("api/metrics/", views.blockchain_metrics_api, name="blockchain_metrics"),
     # path('api/contracts/<int:contract_id>/test_contract_functions/', views.test_contract_functions, name='test_contract_functions'),
 ]
@@ -1,5 +1,13 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+from requests import Session  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout  # type: ignore
 from web3 import Web3  # type: ignore
+from web3.exceptions import ProviderConnectionError  # type: ignore
 from eth_tester import EthereumTester, PyEVMBackend  # type: ignore
 from eth_utils import to_wei
 from web3.providers.eth_tester import EthereumTesterProvider  # type: ignore
@@ -7,6 +15,7 @@ from web3.providers.eth_tester import EthereumTesterProvider  # type: ignore
 class BlockchainConnector:
     def __init__(self):
         self.web3 = None
+        self.session = None
 
     def connect(self):
         if os.getenv("TEST_ENV") == "true":
@@ -45,14 +54,144 @@ class BlockchainConnector:
         else:
             # Conectar à rede Sepolia ou outra rede real
             sepolia_url = os.getenv("GANACHE_URL")
-            self.web3 = Web3(Web3.HTTPProvider(sepolia_url))
+
+            # Sessão HTTP própria para manter as conexões TCP/TLS abertas entre requisições
+            pool_size = int(os.getenv("BLOCKCHAIN_HTTP_POOL_SIZE", "10"))
+            self.session = Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+            self.web3 = Web3(Web3.HTTPProvider(sepolia_url, session=self.session))
 
         if not self.web3.is_connected():
+            self.close()
             raise Exception("Não conectado à rede Ethereum. Verifique sua conexão.")
-        
+
         return self.web3
 
     def get_web3_instance(self):
         if not self.web3:
             self.connect()
         return self.web3
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        self.web3 = None
+
+
+class ConnectionPool:
+    """
+    Mantém um único BlockchainConnector por processo (worker), reaproveitando
+    o provider e a sessão HTTP entre requisições. A saúde da conexão só é
+    verificada depois de `health_check_interval` segundos ou quando o pool é
+    invalidado após uma falha.
+    """
+
+    def __init__(self, health_check_interval=None):
+        if health_check_interval is None:
+            health_check_interval = float(os.getenv("BLOCKCHAIN_HEALTH_CHECK_SECONDS", "30"))
+        self.health_check_interval = health_check_interval
+        self._lock = threading.Lock()
+        self._connector = None
+        self._pid = None
+        self._last_check = 0.0
+        self._stale = False
+        self._stats = {
+            "connects": 0,
+            "reconnects": 0,
+            "reuses": 0,
+            "health_checks": 0,
+            "failures": 0,
+        }
+
+    def get_web3(self):
+        with self._lock:
+            # Após um fork (gunicorn/celery) a conexão herdada não pode ser compartilhada
+            if self._connector is not None and self._pid != os.getpid():
+                self._discard()
+
+            if self._connector is None:
+                return self._connect()
+
+            if self._stale or time.monotonic() - self._last_check >= self.health_check_interval:
+                self._stats["health_checks"] += 1
+                if not self._is_healthy():
+                    self._stats["reconnects"] += 1
+                    self._discard()
+                    return self._connect()
+                self._last_check = time.monotonic()
+                self._stale = False
+
+            self._stats["reuses"] += 1
+            return self._connector.web3
+
+    def invalidate(self):
+        """Força uma nova verificação (e reconexão, se necessário) no próximo uso."""
+        with self._lock:
+            self._stale = True
+
+    def reset(self):
+        with self._lock:
+            self._discard()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["connected"] = self._connector is not None
+            stats["pid"] = self._pid
+            stats["health_check_interval"] = self.health_check_interval
+            return stats
+
+    def _connect(self):
+        connector = BlockchainConnector()
+        try:
+            web3 = connector.connect()
+        except Exception:
+            self._stats["failures"] += 1
+            raise
+        self._connector = connector
+        self._pid = os.getpid()
+        self._last_check = time.monotonic()
+        self._stale = False
+        self._stats["connects"] += 1
+        return web3
+
+    def _is_healthy(self):
+        try:
+            return self._connector.web3.is_connected()
+        except Exception:
+            return False
+
+    def _discard(self):
+        if self._connector is not None:
+            self._connector.close()
+        self._connector = None
+        self._pid = None
+        self._stale = False
+
+
+_connection_pool = ConnectionPool()
+
+
+def get_connection_pool():
+    return _connection_pool
+
+
+# Falhas de transporte (nó fora do ar, conexão recusada, timeout); reverts e
+# erros de ABI não indicam problema na conexão
+TRANSPORT_ERRORS = (RequestsConnectionError, Timeout, ProviderConnectionError, ConnectionError)
+
+
+@contextmanager
+def invalidate_on_failure():
+    """Marca a conexão do pool para verificação no próximo uso se o bloco falhar no transporte."""
+    try:
+        yield
+    except TRANSPORT_ERRORS:
+        get_connection_pool().invalidate()
+        raise
@@ -0,0 +1,120 @@
+import logging
+
+from django.conf import settings  # type: ignore
+
+from ..models import ContractChainState, RentalContract
+from .contract_deployer import get_rental_contract
+from .contract_reader import ContractState, batch_call
+
+logger = logging.getLogger(__name__)
+
+# Contratos sem implantação confirmada não têm estado para ler
+UNREADABLE_STATUSES = ("deploying", "failed")
+
+SNAPSHOT_FIELDS = [
+    "landlord_signed",
+    "tenant_signed",
+    "is_terminated",
+    "is_active",
+    "rent_amount",
+    "deposit_amount",
+    "end_timestamp",
+    "block_number",
+    "updated_at",
+]
+
+
+def refresh_chain_state(web3, rental_contracts):
+    """
+    Lê `getContractState()` e `endTimestamp()` de cada contrato em uma
+    única requisição em lote e grava os snapshots em ContractChainState
+    (insere ou atualiza). Retorna quantos snapshots foram gravados.
+    """
+    rental_contracts = [
+        rental_contract
+        for rental_contract in rental_contracts
+        if rental_contract.contract_address and rental_contract.status not in UNREADABLE_STATUSES
+    ]
+    if not rental_contracts:
+        return 0
+
+    block_number = web3.eth.block_number
+    calls = []
+    for rental_contract in rental_contracts:
+        smart_contract = get_rental_contract(web3, rental_contract)
+        calls.append(smart_contract.functions.getContractState())
+        calls.append(smart_contract.functions.endTimestamp())
+    values = batch_call(web3, calls)
+
+    snapshots = []
+    for position, rental_contract in enumerate(rental_contracts):
+        state = ContractState(*values[2 * position])
+        snapshots.append(
+            ContractChainState(
+                contract=rental_contract,
+                landlord_signed=state.landlord_signed,
+                tenant_signed=state.tenant_signed,
+                is_terminated=state.is_terminated,
+                is_active=state.is_active,
+                rent_amount=state.rent_amount,
+                deposit_amount=state.deposit_amount,
+                end_timestamp=values[2 * position + 1],
+                block_number=block_number,
+            )
+        )
+
+    ContractChainState.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=["contract"],
+        update_fields=SNAPSHOT_FIELDS,
+    )
+    return len(snapshots)
+
+
+def refresh_after_write(web3, rental_contracts):
+    """
+    Atualiza os snapshots depois de uma escrita confirmada. Uma falha aqui não
+    desfaz a operação: a varredura periódica corrige o snapshot depois.
+    """
+    try:
+        return refresh_chain_state(web3, rental_contracts)
+    except Exception:
+        logger.exception("Erro ao atualizar o estado on-chain")
+        return 0
+
+
+def sweep_chain_states(web3, batch_size=None):
+    """
+    Atualiza o snapshot de todos os contratos legíveis, em lotes de
+    `batch_size` (uma requisição JSON-RPC por lote). Se um lote falhar, os
+    contratos dele são lidos um a um para isolar o que não responde.
+    """
+    batch_size = batch_size or settings.CHAIN_STATE_SWEEP_BATCH
+    contracts = RentalContract.objects.exclude(status__in=UNREADABLE_STATUSES).order_by("pk")
+
+    summary = {"contracts": 0, "updated": 0, "failed": 0}
+    chunk = []
+    for rental_contract in contracts.iterator(chunk_size=batch_size):
+        chunk.append(rental_contract)
+        if len(chunk) == batch_size:
+            _sweep_chunk(web3, chunk, summary)
+            chunk = []
+    if chunk:
+        _sweep_chunk(web3, chunk, summary)
+    return summary
+
+
+def _sweep_chunk(web3, chunk, summary):
+    summary["contracts"] += len(chunk)
+    try:
+        summary["updated"] += refresh_chain_state(web3, chunk)
+        return
+    except Exception:
+        pass
+
+    for rental_contract in chunk:
+        try:
+            summary["updated"] += refresh_chain_state(web3, [rental_contract])
+        except Exception:
+            summary["failed"] += 1
@@ -1,6 +1,6 @@
 # check_connection.py
-from .blockchain_connector import BlockchainConnector
+from .blockchain_connector import get_connection_pool
 
 def check_connection():
-    connector = BlockchainConnector()
-    return connector.get_web3_instance()
+    # Reaproveita a conexão do processo em vez de criar um novo provider por requisição
+    return get_connection_pool().get_web3()
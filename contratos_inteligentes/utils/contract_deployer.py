@@ -0,0 +1,155 @@
+from django.conf import settings  # type: ignore
+from web3 import Web3  # type: ignore
+
+from .contract_factory import get_contract, to_checksum_address
+from .load_contract_data import (
+    ARTIFACT_NAME,
+    CLONE_ARTIFACT_NAME,
+    FACTORY_ARTIFACT_NAME,
+    REGISTRY_ARTIFACT_NAME,
+    get_contract_artifact,
+)
+
+# AgreementCreated(address indexed agreement, address indexed locador, address indexed inquilino)
+AGREEMENT_CREATED_TOPIC = bytes(Web3.keccak(text="AgreementCreated(address,address,address)"))
+# AgreementCreated(uint256 indexed agreementId, address indexed locador, address indexed inquilino)
+REGISTRY_AGREEMENT_CREATED_TOPIC = bytes(Web3.keccak(text="AgreementCreated(uint256,address,address)"))
+# ContractRenewed(address indexed locador, address indexed inquilino, uint256 newEndDate)
+CONTRACT_RENEWED_TOPIC = bytes(Web3.keccak(text="ContractRenewed(address,address,uint256)"))
+# ContractRenewed(uint256 indexed agreementId, uint256 newEndDate)
+REGISTRY_CONTRACT_RENEWED_TOPIC = bytes(Web3.keccak(text="ContractRenewed(uint256,uint256)"))
+
+
+class RegistryAgreement:
+    """
+    Um acordo dentro do RentalRegistry com a mesma interface de um contrato
+    individual: `functions.payRent()` vira `payRent(agreement_id)` no registro,
+    então as views e os leitores não precisam saber qual backend está em uso.
+    """
+
+    def __init__(self, registry, agreement_id):
+        self.registry = registry
+        self.agreement_id = agreement_id
+        self.address = registry.address
+        self.functions = _AgreementFunctions(registry, agreement_id)
+
+
+class _AgreementFunctions:
+    def __init__(self, registry, agreement_id):
+        self._registry = registry
+        self._agreement_id = agreement_id
+
+    def __getattr__(self, name):
+        function = getattr(self._registry.functions, name)
+        return lambda *args, **kwargs: function(self._agreement_id, *args, **kwargs)
+
+
+def factory_address():
+    address = settings.RENTAL_FACTORY_ADDRESS
+    return to_checksum_address(address) if address else None
+
+
+def registry_address():
+    address = settings.RENTAL_REGISTRY_ADDRESS
+    return to_checksum_address(address) if address else None
+
+
+def uses_registry():
+    return settings.RENTAL_BACKEND == "registry"
+
+
+def predicts_address():
+    """
+    Só a implantação direta (CREATE pela própria conta) tem endereço
+    conhecido antes da mineração: depende apenas do remetente e do nonce.
+    """
+    return not uses_registry() and not factory_address()
+
+
+def get_rental_contract(web3, rental_contract):
+    """
+    Instância para operar um RentalContract, seja contrato próprio ou acordo
+    do registro, com a ABI do artefato gravado na criação.
+    """
+    abi = get_contract_artifact(rental_contract.contract_artifact).abi
+    if rental_contract.agreement_id is not None:
+        registry = get_contract(web3, rental_contract.contract_address, abi)
+        return RegistryAgreement(registry, rental_contract.agreement_id)
+    return get_contract(web3, rental_contract.contract_address, abi)
+
+
+def build_create_call(web3, tenant, rent_amount, deposit_amount, start_date, end_date):
+    """
+    Retorna (chamada que cria um novo contrato de aluguel, nome do artefato
+    que opera o contrato criado).
+    No backend "registry" o acordo é gravado no RentalRegistry; com
+    RENTAL_FACTORY_ADDRESS configurado, é criado um clone EIP-1167 pela
+    fábrica; caso contrário o bytecode completo é implantado.
+    """
+    args = (tenant, rent_amount, deposit_amount, start_date, end_date)
+
+    if uses_registry():
+        if not registry_address():
+            raise ValueError("RENTAL_REGISTRY_ADDRESS não configurado para o backend de registro.")
+        registry = get_contract(web3, registry_address(), get_contract_artifact(REGISTRY_ARTIFACT_NAME).abi)
+        return registry.functions.createAgreement(*args), REGISTRY_ARTIFACT_NAME
+
+    address = factory_address()
+    if address:
+        factory = get_contract(web3, address, get_contract_artifact(FACTORY_ARTIFACT_NAME).abi)
+        return factory.functions.createAgreement(*args), CLONE_ARTIFACT_NAME
+
+    artifact = get_contract_artifact()
+    smart_contract = get_contract(web3, None, artifact.abi, artifact.bytecode)
+    return smart_contract.constructor(*args), ARTIFACT_NAME
+
+
+def created_agreement(receipt):
+    """
+    Retorna (endereço, agreement_id) do contrato criado pela transação:
+    `contractAddress` numa implantação direta, o clone anunciado pela fábrica
+    ou o registro e o id do acordo gravado nele. (None, None) se não houver.
+    """
+    if receipt.get("contractAddress"):
+        return receipt["contractAddress"], None
+
+    factory = factory_address()
+    registry = registry_address()
+    for log in receipt.get("logs", []):
+        topics = log["topics"]
+        if len(topics) < 2:
+            continue
+        emitter = to_checksum_address(log["address"])
+        topic = bytes(topics[0])
+
+        if topic == AGREEMENT_CREATED_TOPIC and (factory is None or emitter == factory):
+            return to_checksum_address(bytes(topics[1])[-20:].hex()), None
+        if topic == REGISTRY_AGREEMENT_CREATED_TOPIC and (registry is None or emitter == registry):
+            return emitter, int.from_bytes(bytes(topics[1]), "big")
+    return None, None
+
+
+def renewed_end_date(receipt, smart_contract):
+    """
+    `newEndDate` do evento ContractRenewed emitido por `smart_contract` na
+    transação; None se a renovação não aparecer no recibo.
+    """
+    agreement_id = getattr(smart_contract, "agreement_id", None)
+    for log in receipt.get("logs", []):
+        if to_checksum_address(log["address"]) != smart_contract.address:
+            continue
+        topics = [bytes(topic) for topic in log["topics"]]
+        if agreement_id is None:
+            renewed = topics[:1] == [CONTRACT_RENEWED_TOPIC]
+        else:
+            # No registro o evento traz o id do acordo, pois todos dividem o endereço
+            renewed = len(topics) >= 2 and topics[0] == REGISTRY_CONTRACT_RENEWED_TOPIC and (
+                int.from_bytes(topics[1], "big") == agreement_id
+            )
+        if renewed:
+            return int.from_bytes(bytes(log["data"])[-32:], "big")
+    return None
+
+
+def created_contract_address(receipt):
+    return created_agreement(receipt)[0]
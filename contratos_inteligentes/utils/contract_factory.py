@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from web3 import Web3  # type: ignore
+
+
+@lru_cache(maxsize=4096)
+def to_checksum_address(address):
+    """Web3.to_checksum_address com cache (o keccak é refeito a cada chamada)."""
+    return Web3.to_checksum_address(address)
+
+
+def abi_hash(abi):
+    """Hash do conteúdo da ABI; memoizado por objeto para não serializar a ABI a cada uso."""
+    cached = _abi_hashes.get(id(abi))
+    if cached is not None and cached[0] is abi:
+        return cached[1]
+    digest = hashlib.sha256(json.dumps(abi, sort_keys=True).encode()).hexdigest()
+    if len(_abi_hashes) >= 32:
+        _abi_hashes.clear()
+    _abi_hashes[id(abi)] = (abi, digest)
+    return digest
+
+
+_abi_hashes = {}
+
+
+class ContractCache:
+    """
+    Cache LRU de instâncias de contrato vinculadas. A chave inclui a instância
+    Web3 (um contrato fica preso ao provider que o criou), o endereço e o hash
+    da ABI/bytecode, então um artefato recompilado gera entradas novas.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, web3, address, abi, bytecode=None):
+        if address is not None:
+            address = to_checksum_address(address)
+        bytecode_hash = hashlib.sha256(bytecode.encode()).hexdigest() if bytecode else None
+        key = (id(web3), address, abi_hash(abi), bytecode_hash)
+
+        with self._lock:
+            contract = self._entries.get(key)
+            if contract is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return contract
+            self._misses += 1
+
+        if address is None:
+            contract = web3.eth.contract(abi=abi, bytecode=bytecode)
+        else:
+            contract = web3.eth.contract(address=address, abi=abi)
+
+        with self._lock:
+            self._entries[key] = contract
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return contract
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        checksum_info = to_checksum_address.cache_info()
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "checksum_hits": checksum_info.hits,
+                "checksum_misses": checksum_info.misses,
+            }
+
+
+_contract_cache = ContractCache(maxsize=int(os.getenv("CONTRACT_CACHE_SIZE", "256")))
+
+
+def get_contract(web3, address, abi, bytecode=None):
+    return _contract_cache.get(web3, address, abi, bytecode)
+
+
+def get_contract_cache():
+    return _contract_cache
@@ -0,0 +1,245 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import NamedTuple
+
+from web3.contract.contract import ContractFunction  # type: ignore
+from web3.exceptions import Web3TypeError  # type: ignore
+
+from .blockchain_connector import invalidate_on_failure
+
+
+class ContractState(NamedTuple):
+    """Retorno decodificado de `getContractState()`."""
+
+    landlord: str
+    tenant: str
+    rent_amount: int
+    deposit_amount: int
+    is_terminated: bool
+    landlord_signed: bool
+    tenant_signed: bool
+    is_active: bool
+
+    @property
+    def is_fully_signed(self):
+        return self.landlord_signed and self.tenant_signed
+
+    @property
+    def is_contract_active(self):
+        return not self.is_terminated
+
+
+class PaymentTerms(NamedTuple):
+    rent_amount: int
+    deposit_amount: int
+
+
+# Getters de valores fixados na criação: a leitura on-chain vale para sempre
+IMMUTABLE_FUNCTIONS = frozenset(
+    {"getRentAmount", "getDepositAmount", "rentAmount", "deposit", "locador", "inquilino", "startTimestamp"}
+)
+
+
+class SignPreflight(NamedTuple):
+    is_deployed: bool
+    state: ContractState
+
+
+class ViewCallCache:
+    """
+    Cache de leituras (`eth_call`) por (endereço, função, argumentos).
+    Getters imutáveis ficam em cache até serem expulsos pelo LRU; os demais
+    valem só no bloco em que foram lidos e caem quando um bloco novo chega
+    ou quando este processo envia uma transação ao contrato. O número do
+    bloco atual é consultado no máximo a cada `block_poll_interval` segundos.
+    """
+
+    def __init__(self, maxsize=4096, block_poll_interval=1.0):
+        self.maxsize = maxsize
+        self.block_poll_interval = block_poll_interval
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._heads = {}
+        self._stats = {
+            "hits": 0,
+            "immutable_hits": 0,
+            "misses": 0,
+            "block_invalidations": 0,
+            "write_invalidations": 0,
+            "evictions": 0,
+        }
+        self._hit_age_total = 0.0
+        self._hit_age_max = 0.0
+
+    def lookup(self, web3, function):
+        """Retorna (True, valor) se houver leitura válida em cache, senão (False, None)."""
+        key = _call_key(web3, function)
+        block = None if key[2] in IMMUTABLE_FUNCTIONS else self._head(web3)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (block is not None and entry[1] != block):
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            age = time.monotonic() - entry[2]
+            self._stats["immutable_hits" if block is None else "hits"] += 1
+            self._hit_age_total += age
+            self._hit_age_max = max(self._hit_age_max, age)
+            return True, entry[0]
+
+    def store(self, web3, function, value):
+        key = _call_key(web3, function)
+        block = None if key[2] in IMMUTABLE_FUNCTIONS else self._head(web3)
+        with self._lock:
+            self._entries[key] = (value, block, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate_address(self, address):
+        """Descarta as leituras mutáveis de um contrato (após uma escrita deste processo)."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if key[1] == address and entry[1] is not None]
+            for key in stale:
+                del self._entries[key]
+            self._stats["write_invalidations"] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heads.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            hits = stats["hits"] + stats["immutable_hits"]
+            stats["size"] = len(self._entries)
+            stats["maxsize"] = self.maxsize
+            stats["hit_ratio"] = round(hits / (hits + stats["misses"]), 3) if hits + stats["misses"] else None
+            stats["avg_hit_age_seconds"] = round(self._hit_age_total / hits, 3) if hits else None
+            stats["max_hit_age_seconds"] = round(self._hit_age_max, 3)
+            stats["block_poll_interval"] = self.block_poll_interval
+            return stats
+
+    def _head(self, web3):
+        now = time.monotonic()
+        with self._lock:
+            head = self._heads.get(id(web3))
+            if head is not None and now - head[1] < self.block_poll_interval:
+                return head[0]
+
+        block = web3.eth.block_number
+        with self._lock:
+            previous = self._heads.get(id(web3))
+            self._heads[id(web3)] = (block, now)
+            if previous is not None and previous[0] != block:
+                # Bloco novo: leituras mutáveis desta conexão deixam de valer
+                stale = [
+                    key for key, entry in self._entries.items() if key[0] == id(web3) and entry[1] is not None
+                ]
+                for key in stale:
+                    del self._entries[key]
+                self._stats["block_invalidations"] += len(stale)
+        return block
+
+
+_view_cache = ViewCallCache(
+    maxsize=int(os.getenv("VIEW_CACHE_SIZE", "4096")),
+    block_poll_interval=float(os.getenv("VIEW_CACHE_BLOCK_POLL_SECONDS", "1")),
+)
+
+
+def get_view_cache():
+    return _view_cache
+
+
+def batch_call(web3, calls):
+    """
+    Executa várias leituras em uma única requisição JSON-RPC em lote.
+
+    Cada item de `calls` é uma função de contrato ainda não chamada
+    (`contract.functions.x()`) ou um callable sem argumentos que dispara um
+    método de `web3.eth` (ex.: `lambda: web3.eth.get_code(address)`).
+    Funções de contrato passam pelo ViewCallCache; só as que não estão em
+    cache vão ao nó. Provedores sem suporte a lote, como o
+    EthereumTesterProvider, recebem as mesmas chamadas em sequência.
+    """
+    results = [None] * len(calls)
+    pending = []
+    for index, item in enumerate(calls):
+        if isinstance(item, ContractFunction):
+            hit, value = _view_cache.lookup(web3, item)
+            if hit:
+                results[index] = value
+                continue
+        pending.append(index)
+
+    if pending:
+        fetched = _execute(web3, [calls[index] for index in pending])
+        for index, value in zip(pending, fetched):
+            results[index] = value
+            if isinstance(calls[index], ContractFunction):
+                _view_cache.store(web3, calls[index], value)
+    return results
+
+
+def cached_call(web3, function):
+    (value,) = batch_call(web3, [function])
+    return value
+
+
+def _execute(web3, calls):
+    try:
+        batch = web3.batch_requests()
+    except Web3TypeError:
+        with invalidate_on_failure():
+            return [_call(item) for item in calls]
+
+    with invalidate_on_failure(), batch:
+        for item in calls:
+            batch.add(item if isinstance(item, ContractFunction) else item())
+        return list(batch.execute())
+
+
+def read_contract_state(web3, smart_contract):
+    (state,) = batch_call(web3, [smart_contract.functions.getContractState()])
+    return ContractState(*state)
+
+
+def read_sign_preflight(web3, smart_contract):
+    """Código implantado e estado do contrato em uma única ida ao nó."""
+    code, state = batch_call(
+        web3,
+        [
+            lambda: web3.eth.get_code(smart_contract.address),
+            smart_contract.functions.getContractState(),
+        ],
+    )
+    return SignPreflight(is_deployed=bool(code), state=ContractState(*state))
+
+
+def read_payment_terms(web3, smart_contracts):
+    """
+    Valores de aluguel e depósito de vários contratos (ou acordos do
+    registro), na ordem recebida. São imutáveis, então ficam no
+    ViewCallCache; os que faltam são lidos em uma única requisição em lote.
+    """
+    calls = []
+    for smart_contract in smart_contracts:
+        calls.append(smart_contract.functions.getRentAmount())
+        calls.append(smart_contract.functions.getDepositAmount())
+    values = batch_call(web3, calls)
+    return [PaymentTerms(*values[index:index + 2]) for index in range(0, len(values), 2)]
+
+
+def _call_key(web3, function):
+    return id(web3), function.address, function.fn_name, tuple(function.args or ())
+
+
+def _call(item):
+    if isinstance(item, ContractFunction):
+        return item.call()
+    return item()
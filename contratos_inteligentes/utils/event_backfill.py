@@ -0,0 +1,162 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from django.db import transaction  # type: ignore
+from web3 import Web3  # type: ignore
+
+from ..models import BackfillShard
+from .event_indexer import decode_logs, fetch_logs, fetch_receipts, known_contracts, store_events, watched_addresses
+
+# Mensagens com que os nós recusam um eth_getLogs grande demais
+TOO_MANY_RESULTS_MARKERS = (
+    "more than",
+    "too many",
+    "response size",
+    "limit exceeded",
+    "range is too",
+    "block range",
+)
+
+# Conexão reaproveitada dentro de cada processo do pool
+_process_web3 = {}
+
+
+def plan_shards(from_block, to_block, shard_size):
+    return [
+        (start, min(start + shard_size - 1, to_block))
+        for start in range(from_block, to_block + 1, shard_size)
+    ]
+
+
+def fetch_shard(source, addresses, from_block, to_block, contract_abi):
+    """
+    Busca e decodifica os logs de um intervalo. Roda dentro do processo do
+    pool; `source` é a URL do nó (ou a própria instância Web3 no modo sem
+    pool). Retorna None quando o nó recusa o intervalo por excesso de
+    resultados, sinalizando que ele deve ser dividido.
+    """
+    web3 = _web3_for(source)
+    try:
+        logs = fetch_logs(web3, addresses, from_block, to_block)
+    except Exception as e:
+        if any(marker in str(e).lower() for marker in TOO_MANY_RESULTS_MARKERS):
+            return None
+        raise
+
+    decoded = decode_logs(web3, logs, contract_abi)
+    receipts = fetch_receipts(web3, {item["transaction_hash"] for item in decoded}) if decoded else {}
+    return decoded, receipts
+
+
+def run_backfill(contract_abi, from_block, to_block, source, workers=4, shard_size=5000, job=None):
+    """
+    Indexa um intervalo histórico dividido em fragmentos processados em
+    paralelo. Fragmentos recusados pelo nó são divididos ao meio e
+    reenfileirados; cada fragmento concluído é gravado com seu status, então
+    uma nova execução do mesmo `job` só processa o que ficou pendente.
+    """
+    job = job or f"backfill-{from_block}-{to_block}"
+    if not BackfillShard.objects.filter(job=job).exists():
+        BackfillShard.objects.bulk_create(
+            [
+                BackfillShard(job=job, from_block=start, to_block=end)
+                for start, end in plan_shards(from_block, to_block, shard_size)
+            ]
+        )
+
+    contracts_by_address = known_contracts()
+    addresses = watched_addresses(contracts_by_address)
+    summary = {"job": job, "shards": 0, "splits": 0, "failed": 0, "events": 0}
+
+    shards = list(
+        BackfillShard.objects.filter(job=job, status__in=["pending", "failed"]).order_by("from_block")
+    )
+    if not shards or not addresses:
+        return summary
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+    with executor:
+        futures = {}
+
+        def submit(shard):
+            future = executor.submit(
+                fetch_shard, source, addresses, shard.from_block, shard.to_block, contract_abi
+            )
+            futures[future] = shard
+
+        for shard in shards:
+            submit(shard)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                shard = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    shard.status = "failed"
+                    shard.error = str(e)
+                    shard.save(update_fields=["status", "error", "updated_at"])
+                    summary["failed"] += 1
+                    continue
+
+                if result is None and shard.from_block < shard.to_block:
+                    for half in _split(shard):
+                        submit(half)
+                    summary["splits"] += 1
+                    continue
+                if result is None:
+                    shard.status = "failed"
+                    shard.error = "O nó recusou até um único bloco por excesso de resultados."
+                    shard.save(update_fields=["status", "error", "updated_at"])
+                    summary["failed"] += 1
+                    continue
+
+                decoded, receipts = result
+                with transaction.atomic():
+                    shard.events = store_events(decoded, receipts, contracts_by_address)
+                    shard.status = "done"
+                    shard.error = None
+                    shard.save(update_fields=["events", "status", "error", "updated_at"])
+                summary["shards"] += 1
+                summary["events"] += shard.events
+
+    return summary
+
+
+def _split(shard):
+    middle = (shard.from_block + shard.to_block) // 2
+    with transaction.atomic():
+        halves = BackfillShard.objects.bulk_create(
+            [
+                BackfillShard(job=shard.job, from_block=shard.from_block, to_block=middle),
+                BackfillShard(job=shard.job, from_block=middle + 1, to_block=shard.to_block),
+            ]
+        )
+        shard.delete()
+    return halves
+
+
+def _web3_for(source):
+    if not isinstance(source, str):
+        return source
+    if source not in _process_web3:
+        _process_web3[source] = Web3(Web3.HTTPProvider(source))
+    return _process_web3[source]
+
+
+class _InlineExecutor:
+    """Executa no próprio processo (ex.: cadeia em memória do TEST_ENV)."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
@@ -0,0 +1,222 @@
+from django.conf import settings  # type: ignore
+from django.db import transaction  # type: ignore
+from eth_utils import event_abi_to_log_topic  # type: ignore
+from web3 import Web3  # type: ignore
+
+from ..models import ContractEvent, IndexerCheckpoint, RentalContract
+from .blockchain_connector import invalidate_on_failure
+from .contract_factory import to_checksum_address
+from .contract_reader import batch_call
+from .load_contract_data import REGISTRY_ARTIFACT_NAME, get_contract_artifact
+
+CHECKPOINT_NAME = "contract_events"
+
+# Eventos do RentalAgreement e o event_type correspondente em ContractEvent
+EVENT_TYPES = {
+    "RentPaid": "pay_rent",
+    "DepositPaid": "pay_deposit",
+    "AgreementSigned": "sign",
+    "ContractTerminated": "terminate",
+    "ContractRenewed": "auto_renew",
+    "RentPaymentPending": "rent_pending",
+    "ContractExpired": "expired",
+    "PaymentLate": "payment_late",
+    "TimeSimulation": "time_simulation",
+}
+
+# Quantidade máxima de endereços por chamada eth_getLogs
+ADDRESS_CHUNK_SIZE = 500
+
+
+def fetch_logs(web3, addresses, from_block, to_block):
+    logs = []
+    with invalidate_on_failure():
+        for start in range(0, len(addresses), ADDRESS_CHUNK_SIZE):
+            logs.extend(
+                web3.eth.get_logs(
+                    {
+                        "address": addresses[start:start + ADDRESS_CHUNK_SIZE],
+                        "fromBlock": from_block,
+                        "toBlock": to_block,
+                    }
+                )
+            )
+    return logs
+
+
+def decode_logs(web3, logs, contract_abi):
+    """
+    Decodifica os logs conhecidos pela ABI. Retorna dicionários simples
+    (serializáveis) para que possam trafegar entre processos.
+    """
+    # Os eventos do RentalRegistry têm o id do acordo na assinatura, então o
+    # tópico distingue de qual ABI cada log deve ser decodificado
+    event_decoders = {}
+    for abi in (contract_abi, _registry_abi()):
+        if abi is None:
+            continue
+        decoder = web3.eth.contract(abi=abi)
+        for item in abi:
+            if item["type"] == "event" and item["name"] in EVENT_TYPES:
+                event_decoders[event_abi_to_log_topic(item)] = (decoder, item["name"])
+
+    decoded = []
+    for log in logs:
+        if not log["topics"]:
+            continue
+        match = event_decoders.get(bytes(log["topics"][0]))
+        if match is None:
+            continue
+        decoder, name = match
+        event = decoder.events[name]().process_log(log)
+        decoded.append(
+            {
+                "event": name,
+                "address": to_checksum_address(log["address"]),
+                "agreement_id": event["args"].get("agreementId"),
+                "args": {key: _json_value(value) for key, value in event["args"].items()},
+                "transaction_hash": log["transactionHash"].hex(),
+                "log_index": log["logIndex"],
+                "block_number": log["blockNumber"],
+            }
+        )
+    return decoded
+
+
+def fetch_receipts(web3, tx_hashes):
+    """Recibos das transações (remetente e gás) em um único lote JSON-RPC."""
+    tx_hashes = list(tx_hashes)
+    receipts = batch_call(
+        web3, [lambda tx_hash=tx_hash: web3.eth.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes]
+    )
+    return {
+        tx_hash: {"from": receipt["from"], "gas_used": receipt["gasUsed"]}
+        for tx_hash, receipt in zip(tx_hashes, receipts)
+    }
+
+
+def store_events(decoded, receipts, contracts_by_address):
+    """
+    Grava os eventos decodificados de forma idempotente. Eventos já gravados
+    pela própria API (mesma transação, sem log_index) são completados com os
+    dados do log em vez de duplicados.
+    """
+    rows = []
+    for item in decoded:
+        key = item["address"] if item.get("agreement_id") is None else (item["address"], item["agreement_id"])
+        rental_contract = contracts_by_address.get(key)
+        if rental_contract is None:
+            continue
+        receipt = receipts.get(item["transaction_hash"], {})
+        sender = receipt.get("from") or ""
+        rows.append(
+            ContractEvent(
+                contract=rental_contract,
+                event_type=EVENT_TYPES[item["event"]],
+                user_address=sender,
+                from_address=sender,
+                event_data={"event": item["event"], "args": item["args"]},
+                transaction_hash=item["transaction_hash"],
+                log_index=item["log_index"],
+                block_number=item["block_number"],
+                gas_used=receipt.get("gas_used"),
+            )
+        )
+
+    if not rows:
+        return 0
+
+    api_events = {}
+    for event in ContractEvent.objects.filter(
+        transaction_hash__in={row.transaction_hash for row in rows}, log_index__isnull=True
+    ):
+        api_events.setdefault((event.transaction_hash, event.event_type), []).append(event)
+
+    to_update, to_create = [], []
+    for row in rows:
+        matches = api_events.get((row.transaction_hash, row.event_type))
+        if matches:
+            event = matches.pop()
+            event.log_index = row.log_index
+            event.block_number = row.block_number
+            event.gas_used = row.gas_used
+            event.from_address = row.from_address
+            to_update.append(event)
+        else:
+            to_create.append(row)
+
+    ContractEvent.objects.bulk_update(to_update, ["log_index", "block_number", "gas_used", "from_address"])
+    ContractEvent.objects.bulk_create(to_create, ignore_conflicts=True)
+    return len(rows)
+
+
+def known_contracts():
+    """
+    Contratos indexados, pelo endereço ou, para acordos do RentalRegistry,
+    pelo par (endereço do registro, agreement_id).
+    """
+    contracts = {}
+    for rental_contract in RentalContract.objects.only("id", "contract_address", "agreement_id"):
+        address = to_checksum_address(rental_contract.contract_address)
+        key = address if rental_contract.agreement_id is None else (address, rental_contract.agreement_id)
+        contracts[key] = rental_contract
+    return contracts
+
+
+def watched_addresses(contracts_by_address):
+    """Endereços distintos a consultar; um registro aparece uma única vez."""
+    return list(dict.fromkeys(key if isinstance(key, str) else key[0] for key in contracts_by_address))
+
+
+def index_range(web3, contract_abi, from_block, to_block, contracts_by_address=None):
+    if contracts_by_address is None:
+        contracts_by_address = known_contracts()
+    if not contracts_by_address:
+        return 0
+
+    logs = fetch_logs(web3, watched_addresses(contracts_by_address), from_block, to_block)
+    decoded = decode_logs(web3, logs, contract_abi)
+    receipts = fetch_receipts(web3, {item["transaction_hash"] for item in decoded}) if decoded else {}
+    return store_events(decoded, receipts, contracts_by_address)
+
+
+def run_indexer(web3, contract_abi, to_block=None, block_range=None):
+    """
+    Indexa os blocos entre o checkpoint salvo e `to_block` (por padrão, o topo
+    da cadeia menos INDEXER_CONFIRMATIONS), gravando o checkpoint ao fim de cada
+    intervalo para que uma reinicialização continue de onde parou. Os contratos
+    conhecidos são relidos a cada intervalo, então contratos criados durante a
+    execução têm seus eventos indexados a partir do intervalo seguinte.
+    """
+    block_range = block_range or settings.INDEXER_BLOCK_RANGE
+    if to_block is None:
+        to_block = web3.eth.block_number - settings.INDEXER_CONFIRMATIONS
+
+    checkpoint, _ = IndexerCheckpoint.objects.get_or_create(
+        name=CHECKPOINT_NAME, defaults={"last_block": settings.INDEXER_START_BLOCK - 1}
+    )
+    summary = {"from_block": checkpoint.last_block + 1, "to_block": to_block, "events": 0, "ranges": 0}
+    start = checkpoint.last_block + 1
+    while start <= to_block:
+        end = min(start + block_range - 1, to_block)
+        with transaction.atomic():
+            summary["events"] += index_range(web3, contract_abi, start, end, known_contracts())
+            checkpoint.last_block = end
+            checkpoint.save(update_fields=["last_block", "updated_at"])
+        summary["ranges"] += 1
+        start = end + 1
+
+    return summary
+
+
+def _registry_abi():
+    try:
+        return get_contract_artifact(REGISTRY_ARTIFACT_NAME).abi
+    except FileNotFoundError:
+        return None
+
+
+def _json_value(value):
+    if isinstance(value, bytes):
+        return Web3.to_hex(value)
+    return value
@@ -0,0 +1,108 @@
+import csv
+import json
+
+from django.conf import settings  # type: ignore
+from django.core.serializers.json import DjangoJSONEncoder  # type: ignore
+
+from ..models import ContractEvent, Payment, RentalContract
+
+# Conjunto exportável: (modelo, campo de data dos filtros, campo de status, colunas)
+EXPORT_DATASETS = {
+    "contracts": (
+        RentalContract,
+        "created_at",
+        "status",
+        [
+            "id",
+            "landlord",
+            "tenant",
+            "rent_amount",
+            "deposit_amount",
+            "contract_address",
+            "agreement_id",
+            "start_date",
+            "end_date",
+            "contract_duration",
+            "status",
+            "created_at",
+        ],
+    ),
+    "payments": (
+        Payment,
+        "payment_date",
+        "contract__status",
+        ["id", "contract_id", "amount", "payment_type", "payment_date", "is_verified", "transaction_hash"],
+    ),
+    "events": (
+        ContractEvent,
+        "timestamp",
+        "contract__status",
+        [
+            "id",
+            "contract_id",
+            "event_type",
+            "user_address",
+            "event_data",
+            "transaction_hash",
+            "block_number",
+            "log_index",
+            "gas_used",
+            "timestamp",
+        ],
+    ),
+}
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_queryset(dataset, since=None, until=None, contract_status=None):
+    """Linhas do conjunto como tuplas de `.values_list()`, em ordem de chave primária."""
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Conjunto de exportação desconhecido: '{dataset}'.")
+    model, date_field, status_field, columns = EXPORT_DATASETS[dataset]
+
+    queryset = model.objects.all()
+    if since:
+        queryset = queryset.filter(**{f"{date_field}__gte": since})
+    if until:
+        queryset = queryset.filter(**{f"{date_field}__lte": until})
+    if contract_status:
+        queryset = queryset.filter(**{status_field: contract_status})
+    return queryset.order_by("pk").values_list(*columns)
+
+
+def stream_export(dataset, output_format, since=None, until=None, contract_status=None, chunk_size=None):
+    """
+    Gera a exportação linha a linha, em NDJSON ou CSV. O banco é lido com
+    `iterator(chunk_size)`, então a memória usada não depende do tamanho da
+    exportação e a primeira linha sai assim que o primeiro lote chega.
+    """
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportação desconhecido: '{output_format}'.")
+    queryset = export_queryset(dataset, since, until, contract_status)
+    columns = EXPORT_DATASETS[dataset][3]
+    rows = queryset.iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+    if output_format == "csv":
+        return _csv_lines(columns, rows)
+    return _ndjson_lines(columns, rows)
+
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+class _Echo:
+    # csv.writer escreve em um "arquivo" que só devolve a linha formatada
+    def write(self, value):
+        return value
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            [json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value for value in row]
+        )
@@ -0,0 +1,250 @@
+import hashlib
+import os
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings  # type: ignore
+from web3.contract.contract import ContractConstructor  # type: ignore
+
+from .blockchain_connector import get_connection_pool
+from .contract_factory import abi_hash
+
+# Percentil da gorjeta (maxPriorityFeePerGas) usado em cada nível de urgência
+FEE_TIERS = {"slow": 10, "standard": 50, "fast": 90}
+
+
+class FeeOracle:
+    """
+    Sugestões de taxa EIP-1559 por nível de urgência, calculadas a partir de
+    `eth_feeHistory`. Uma thread em segundo plano (uma por processo) renova a
+    amostra a cada FEE_REFRESH_SECONDS, junto com as estimativas de gás
+    vencidas do GasEstimator; o envio de transações só consulta a
+    rede se a amostra estiver velha. Redes sem EIP-1559 recebem `gasPrice`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suggestions = {}
+        self._thread = None
+        self._pid = None
+        self._stats = {"samples": 0, "inline_refreshes": 0, "failures": 0, "legacy": 0}
+
+    def fee_params(self, web3, tier=None):
+        """Campos de taxa para `build_transaction` no nível `tier` (padrão FEE_DEFAULT_TIER)."""
+        tier = tier if tier in FEE_TIERS else settings.FEE_DEFAULT_TIER
+        self._ensure_sampler()
+
+        with self._lock:
+            sample = self._suggestions.get(id(web3))
+            if sample is not None and time.monotonic() - sample[0] <= self._max_age():
+                return dict(sample[1][tier])
+            self._stats["inline_refreshes"] += 1
+
+        return dict(self.refresh(web3)[tier])
+
+    def refresh(self, web3):
+        try:
+            history = web3.eth.fee_history(
+                settings.FEE_HISTORY_BLOCKS, "latest", list(FEE_TIERS.values())
+            )
+            suggestions = suggest_fees(history, web3.to_wei(settings.FEE_MIN_PRIORITY_GWEI, "gwei"))
+            legacy = False
+        except Exception:
+            # Sem eth_feeHistory: preço único sugerido pelo nó
+            gas_price = web3.eth.gas_price
+            suggestions = {tier: {"gasPrice": gas_price} for tier in FEE_TIERS}
+            legacy = True
+
+        with self._lock:
+            self._suggestions[id(web3)] = (time.monotonic(), suggestions)
+            self._stats["samples"] += 1
+            self._stats["legacy"] += int(legacy)
+        return suggestions
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sampler_running"] = self._thread is not None and self._thread.is_alive()
+            if self._suggestions:
+                updated_at, suggestions = max(self._suggestions.values(), key=lambda sample: sample[0])
+                stats["age_seconds"] = round(time.monotonic() - updated_at, 1)
+                stats["suggestions"] = suggestions
+            return stats
+
+    def _max_age(self):
+        return settings.FEE_REFRESH_SECONDS * 3
+
+    def _ensure_sampler(self):
+        # A cadeia do eth-tester não é segura para uso concorrente
+        if not settings.FEE_ORACLE_BACKGROUND or os.getenv("TEST_ENV") == "true":
+            return
+        with self._lock:
+            # Após um fork a thread do processo pai não existe mais
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="fee-oracle", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh(get_connection_pool().get_web3())
+            except Exception:
+                with self._lock:
+                    self._stats["failures"] += 1
+            # A mesma thread mantém as estimativas de gás em dia
+            get_gas_estimator().refresh()
+            time.sleep(settings.FEE_REFRESH_SECONDS)
+
+
+def suggest_fees(history, min_priority_fee):
+    """
+    maxPriorityFeePerGas é a mediana, nos blocos amostrados, do percentil de
+    gorjeta de cada nível; maxFeePerGas cobre o dobro da base do próximo bloco.
+    """
+    if not history["baseFeePerGas"]:
+        raise ValueError("Histórico de taxas vazio.")
+    next_base_fee = history["baseFeePerGas"][-1]
+    rewards = [block for block in history.get("reward") or [] if block]
+
+    suggestions = {}
+    for position, tier in enumerate(FEE_TIERS):
+        samples = [block[position] for block in rewards]
+        priority_fee = max(int(statistics.median(samples)) if samples else 0, min_priority_fee)
+        suggestions[tier] = {
+            "maxFeePerGas": 2 * next_base_fee + priority_fee,
+            "maxPriorityFeePerGas": priority_fee,
+        }
+    return suggestions
+
+
+class _GasEntry(NamedTuple):
+    window_start: float
+    updated_at: float
+    estimate: int
+    # Última chamada vista, repetida na renovação em segundo plano
+    contract_call: object
+    params: dict
+
+
+class GasEstimator:
+    """
+    Estimativas de gás por função (ABI + seletor) e por construtor, com margem
+    de segurança GAS_ESTIMATE_MARGIN. Todos os contratos do mesmo artefato
+    compartilham a estimativa da função; como o gás varia com o estado e com
+    quem chama, fica o maior valor visto em cada janela de GAS_ESTIMATE_TTL
+    segundos. A thread do FeeOracle renova as entradas a cada
+    GAS_ESTIMATE_REFRESH_SECONDS repetindo a última chamada vista; sem ela,
+    uma estimativa com mais de GAS_ESTIMATE_TTL segundos é recalculada na
+    consulta. Acima de GAS_ESTIMATE_MAX_ENTRIES chaves, as usadas há mais
+    tempo são descartadas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._evictions = 0
+
+    def gas_for(self, contract_call, account, value=None, estimate=None):
+        """
+        Gás para enviar `contract_call`. `estimate` é uma estimativa recém
+        calculada (ex.: pela simulação do envio), usada e guardada no lugar
+        de uma nova chamada a `eth_estimateGas`.
+        """
+        key = _call_key(contract_call)
+        params = {"from": account.address}
+        if value is not None:
+            params["value"] = value
+
+        if estimate is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and time.monotonic() - entry.updated_at < settings.GAS_ESTIMATE_TTL:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _with_margin(entry.estimate)
+                self._misses += 1
+            estimate = contract_call.estimate_gas(params)
+
+        return _with_margin(self._record(key, estimate, contract_call, params))
+
+    def refresh(self):
+        """Reestima as entradas sem atualização há GAS_ESTIMATE_REFRESH_SECONDS."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                (key, entry)
+                for key, entry in self._entries.items()
+                if now - entry.updated_at >= settings.GAS_ESTIMATE_REFRESH_SECONDS
+            ]
+
+        for key, entry in stale:
+            try:
+                estimate = entry.contract_call.estimate_gas(entry.params)
+            except Exception:
+                # A chamada pode reverter no estado atual (ex.: contrato já
+                # assinado); a entrada continua até vencer pelo TTL
+                continue
+            self._record(key, estimate, entry.contract_call, entry.params)
+            with self._lock:
+                self._refreshes += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "refreshes": self._refreshes,
+                "evictions": self._evictions,
+            }
+
+    def _record(self, key, estimate, contract_call, params):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            window_start = now
+            if entry is not None and now - entry.window_start < settings.GAS_ESTIMATE_TTL:
+                estimate = max(estimate, entry.estimate)
+                window_start = entry.window_start
+            self._entries[key] = _GasEntry(window_start, now, estimate, contract_call, params)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.GAS_ESTIMATE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return estimate
+
+
+def _with_margin(estimate):
+    return int(estimate * settings.GAS_ESTIMATE_MARGIN)
+
+
+def _call_key(contract_call):
+    if isinstance(contract_call, ContractConstructor):
+        bytecode = contract_call.bytecode
+        bytecode = bytecode.hex() if isinstance(bytecode, bytes) else bytecode
+        return abi_hash(contract_call.abi), "constructor", hashlib.sha256(str(bytecode).encode()).hexdigest()
+    return abi_hash(contract_call.contract_abi), contract_call.selector
+
+
+_fee_oracle = FeeOracle()
+_gas_estimator = GasEstimator()
+
+
+def get_fee_oracle():
+    return _fee_oracle
+
+
+def get_gas_estimator():
+    return _gas_estimator
@@ -1,8 +1,45 @@
+import hashlib
 import json
 import os
+import threading
+from typing import NamedTuple
 
+# Artefato enxuto gerado por scripts/compilar_contrato.py: só ABI, bytecode e hash.
+# RENTAL_AGREEMENT_ARTIFACT=RentalAgreementV2 implanta a versão otimizada.
+ARTIFACT_NAME = os.getenv("RENTAL_AGREEMENT_ARTIFACT", "RentalAgreement")
+FACTORY_ARTIFACT_NAME = "RentalAgreementFactory"
+# Implementação para onde os clones da fábrica delegam (mesma ABI da v2)
+CLONE_ARTIFACT_NAME = "RentalAgreementClone"
+REGISTRY_ARTIFACT_NAME = "RentalRegistry"
 
-def load_contract_data():
+
+class ContractArtifact(NamedTuple):
+    abi: list
+    bytecode: str
+    content_hash: str
+
+
+_artifacts = {}
+_artifact_lock = threading.Lock()
+
+
+def content_hash(abi, bytecode):
+    payload = json.dumps({"abi": abi, "bytecode": bytecode}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def artifact_path(name):
+    return os.path.join("build", f"{name}.artifact.json")
+
+
+def load_contract_data(name=None):
+    name = name or ARTIFACT_NAME
+    if os.path.exists(artifact_path(name)) or name != "RentalAgreement":
+        with open(artifact_path(name), "r") as artifact_file:
+            artifact = json.load(artifact_file)
+        return artifact["abi"], artifact["bytecode"]
+
+    # Sem o artefato enxuto (build antigo): lê a saída completa do compilador
     with open(os.path.join("build", "RentalAgreementABI.json"), "r") as abi_file:
         contract_abi = json.load(abi_file)
     with open(os.path.join("build", "compiled_contract.json"), "r") as bytecode_file:
@@ -11,3 +48,19 @@ def load_contract_data():
             "RentalAgreement"
         ]["evm"]["bytecode"]["object"]
     return contract_abi, bytecode
+
+
+def get_contract_artifact(name=None):
+    """
+    ABI e bytecode carregados no primeiro uso e mantidos em memória pelo
+    restante do processo, para que importar as views não dependa do build.
+    """
+    name = name or ARTIFACT_NAME
+    artifact = _artifacts.get(name)
+    if artifact is None:
+        with _artifact_lock:
+            artifact = _artifacts.get(name)
+            if artifact is None:
+                abi, bytecode = load_contract_data(name)
+                artifact = _artifacts[name] = ContractArtifact(abi, bytecode, content_hash(abi, bytecode))
+    return artifact
@@ -1,5 +1,76 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings  # type: ignore
+from django.db import transaction  # type: ignore
+
 from ..models import ContractEvent  # type: ignore
 
+_local = threading.local()
+
+
+class EventBuffer:
+    """Eventos aguardando um único `bulk_create`; descarrega ao atingir `flush_size`."""
+
+    def __init__(self, flush_size):
+        self.flush_size = flush_size
+        self.pending = []
+        self.written = 0
+
+    def add(self, event):
+        self.pending.append(event)
+        if len(self.pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        events, self.pending = self.pending, []
+        ContractEvent.objects.bulk_create(events)
+        self.written += len(events)
+
+
+@contextmanager
+def buffered_events(flush_size=None):
+    """
+    Agrupa os eventos registrados dentro do bloco (ou da view/tarefa decorada)
+    e grava todos com `bulk_create` na saída normal, ou antes disso a cada
+    EVENT_BUFFER_FLUSH_SIZE eventos. Dentro de um `transaction.atomic()` a
+    gravação final espera o commit (`transaction.on_commit`). Se o bloco sair
+    com exceção, os eventos pendentes são descartados e a exceção sobe sem
+    ser mascarada. Blocos aninhados usam o buffer de fora.
+    """
+    if getattr(_local, "buffer", None) is not None:
+        yield _local.buffer
+        return
+
+    buffer = EventBuffer(flush_size or settings.EVENT_BUFFER_FLUSH_SIZE)
+    _local.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        _local.buffer = None
+
+    if transaction.get_connection().in_atomic_block:
+        # Uma falha na gravação depois do commit não derruba quem já confirmou
+        transaction.on_commit(buffer.flush, robust=True)
+    else:
+        buffer.flush()
+
+
+def record_event(**fields):
+    """
+    Registra um ContractEvent: vai para o buffer ativo, se houver, ou é
+    gravado na hora. Retorna a instância (ainda sem id se estiver no buffer).
+    """
+    event = ContractEvent(**fields)
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        event.save()
+    else:
+        buffer.add(event)
+    return event
+
 
 def log_contract_event(
     contract, event_type, user_address, tx_hash=None, event_data=None
@@ -11,7 +82,7 @@ def log_contract_event(
     if not user_address:
         raise ValueError("O endereço do usuário não pode ser vazio.")
 
-    ContractEvent.objects.create(
+    record_event(
         contract=contract,
         event_type=event_type,
         user_address=user_address,
@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from django.conf import settings  # type: ignore
+from django.db import IntegrityError, transaction  # type: ignore
+from django.utils import timezone  # type: ignore
+
+from ..models import AccountNonce
+from .contract_factory import to_checksum_address
+
+
+def reserve_nonce(web3, address, count=1):
+    """
+    Reserva `count` nonces consecutivos para `address` e retorna o primeiro.
+
+    O contador fica no banco e a linha da conta é bloqueada durante a reserva,
+    então requisições concorrentes (inclusive em outros processos) recebem
+    nonces distintos sem consultar a rede a cada transação. Nonces devolvidos
+    fora do fim da sequência são reaproveitados antes do contador, fechando a
+    lacuna. A sincronização com a blockchain só acontece na primeira reserva,
+    após `NONCE_RESYNC_SECONDS`, quando uma falha marcou a conta para
+    ressincronizar ou enquanto a rede não tiver visto todos os nonces
+    reservados; um nonce ausente por `NONCE_GAP_GRACE_SECONDS` é reemitido.
+    """
+    address = to_checksum_address(address)
+
+    with transaction.atomic():
+        record = _lock_account(address)
+        now = timezone.now()
+
+        if _should_resync(record, now):
+            _resync(web3, record, now)
+
+        nonce = _take_released(record, count)
+        if nonce is None:
+            nonce = record.next_nonce
+            record.next_nonce += count
+        record.reserved_at = now
+        record.save()
+
+    return nonce
+
+
+def release_nonce(address, nonce, count=1):
+    """
+    Devolve nonces reservados que não chegaram a ser transmitidos. Se forem os
+    últimos reservados, o contador simplesmente volta; caso contrário eles vão
+    para a reserva de nonces devolvidos e são entregues às próximas reservas,
+    sem mexer nos nonces seguintes, que podem estar com outras requisições.
+    """
+    address = to_checksum_address(address)
+
+    with transaction.atomic():
+        record = AccountNonce.objects.select_for_update().filter(address=address).first()
+        if record is None:
+            return
+
+        released = set(record.released_nonces) | set(range(nonce, nonce + count))
+        # Devolvidos que encostam no fim da sequência voltam para o contador
+        while record.next_nonce - 1 in released:
+            record.next_nonce -= 1
+            released.discard(record.next_nonce)
+        record.released_nonces = sorted(released)
+        record.save()
+
+
+def mark_for_resync(address):
+    AccountNonce.objects.filter(address=to_checksum_address(address)).update(needs_resync=True)
+
+
+def _lock_account(address):
+    try:
+        record = AccountNonce.objects.select_for_update().filter(address=address).first()
+        if record is None:
+            with transaction.atomic():
+                record = AccountNonce.objects.create(address=address, needs_resync=True)
+        return record
+    except IntegrityError:
+        # Outro processo criou a linha ao mesmo tempo
+        return AccountNonce.objects.select_for_update().get(address=address)
+
+
+def _should_resync(record, now):
+    if record.needs_resync or record.synced_at is None:
+        return True
+    return now - record.synced_at >= timedelta(seconds=settings.NONCE_RESYNC_SECONDS)
+
+
+def _take_released(record, count):
+    # Só os menores devolvidos, e apenas se formarem `count` nonces consecutivos
+    released = record.released_nonces
+    if len(released) < count:
+        return None
+    first = released[0]
+    if released[:count] != list(range(first, first + count)):
+        return None
+    record.released_nonces = released[count:]
+    return first
+
+
+def _resync(web3, record, now):
+    chain_nonce = web3.eth.get_transaction_count(record.address, "pending")
+
+    if chain_nonce > record.next_nonce:
+        # Transações enviadas por fora desta aplicação
+        record.next_nonce = chain_nonce
+    elif chain_nonce < record.next_nonce:
+        # Nonces que nunca chegaram ao nó deixam uma lacuna que trava as
+        # transações seguintes. Voltar o contador reemitiria nonces ainda
+        # reservados por outras requisições, então isso só acontece depois de
+        # um intervalo sem nenhuma reserva em andamento.
+        grace = timedelta(seconds=settings.NONCE_GAP_GRACE_SECONDS)
+        if record.reserved_at is None or now - record.reserved_at >= grace:
+            record.next_nonce = chain_nonce
+        elif record.gap_nonce != chain_nonce:
+            # A rede parou neste nonce agora; ele pode estar só a caminho do nó
+            record.gap_nonce, record.gap_seen_at = chain_nonce, now
+        elif now - record.gap_seen_at >= grace and chain_nonce not in record.released_nonces:
+            # Ausente por toda a carência: o menor nonce que falta é reemitido
+            # pela reserva de devolvidos, sem mexer nos nonces seguintes
+            record.released_nonces = sorted([*record.released_nonces, chain_nonce])
+            record.gap_seen_at = now
+
+    # Devolvidos abaixo do nonce da rede já foram usados; acima do contador, reemitidos por ele
+    record.released_nonces = [
+        nonce for nonce in record.released_nonces if chain_nonce <= nonce < record.next_nonce
+    ]
+    # Enquanto houver lacuna a conta volta a ser sincronizada a cada reserva
+    record.needs_resync = chain_nonce < record.next_nonce
+    if not record.needs_resync:
+        record.gap_nonce = record.gap_seen_at = None
+    record.synced_at = now
@@ -1,4 +1,4 @@
-from web3 import Web3  # type:ignore
+from .contract_factory import to_checksum_address
 
 
 def normalize_address(address):
@@ -7,6 +7,6 @@ def normalize_address(address):
     ):  # Verifica se o endereço é None ou uma string vazia
         raise ValueError("Endereço não pode ser None ou vazio.")
     try:
-        return Web3.to_checksum_address(address)
+        return to_checksum_address(address)
     except ValueError:
         raise ValueError(f"Endereço inválido: {address}")
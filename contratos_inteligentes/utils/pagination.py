@@ -0,0 +1,86 @@
+import base64
+from datetime import date, datetime, time
+
+from django.db.models import Q  # type: ignore
+from django.utils import timezone  # type: ignore
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def parse_limit(value, default, maximum):
+    """Tamanho da página pedido em `?limit=`, limitado a `maximum`."""
+    if value in (None, ""):
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("O parâmetro 'limit' deve ser um número inteiro.")
+    if limit <= 0:
+        raise ValueError("O parâmetro 'limit' deve ser maior que zero.")
+    return min(limit, maximum)
+
+
+def parse_date_param(value, end_of_day=False):
+    """Data `AAAA-MM-DD` (ou data e hora ISO) de filtros como `since`/`until`, no fuso do projeto."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Data inválida: '{value}'. Use AAAA-MM-DD.")
+    if len(value) == 10 and end_of_day:
+        moment = datetime.combine(date.fromisoformat(value), time.max)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def encode_cursor(moment, pk):
+    return base64.urlsafe_b64encode(f"{moment.isoformat()}|{pk}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        moment, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(moment), int(pk)
+    except (ValueError, UnicodeError):
+        raise InvalidCursor("Cursor de paginação inválido.")
+
+
+def keyset_page(queryset, time_field, cursor, limit):
+    """
+    Página de `queryset` em ordem decrescente de (`time_field`, id), do mais
+    recente ao mais antigo. O cursor guarda a chave da última linha entregue,
+    então cada página é uma busca por índice, sem OFFSET: o custo não cresce
+    com a posição da página. Aceita querysets de instâncias ou de `.values()`
+    (que precisam incluir `time_field` e `id`).
+
+    Retorna (linhas, próximo cursor ou None na última página).
+    """
+    queryset = queryset.order_by(f"-{time_field}", "-id")
+    if cursor:
+        moment, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f"{time_field}__lt": moment}) | Q(**{time_field: moment, "id__lt": pk}))
+
+    rows = list(queryset[: limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, dict):
+        return rows, encode_cursor(last[time_field], last["id"])
+    return rows, encode_cursor(getattr(last, time_field), last.id)
+
+
+def parse_fields(value, allowed):
+    """Campos pedidos em `?fields=a,b` (todos de `allowed` se vazio), na ordem de `allowed`."""
+    if not value:
+        return list(allowed)
+    requested = {field.strip() for field in value.split(",") if field.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ValueError(f"Campos desconhecidos em 'fields': {', '.join(sorted(unknown))}.")
+    return [field for field in allowed if field in requested]
@@ -0,0 +1,193 @@
+from datetime import datetime
+
+from django.utils import timezone  # type: ignore
+
+from ..models import ContractTermination, Payment, RentalContract
+from .contract_deployer import created_agreement
+from .load_contract_data import ARTIFACT_NAME
+from .log_contract_event import record_event
+
+
+def register_created_contract(payload, contract_address, agreement_id=None, status="pending"):
+    rental_contract = build_created_contract(payload, contract_address, agreement_id, status)
+    rental_contract.save()
+    return rental_contract
+
+
+def register_created_contracts(created):
+    """Grava de uma vez os contratos de um lote; `created` é uma lista de (payload, endereço, agreement_id)."""
+    return RentalContract.objects.bulk_create(
+        [build_created_contract(payload, address, agreement_id) for payload, address, agreement_id in created]
+    )
+
+
+def build_created_contract(payload, contract_address, agreement_id=None, status="pending"):
+    return RentalContract(
+        landlord=payload["landlord"],
+        tenant=payload["tenant"],
+        rent_amount=payload["rent_amount"],
+        deposit_amount=payload["deposit_amount"],
+        contract_address=contract_address,
+        agreement_id=agreement_id,
+        # Transações pendentes anteriores ao campo não trazem o artefato
+        contract_artifact=payload.get("contract_artifact", ARTIFACT_NAME),
+        status=status,
+        start_date=datetime.fromtimestamp(payload["start_date"]),  # Converter para datetime
+        end_date=datetime.fromtimestamp(payload["end_date"]),
+        contract_duration=payload["contract_duration"],
+    )
+
+
+def confirm_deployed_contract(rental_contract, contract_address):
+    rental_contract.contract_address = contract_address
+    rental_contract.status = "pending"
+    rental_contract.save(update_fields=["contract_address", "status"])
+
+
+def register_signature(rental_contract, signer_address, user_type, tx_hash, fully_signed):
+    if user_type == "landlord":
+        rental_contract.landlord_signature = signer_address
+    elif user_type == "tenant":
+        rental_contract.tenant_signature = signer_address
+
+    if fully_signed:
+        rental_contract.status = "active"
+
+    rental_contract.save()
+
+    record_event(
+        contract=rental_contract,
+        event_type="sign",
+        user_address=signer_address,
+        event_data={"tx_hash": tx_hash, "user_type": user_type},
+        transaction_hash=tx_hash,
+    )
+
+
+def register_offchain_signatures(rental_contract, tx_hash):
+    """
+    Com o recibo da transação signAgreementWithSignatures, passa as assinaturas
+    EIP-712 pendentes para os campos de assinatura, ativa o contrato e
+    registra os eventos.
+    """
+    rental_contract.landlord_signature = rental_contract.pending_landlord_signature
+    rental_contract.tenant_signature = rental_contract.pending_tenant_signature
+    rental_contract.pending_landlord_signature = ""
+    rental_contract.pending_tenant_signature = ""
+    rental_contract.status = "active"
+    rental_contract.save()
+
+    for signer_address, user_type in ((rental_contract.landlord, "landlord"), (rental_contract.tenant, "tenant")):
+        record_event(
+            contract=rental_contract,
+            event_type="sign",
+            user_address=signer_address,
+            event_data={"tx_hash": tx_hash, "user_type": user_type, "offchain": True},
+            transaction_hash=tx_hash,
+        )
+
+
+def register_payment(rental_contract, amount, payment_type, from_address, tx_hash):
+    payment, event_fields = build_payment_records(rental_contract, amount, payment_type, from_address, tx_hash)
+    payment.save()
+    record_event(**event_fields)
+
+
+def register_payments(paid):
+    """
+    Grava de uma vez os pagamentos de um lote; os eventos seguem por
+    `record_event`, agrupados pelo buffer ativo. `paid` é uma lista de
+    (rental_contract, amount, payment_type, from_address, tx_hash).
+    """
+    records = [build_payment_records(*item) for item in paid]
+    Payment.objects.bulk_create([payment for payment, _ in records])
+    for _, event_fields in records:
+        record_event(**event_fields)
+
+
+def build_payment_records(rental_contract, amount, payment_type, from_address, tx_hash):
+    payment = Payment(
+        contract=rental_contract,
+        amount=amount,
+        payment_type="rent" if payment_type == "Aluguel" else "deposit",
+        transaction_hash=tx_hash,
+        is_verified=True,
+    )
+
+    # Campos do evento de pagamento, registrado por record_event
+    event_fields = dict(
+        contract=rental_contract,
+        event_type=("pay_rent" if payment_type == "Aluguel" else "pay_deposit"),
+        event_data={
+            "tx_hash": tx_hash,
+            "from_address": from_address,
+            "amount": amount,
+        },
+        transaction_hash=tx_hash,
+        user_address=from_address,
+    )
+    return payment, event_fields
+
+
+def register_termination(rental_contract, terminated_by, tx_hash):
+    rental_contract.status = "terminated"
+    rental_contract.save()
+
+    ContractTermination.objects.create(
+        contract=rental_contract,
+        terminated_by=terminated_by,
+        termination_transaction_hash=tx_hash,
+    )
+
+    record_event(
+        contract=rental_contract,
+        event_type="terminate",
+        event_data={
+            "from_address": terminated_by,
+            "details": "Contrato encerrado.",
+        },
+        transaction_hash=tx_hash,
+        user_address=terminated_by,
+    )
+
+
+def apply_transaction_effects(pending, receipt, smart_contract=None):
+    """
+    Aplica no banco os efeitos de uma transação assíncrona já minerada com
+    sucesso. `smart_contract` só é necessário para assinaturas, quando é
+    preciso consultar se o contrato ficou totalmente assinado.
+    """
+    payload = pending.payload
+
+    if pending.action == "create":
+        contract_address, agreement_id = created_agreement(receipt)
+        if not contract_address:
+            raise ValueError("Falha ao obter o endereço do contrato na blockchain")
+        if pending.contract is not None:
+            # Criação otimista: a linha já existe com o endereço previsto
+            confirm_deployed_contract(pending.contract, contract_address)
+        else:
+            pending.contract = register_created_contract(payload, contract_address, agreement_id)
+    elif pending.action == "sign":
+        fully_signed = payload.get("other_party_signed") or smart_contract.functions.isFullySigned().call(
+            block_identifier=receipt["blockNumber"]
+        )
+        register_signature(
+            pending.contract, payload["from_address"], payload["user_type"], pending.tx_hash, fully_signed
+        )
+    elif pending.action == "sign_offchain":
+        register_offchain_signatures(pending.contract, pending.tx_hash)
+    elif pending.action in ("pay_rent", "pay_deposit"):
+        register_payment(
+            pending.contract, payload["amount"], payload["payment_type"], payload["from_address"], pending.tx_hash
+        )
+    elif pending.action == "terminate":
+        register_termination(pending.contract, payload["from_address"], pending.tx_hash)
+    else:
+        raise ValueError(f"Ação desconhecida: {pending.action}")
+
+    pending.status = "confirmed"
+    pending.block_number = receipt["blockNumber"]
+    pending.gas_used = receipt["gasUsed"]
+    pending.resolved_at = timezone.now()
+    pending.save()
@@ -0,0 +1,92 @@
+import ast
+
+from eth_abi import decode  # type: ignore
+from eth_tester.exceptions import TransactionFailed  # type: ignore
+from eth_utils import function_abi_to_4byte_selector, to_bytes  # type: ignore
+from web3.contract.contract import ContractConstructor  # type: ignore
+from web3.exceptions import ContractLogicError  # type: ignore
+
+# Error(string), usado por require/revert com mensagem
+ERROR_STRING_SELECTOR = bytes.fromhex("08c379a0")
+REVERT_PREFIX = "execution reverted"
+
+
+class TransactionReverted(Exception):
+    """
+    A simulação da transação reverteu. `reason` é a mensagem do `require`
+    ou o nome do erro customizado; `error` e `arguments` descrevem erros
+    customizados decodificados pela ABI do contrato.
+    """
+
+    def __init__(self, reason, error=None, arguments=None):
+        super().__init__(reason)
+        self.reason = reason
+        self.error = error
+        self.arguments = arguments or {}
+
+    def as_dict(self):
+        return {"reason": self.reason, "error": self.error, "arguments": self.arguments}
+
+
+def simulate_transaction(contract_call, account, value=None):
+    """
+    Executa `contract_call` (função ou construtor) como eth_estimateGas com o
+    remetente e o valor reais, sem transmitir nada. Se a execução reverter,
+    levanta TransactionReverted com o motivo decodificado.
+
+    Retorna a estimativa de gás, para que o envio não repita a simulação.
+    """
+    params = {"from": account.address}
+    if value is not None:
+        params["value"] = value
+
+    try:
+        return contract_call.estimate_gas(params)
+    except (ContractLogicError, TransactionFailed) as e:
+        abi = contract_call.abi if isinstance(contract_call, ContractConstructor) else contract_call.contract_abi
+        raise decode_revert(e, abi) from e
+
+
+def decode_revert(error, abi):
+    revert_data = _revert_data(error)
+    if revert_data is not None:
+        decoded = _decode_revert_data(revert_data, abi)
+        if decoded is not None:
+            return decoded
+
+    message = error.message if getattr(error, "message", None) else str(error.args[0] if error.args else error)
+    if message.startswith(REVERT_PREFIX):
+        message = message[len(REVERT_PREFIX):].lstrip(": ") or "Transação revertida."
+    return TransactionReverted(message)
+
+
+def _revert_data(error):
+    data = getattr(error, "data", None)
+    if isinstance(data, str) and data.startswith("0x"):
+        return to_bytes(hexstr=data)
+
+    # O eth-tester entrega os bytes do revert como repr no texto da exceção
+    message = str(error.args[0]) if error.args else ""
+    if message.startswith(REVERT_PREFIX):
+        message = message[len(REVERT_PREFIX):].lstrip(": ")
+    if message.startswith("b'") or message.startswith('b"'):
+        try:
+            return ast.literal_eval(message)
+        except (SyntaxError, ValueError):
+            return None
+    return None
+
+
+def _decode_revert_data(data, abi):
+    selector, payload = data[:4], data[4:]
+    if selector == ERROR_STRING_SELECTOR:
+        return TransactionReverted(decode(["string"], payload)[0])
+
+    for item in abi:
+        if item.get("type") != "error" or function_abi_to_4byte_selector(item) != selector:
+            continue
+        types = [argument["type"] for argument in item["inputs"]]
+        values = decode(types, payload)
+        arguments = {argument["name"]: value for argument, value in zip(item["inputs"], values)}
+        return TransactionReverted(item["name"], error=item["name"], arguments=arguments)
+    return None
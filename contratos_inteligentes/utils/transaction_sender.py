@@ -0,0 +1,158 @@
+import time
+
+from web3.exceptions import TransactionNotFound  # type: ignore
+
+from .blockchain_connector import invalidate_on_failure
+from .contract_reader import get_view_cache
+from .fee_oracle import get_fee_oracle, get_gas_estimator
+from .nonce_manager import mark_for_resync, release_nonce, reserve_nonce
+from .transaction_preflight import TransactionReverted, simulate_transaction
+
+
+def sign_transaction(web3, contract_call, account, gas, nonce, value=None, fee_tier=None):
+    if gas is None:
+        gas = get_gas_estimator().gas_for(contract_call, account, value)
+    params = {
+        "from": account.address,
+        "nonce": nonce,
+        "gas": gas,
+        **get_fee_oracle().fee_params(web3, fee_tier),
+    }
+    if value is not None:
+        params["value"] = value
+
+    transaction = contract_call.build_transaction(params)
+    return account.sign_transaction(transaction)
+
+
+def send_transaction(web3, contract_call, account, gas=None, value=None, nonce=None, fee_tier=None):
+    """
+    Monta, assina e transmite `contract_call` (função de contrato ou
+    construtor) usando um nonce reservado pelo gerenciador local. Quem precisa
+    conhecer o nonce antes do envio (ex.: para prever o endereço de uma
+    implantação) pode reservá-lo com `reserve_nonce` e passá-lo aqui.
+
+    Antes de assinar, a chamada é simulada com `eth_estimateGas`; se
+    reverter, TransactionReverted sobe com o motivo e nada é transmitido (nem
+    gás gasto). Sem `gas`, a estimativa da simulação alimenta o cache da
+    função e define o gás; as taxas vêm do oráculo no nível de urgência
+    `fee_tier` ("slow", "standard" ou "fast").
+    """
+    try:
+        estimate = simulate_transaction(contract_call, account, value)
+    except TransactionReverted:
+        if nonce is not None:
+            # Nonce reservado pelo chamador e que não será usado
+            release_nonce(account.address, nonce)
+        raise
+    if gas is None:
+        gas = get_gas_estimator().gas_for(contract_call, account, value, estimate=estimate)
+
+    if nonce is None:
+        nonce = reserve_nonce(web3, account.address)
+
+    try:
+        signed_tx = sign_transaction(web3, contract_call, account, gas, nonce, value, fee_tier)
+    except Exception:
+        # Nada foi transmitido: o nonce pode ser reaproveitado
+        release_nonce(account.address, nonce)
+        raise
+
+    try:
+        with invalidate_on_failure():
+            tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    except Exception:
+        # Não dá para saber se o nó aceitou a transação; confere na próxima reserva
+        mark_for_resync(account.address)
+        raise
+    _invalidate_reads(contract_call)
+    return tx_hash
+
+
+def send_batch(web3, calls, account, fee_tier=None):
+    """
+    Envia várias transações da mesma conta sem esperar recibos entre elas.
+    `calls` é uma lista de (contract_call, gas, value), com gas None para usar
+    a estimativa da simulação. Os nonces são
+    reservados de uma vez e atribuídos em sequência às chamadas que puderam
+    ser assinadas; as transmissões seguem uma atrás da outra.
+
+    Chamadas cuja simulação reverte ficam de fora do lote. Retorna, na ordem
+    de `calls`, uma lista de (tx_hash, erro) em que só um dos dois é
+    preenchido.
+    """
+    results = [(None, None)] * len(calls)
+    viable = []
+    for index, (contract_call, gas, value) in enumerate(calls):
+        try:
+            estimate = simulate_transaction(contract_call, account, value)
+        except TransactionReverted as e:
+            results[index] = (None, e.reason)
+            continue
+        if gas is None:
+            gas = get_gas_estimator().gas_for(contract_call, account, value, estimate=estimate)
+        viable.append((index, contract_call, gas, value))
+    if not viable:
+        return results
+
+    viable_calls = {index: contract_call for index, contract_call, _, _ in viable}
+    first_nonce = reserve_nonce(web3, account.address, count=len(viable))
+    nonce = first_nonce
+    signed = []
+    for index, contract_call, gas, value in viable:
+        try:
+            signed.append((index, sign_transaction(web3, contract_call, account, gas, nonce, value, fee_tier)))
+            nonce += 1
+        except Exception as e:
+            results[index] = (None, str(e))
+
+    unused = first_nonce + len(viable) - nonce
+    if unused:
+        release_nonce(account.address, nonce, count=unused)
+
+    for position, (index, signed_tx) in enumerate(signed):
+        try:
+            with invalidate_on_failure():
+                results[index] = (web3.eth.send_raw_transaction(signed_tx.raw_transaction), None)
+            _invalidate_reads(viable_calls[index])
+        except Exception as e:
+            # Os nonces seguintes ficariam presos atrás da lacuna: não transmite o resto
+            mark_for_resync(account.address)
+            results[index] = (None, str(e))
+            for skipped, _ in signed[position + 1:]:
+                results[skipped] = (None, "Não transmitida: falha em uma transação anterior do lote.")
+            break
+
+    return results
+
+
+def _invalidate_reads(contract_call):
+    # Leituras em cache do contrato não refletem a escrita que acabou de sair
+    address = getattr(contract_call, "address", None)
+    if isinstance(address, str):
+        get_view_cache().invalidate_address(address)
+
+
+def wait_for_receipts(web3, tx_hashes, timeout, poll_latency=0.5):
+    """
+    Aguarda os recibos de várias transações ao mesmo tempo: cada rodada
+    consulta apenas as que ainda não foram mineradas, então o tempo total é o
+    da mais lenta e não a soma de todas. Retorna {tx_hash: recibo}; hashes
+    sem recibo dentro de `timeout` segundos ficam de fora.
+    """
+    receipts = {}
+    waiting = list(tx_hashes)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        for tx_hash in list(waiting):
+            try:
+                with invalidate_on_failure():
+                    receipts[tx_hash] = web3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+            waiting.remove(tx_hash)
+
+        if not waiting or time.monotonic() >= deadline:
+            return receipts
+        time.sleep(poll_latency)
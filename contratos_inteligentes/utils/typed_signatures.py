@@ -0,0 +1,73 @@
+from eth_account import Account  # type: ignore
+from eth_account.messages import encode_typed_data  # type: ignore
+from web3 import Web3  # type: ignore
+
+from .contract_deployer import RegistryAgreement
+from .contract_factory import to_checksum_address
+
+# Tamanho de uma assinatura ECDSA (r, s, v) em hexadecimal com prefixo 0x
+SIGNATURE_LENGTH = 132
+
+DOMAIN_TYPE = [
+    {"name": "name", "type": "string"},
+    {"name": "version", "type": "string"},
+    {"name": "chainId", "type": "uint256"},
+    {"name": "verifyingContract", "type": "address"},
+]
+TERMS_TYPE = [
+    {"name": "locador", "type": "address"},
+    {"name": "inquilino", "type": "address"},
+    {"name": "rentAmount", "type": "uint256"},
+    {"name": "deposit", "type": "uint256"},
+]
+
+
+def supports_offchain_signatures(smart_contract):
+    """Só a v2, os clones e o registro têm signAgreementWithSignatures (a v1 não)."""
+    contract = smart_contract.registry if isinstance(smart_contract, RegistryAgreement) else smart_contract
+    return any(item.get("name") == "signAgreementWithSignatures" for item in contract.abi)
+
+
+def terms_typed_data(chain_id, smart_contract, state):
+    """
+    Dados tipados EIP-712 que cada parte assina. Os termos vêm do estado
+    on-chain (`ContractState`), exatamente como o contrato os reconstrói.
+    """
+    message = {
+        "locador": to_checksum_address(state.landlord),
+        "inquilino": to_checksum_address(state.tenant),
+        "rentAmount": state.rent_amount,
+        "deposit": state.deposit_amount,
+    }
+    terms_type = TERMS_TYPE
+    domain = {"name": "RentalAgreement", "version": "2"}
+
+    if isinstance(smart_contract, RegistryAgreement):
+        message = {"agreementId": smart_contract.agreement_id, **message}
+        terms_type = [{"name": "agreementId", "type": "uint256"}, *TERMS_TYPE]
+        domain = {"name": "RentalRegistry", "version": "1"}
+
+    return {
+        "types": {"EIP712Domain": DOMAIN_TYPE, "RentalTerms": terms_type},
+        "primaryType": "RentalTerms",
+        "domain": {
+            **domain,
+            "chainId": chain_id,
+            "verifyingContract": to_checksum_address(smart_contract.address),
+        },
+        "message": message,
+    }
+
+
+def sign_terms(typed_data, private_key):
+    signed = Account.sign_typed_data(private_key, full_message=typed_data)
+    return Web3.to_hex(signed.signature)
+
+
+def recover_signer(typed_data, signature):
+    return Account.recover_message(encode_typed_data(full_message=typed_data), signature=signature)
+
+
+def is_offchain_signature(value):
+    # Os campos de assinatura guardam o endereço do signatário no fluxo on-chain
+    return bool(value) and len(value) == SIGNATURE_LENGTH and value.startswith("0x")
@@ -8,9 +8,14 @@ from cryptography.fernet import Fernet, InvalidToken # type:ignore
 import time
 
 from dateutil.relativedelta import relativedelta  # type:ignore
+from django.conf import settings  # type:ignore
+from django.db import transaction as db_transaction  # type:ignore
+from django.db.models import Q  # type:ignore
+from django.urls import reverse  # type:ignore
 from django.views.decorators.csrf import csrf_exempt # type: ignore
+from django.views.decorators.http import require_GET  # type:ignore
 from django.contrib.auth.models import User  # type: ignore
-from django.http import JsonResponse  # type:ignore
+from django.http import JsonResponse, StreamingHttpResponse  # type:ignore
 from django.shortcuts import get_object_or_404  # type:ignore
 from django.utils import timezone  # type:ignore
 from dotenv import load_dotenv  # type:ignore
@@ -18,17 +23,55 @@ from rest_framework import status  # type:ignore
 from rest_framework.decorators import api_view  # type:ignore
 from rest_framework.response import Response  # type:ignore
 from web3 import Account, Web3  # type:ignore
+from web3.utils.address import get_create_address  # type:ignore
 from cryptography.fernet import Fernet # type: ignore
 
 from .serializers import RentalContractSerializer
-from .models import ContractEvent, ContractTermination, Payment, RentalContract, Usuario
+from .models import ContractChainState, ContractTermination, Payment, PendingTransaction, RentalContract, Usuario
+from .tasks import acompanhar_transacao
+from .utils.blockchain_connector import get_connection_pool
+from .utils.chain_state import SNAPSHOT_FIELDS, refresh_after_write
 from .utils.check_connection import check_connection
+from .utils.contract_deployer import (
+    build_create_call,
+    created_agreement,
+    get_rental_contract,
+    predicts_address,
+    renewed_end_date,
+)
+from .utils.contract_factory import get_contract_cache
+from .utils.contract_reader import (
+    cached_call,
+    get_view_cache,
+    read_contract_state,
+    read_payment_terms,
+    read_sign_preflight,
+)
+from .utils.export import EXPORT_FORMATS, stream_export
+from .utils.fee_oracle import get_fee_oracle, get_gas_estimator
 from .utils.tratar_data import tratar_data
-from .utils.load_contract_data import load_contract_data
-from .utils.log_contract_event import log_contract_event
+from .utils.log_contract_event import buffered_events, log_contract_event, record_event
+from .utils.nonce_manager import reserve_nonce
 from .utils.normalize_address import normalize_address
-
-contract_abi, bytecode = load_contract_data()
+from .utils.pagination import InvalidCursor, keyset_page, parse_date_param, parse_fields, parse_limit
+from .utils.transaction_preflight import TransactionReverted
+from .utils.transaction_sender import send_batch, send_transaction, wait_for_receipts
+from .utils.typed_signatures import (
+    is_offchain_signature,
+    recover_signer,
+    sign_terms,
+    supports_offchain_signatures,
+    terms_typed_data,
+)
+from .utils.transaction_effects import (
+    register_created_contract,
+    register_created_contracts,
+    register_offchain_signatures,
+    register_payment,
+    register_payments,
+    register_signature,
+    register_termination,
+)
 
 # global_contract_address = Web3.to_checksum_address("0x5fbdb2315678afecb367f032d93f642f64180aa3")
 # global_contract = web3.eth.contract(address=global_contract_address, abi=contract_abi)
@@ -49,6 +92,135 @@ contract_abi, bytecode = load_contract_data()
 #     except Exception as e:
 #         raise ValueError(f"Erro ao descriptografar a chave: {str(e)}")
 
+def revert_response(error):
+    # A simulação reverteu: nada foi transmitido e nenhum gás foi gasto
+    return Response(
+        {"error": error.reason, "revert": error.as_dict()},
+        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    )
+
+def async_requested(request):
+    # Modo assíncrono por requisição (campo "async") ou para toda a instalação
+    value = request.data.get("async", settings.ASYNC_TRANSACTIONS)
+    return str(value).lower() in ("true", "1")
+
+def submit_async(request, tx_hash, action, payload, rental_contract=None):
+    """
+    Registra a transação como pendente e delega o acompanhamento do recibo ao
+    Celery, respondendo 202 sem bloquear o worker do Django.
+    """
+    pending = PendingTransaction.objects.create(
+        tx_hash=tx_hash.hex(),
+        action=action,
+        contract=rental_contract,
+        payload=payload,
+    )
+    db_transaction.on_commit(lambda: acompanhar_transacao.delay(pending.id))
+
+    return Response(
+        {
+            "message": "Transação enviada. Acompanhe a confirmação pela URL de status.",
+            "tx_hash": pending.tx_hash,
+            "status_url": request.build_absolute_uri(
+                reverse("transaction_status", args=[pending.tx_hash])
+            ),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+def optimistic_requested(request):
+    # Criação otimista por requisição (campo "optimistic") ou para toda a instalação
+    value = request.data.get("optimistic", settings.OPTIMISTIC_CREATE)
+    return str(value).lower() in ("true", "1")
+
+def submit_optimistic_create(request, web3, create_call, account, contract_payload):
+    """
+    Prevê o endereço do contrato a partir do remetente e do nonce reservado,
+    grava o RentalContract como "deploying" e responde sem esperar o bloco.
+    O acompanhamento do recibo confirma a linha ou a marca como "failed".
+    """
+    nonce = reserve_nonce(web3, account.address)
+    predicted_address = get_create_address(account.address, nonce)
+    tx_hash = send_transaction(
+        web3, create_call, account, nonce=nonce, fee_tier=request.data.get("urgency")
+    )
+
+    with db_transaction.atomic():
+        rental_contract = register_created_contract(contract_payload, predicted_address, status="deploying")
+        pending = PendingTransaction.objects.create(
+            tx_hash=tx_hash.hex(),
+            action="create",
+            contract=rental_contract,
+            payload=contract_payload,
+        )
+        db_transaction.on_commit(lambda: acompanhar_transacao.delay(pending.id))
+
+    return Response(
+        {
+            "message": "Contrato em implantação. O endereço informado é o previsto para a transação.",
+            "id": rental_contract.id,
+            "contract_address": predicted_address,
+            "status": rental_contract.status,
+            "tx_hash": pending.tx_hash,
+            "status_url": request.build_absolute_uri(
+                reverse("transaction_status", args=[pending.tx_hash])
+            ),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+CONTRACT_SPEC_FIELDS = ["landlord", "tenant", "rent_amount", "deposit_amount", "start_date", "end_date"]
+
+def parse_contract_spec(data):
+    """
+    Valida os dados de criação de um contrato e retorna o payload usado para
+    implantá-lo e gravar o RentalContract. Erros de validação sobem como
+    ValueError com a mensagem destinada ao cliente.
+    """
+    for field in CONTRACT_SPEC_FIELDS:
+        if not data.get(field):
+            raise ValueError(f"O campo '{field}' é obrigatório.")
+
+    try:
+        landlord = normalize_address(data["landlord"])
+        tenant = normalize_address(data["tenant"])
+        rent_amount = int(data["rent_amount"])
+        deposit_amount = int(data["deposit_amount"])
+        start_date = int(data["start_date"])  # Deve ser inteiro
+        end_date = int(data["end_date"])      # Deve ser inteiro
+    except ValueError as e:
+        raise ValueError(f"Erro ao processar os dados: {str(e)}")
+
+    if end_date <= start_date:
+        raise ValueError("A data de término deve ser posterior à data de início.")
+
+    contract_duration = (end_date - start_date) // 60  # Duração em minutos
+    if contract_duration <= 0:
+        raise ValueError("A duração do contrato deve ser maior que zero.")
+
+    return {
+        "landlord": landlord,
+        "tenant": tenant,
+        "rent_amount": rent_amount,
+        "deposit_amount": deposit_amount,
+        "start_date": start_date,
+        "end_date": end_date,
+        "contract_duration": contract_duration,
+    }
+
+def build_contract_spec_call(web3, payload):
+    # O artefato vai no payload para que a linha criada (também pelo worker
+    # assíncrono) grave com qual ABI o contrato é operado
+    create_call, payload["contract_artifact"] = build_create_call(
+        web3,
+        payload["tenant"],
+        payload["rent_amount"],
+        payload["deposit_amount"],
+        payload["start_date"],
+        payload["end_date"],
+    )
+    return create_call
+
 @api_view(["POST"])
 def create_contract_api(request):
     try:
@@ -59,17 +231,7 @@ def create_contract_api(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    required_fields = [
-        "landlord",
-        "tenant",
-        "rent_amount",
-        "deposit_amount",
-        "start_date",
-        "end_date",
-        "private_key",
-    ]
-
-    for field in required_fields:
+    for field in [*CONTRACT_SPEC_FIELDS, "private_key"]:
         if not request.data.get(field):
             return Response(
                 {"error": f"O campo '{field}' é obrigatório."},
@@ -77,32 +239,10 @@ def create_contract_api(request):
             )
 
     try:
-        landlord = normalize_address(request.data["landlord"])
-        tenant = normalize_address(request.data["tenant"])
-        rent_amount = int(request.data["rent_amount"])
-        deposit_amount = int(request.data["deposit_amount"])
-        start_date = int(request.data["start_date"])  # Deve ser inteiro
-        end_date = int(request.data["end_date"])      # Deve ser inteiro
+        contract_payload = parse_contract_spec(request.data)
         private_key = request.data["private_key"]
-
-        if end_date <= start_date:
-            return Response(
-                {"error": "A data de término deve ser posterior à data de início."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        contract_duration = (end_date - start_date) // 60  # Duração em minutos
-        if contract_duration <= 0:
-            return Response(
-                {"error": "A duração do contrato deve ser maior que zero."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
     except ValueError as e:
-        return Response(
-            {"error": f"Erro ao processar os dados: {str(e)}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {"error": f"Erro inesperado: {str(e)}"},
@@ -117,28 +257,27 @@ def create_contract_api(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    smart_contract = web3.eth.contract(abi=contract_abi, bytecode=bytecode)
-    try:
-        transaction = smart_contract.constructor(
-            tenant,
-            rent_amount,
-            deposit_amount,
-            start_date,
-            end_date,
-        ).build_transaction(
-            {
-                "from": account.address,
-                "nonce": web3.eth.get_transaction_count(account.address),
-                "gas": 3000000,
-                "gasPrice": web3.to_wei("20", "gwei"),
-            }
+    if "optimistic" in request.data and optimistic_requested(request) and not predicts_address():
+        # Pela fábrica ou pelo registro o endereço só é conhecido depois da mineração
+        return Response(
+            {"error": "Criação otimista só é possível com implantação direta, sem fábrica ou registro."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
 
-        signed_tx = web3.eth.account.sign_transaction(transaction, private_key)
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    try:
+        create_call = build_contract_spec_call(web3, contract_payload)
+
+        if optimistic_requested(request) and predicts_address():
+            return submit_optimistic_create(request, web3, create_call, account, contract_payload)
+
+        tx_hash = send_transaction(web3, create_call, account, fee_tier=request.data.get("urgency"))
+
+        if async_requested(request):
+            return submit_async(request, tx_hash, "create", contract_payload)
+
         tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
 
-        new_contract_address = tx_receipt.contractAddress
+        new_contract_address, agreement_id = created_agreement(tx_receipt)
 
         if not new_contract_address:
             return Response(
@@ -146,31 +285,143 @@ def create_contract_api(request):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        new_contract = RentalContract.objects.create(
-            landlord=landlord,
-            tenant=tenant,
-            rent_amount=rent_amount,
-            deposit_amount=deposit_amount,
-            contract_address=new_contract_address,
-            status="pending",
-            start_date=datetime.fromtimestamp(start_date),  # Converter para datetime
-            end_date=datetime.fromtimestamp(end_date), 
-            contract_duration=contract_duration,
-        )
+        new_contract = register_created_contract(contract_payload, new_contract_address, agreement_id)
+        refresh_after_write(web3, [new_contract])
 
         return Response(
             {
                 "message": "Contrato criado com sucesso!",
                 "tx_hash": tx_hash.hex(),
                 "contract_address": new_contract_address,
+                "agreement_id": agreement_id,
                 "id": new_contract.id,
             },
             status=status.HTTP_201_CREATED,
         )
 
+    except TransactionReverted as e:
+        return revert_response(e)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(["POST"])
+def batch_create_contracts_api(request):
+    """
+    Cria vários contratos em uma requisição. Todos os itens são validados
+    antes de qualquer envio; as implantações são assinadas com nonces
+    consecutivos, transmitidas em sequência e os recibos aguardados juntos.
+    A resposta traz o resultado de cada item, na ordem recebida.
+    """
+    try:
+        web3 = check_connection()
+    except Exception as e:
+        return Response(
+            {"error": "Falha na conexão com a rede Ethereum: " + str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    specs = request.data.get("contracts")
+    private_key = request.data.get("private_key")
+    if not private_key:
+        return Response({"error": "O campo 'private_key' é obrigatório."}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(specs, list) or not specs:
+        return Response(
+            {"error": "O campo 'contracts' deve ser uma lista não vazia."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(specs) > settings.BATCH_CREATE_MAX_ITEMS:
+        return Response(
+            {"error": f"O lote aceita no máximo {settings.BATCH_CREATE_MAX_ITEMS} contratos."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    payloads, errors = [], []
+    for index, spec in enumerate(specs):
+        try:
+            payloads.append(parse_contract_spec(spec if isinstance(spec, dict) else {}))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+    if errors:
+        return Response(
+            {"error": "Nenhum contrato foi enviado: há itens inválidos.", "items": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        account = web3.eth.account.from_key(private_key)
+    except ValueError:
+        return Response({"error": "Chave privada inválida."}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        items = [{"index": index, "status": "failed"} for index in range(len(payloads))]
+        calls, call_indexes = [], []
+        for index, payload in enumerate(payloads):
+            try:
+                create_call = build_contract_spec_call(web3, payload)
+            except Exception as e:
+                items[index]["error"] = str(e)
+                continue
+            calls.append((create_call, None, None))
+            call_indexes.append(index)
+
+        sent = {}
+        for index, (tx_hash, error) in zip(call_indexes, send_batch(web3, calls, account, request.data.get("urgency"))):
+            if tx_hash is None:
+                items[index]["error"] = error
+                continue
+            items[index]["tx_hash"] = tx_hash.hex()
+            sent[index] = tx_hash
+
+        receipts = wait_for_receipts(web3, sent.values(), timeout=settings.TRANSACTION_RECEIPT_TIMEOUT)
+
+        created, unconfirmed = [], []
+        for index, tx_hash in sent.items():
+            receipt = receipts.get(tx_hash)
+            if receipt is None:
+                unconfirmed.append(index)
+                continue
+            address, agreement_id = created_agreement(receipt) if receipt["status"] == 1 else (None, None)
+            if not address:
+                items[index]["error"] = "Falha na execução da transação."
+                continue
+            created.append((index, address, agreement_id))
+
+        with db_transaction.atomic():
+            contracts = register_created_contracts(
+                [(payloads[index], address, agreement_id) for index, address, agreement_id in created]
+            )
+            # Sem recibo no prazo: o worker continua acompanhando como no modo assíncrono
+            pending_transactions = PendingTransaction.objects.bulk_create(
+                [
+                    PendingTransaction(tx_hash=items[index]["tx_hash"], action="create", payload=payloads[index])
+                    for index in unconfirmed
+                ]
+            )
+            for pending in pending_transactions:
+                db_transaction.on_commit(lambda pending_id=pending.id: acompanhar_transacao.delay(pending_id))
+        refresh_after_write(web3, contracts)
+
+        for index in unconfirmed:
+            items[index].update(
+                status="pending",
+                status_url=request.build_absolute_uri(
+                    reverse("transaction_status", args=[items[index]["tx_hash"]])
+                ),
+            )
+        for (index, address, agreement_id), contract in zip(created, contracts):
+            items[index].update(
+                status="created", id=contract.id, contract_address=address, agreement_id=agreement_id
+            )
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    all_created = len(created) == len(items)
+    return Response(
+        {"created": len(created), "failed": len(items) - len(created), "items": items},
+        status=status.HTTP_201_CREATED if all_created else status.HTTP_207_MULTI_STATUS,
+    )
+
 @api_view(["POST"])
 def sign_contract_api(request, contract_id):
     try:
@@ -196,21 +447,19 @@ def sign_contract_api(request, contract_id):
         landlord = normalize_address(rental_contract.landlord)
         tenant = normalize_address(rental_contract.tenant)
 
-        smart_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(rental_contract.contract_address),
-            abi=contract_abi,
-        )
+        smart_contract = get_rental_contract(web3, rental_contract)
 
-        contract_code = web3.eth.get_code(Web3.to_checksum_address(rental_contract.contract_address))
-        if contract_code == b"":
+        # Código implantado e estado do contrato em uma única ida ao nó
+        preflight = read_sign_preflight(web3, smart_contract)
+        if not preflight.is_deployed:
             return JsonResponse({"error": "Contrato não implantado na blockchain."}, status=404)
 
-        if smart_contract.functions.isFullySigned().call():
+        if preflight.state.is_fully_signed:
             rental_contract.status = "active"
             rental_contract.save()
             return JsonResponse({"error": "O contrato já foi assinado por ambas as partes."}, status=403)
 
-        if not smart_contract.functions.isContractActive().call():
+        if not preflight.state.is_contract_active:
             return JsonResponse({"error": "O contrato já foi encerrado e não pode ser assinado."}, status=403)
 
         if user_type == "landlord" and account_to_sign.address.lower() != landlord.lower():
@@ -219,40 +468,37 @@ def sign_contract_api(request, contract_id):
         if user_type == "tenant" and account_to_sign.address.lower() != tenant.lower():
             return JsonResponse({"error": "Apenas o inquilino pode assinar como 'tenant'."}, status=403)
 
-        nonce = web3.eth.get_transaction_count(account_to_sign.address)
-        transaction = smart_contract.functions.signAgreement().build_transaction(
-            {
-                "from": account_to_sign.address,
-                "nonce": nonce,
-                "gas": 300000,
-                "gasPrice": web3.to_wei("20", "gwei"),
-            }
+        tx_hash = send_transaction(
+            web3, smart_contract.functions.signAgreement(), account_to_sign, fee_tier=request.data.get("urgency")
         )
 
-        signed_tx = web3.eth.account.sign_transaction(transaction, private_key)
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        # Se a outra parte já havia assinado, esta assinatura completa o contrato
+        other_party_signed = (
+            preflight.state.tenant_signed if user_type == "landlord" else preflight.state.landlord_signed
+        )
+        if async_requested(request):
+            return submit_async(
+                request,
+                tx_hash,
+                "sign",
+                {
+                    "from_address": account_to_sign.address,
+                    "user_type": user_type,
+                    "other_party_signed": other_party_signed,
+                },
+                rental_contract,
+            )
+
         tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
 
         if tx_receipt["status"] != 1:
             return JsonResponse({"error": "Falha na execução da transação."}, status=500)
 
-        if user_type == "landlord":
-            rental_contract.landlord_signature = account_to_sign.address
-        elif user_type == "tenant":
-            rental_contract.tenant_signature = account_to_sign.address
-
-        if smart_contract.functions.isFullySigned().call():
-            rental_contract.status = "active"
-        
-        rental_contract.save()
-
-        ContractEvent.objects.create(
-            contract=rental_contract,
-            event_type="sign",
-            user_address=account_to_sign.address,
-            event_data={"tx_hash": tx_hash.hex(), "user_type": user_type},
-            transaction_hash=tx_hash.hex(),
+        fully_signed = other_party_signed or cached_call(web3, smart_contract.functions.isFullySigned())
+        register_signature(
+            rental_contract, account_to_sign.address, user_type, tx_hash.hex(), fully_signed
         )
+        refresh_after_write(web3, [rental_contract])
 
         return JsonResponse(
             {
@@ -262,9 +508,132 @@ def sign_contract_api(request, contract_id):
             },
             status=200,
         )
+    except TransactionReverted as e:
+        return revert_response(e)
     except Exception as e:
         return JsonResponse({"error": f"Erro inesperado: {str(e)}"}, status=500)
 
+@api_view(["GET"])
+def contract_typed_data_api(request, contract_id):
+    """
+    Retorna os dados tipados EIP-712 dos termos do contrato, para que locador
+    e inquilino assinem na própria carteira (eth_signTypedData_v4).
+    """
+    rental_contract = get_object_or_404(RentalContract, id=contract_id)
+    web3 = check_connection()
+    smart_contract = get_rental_contract(web3, rental_contract)
+
+    if not supports_offchain_signatures(smart_contract):
+        return Response(
+            {"error": "Este contrato não aceita assinaturas EIP-712."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    state = read_contract_state(web3, smart_contract)
+    return Response(terms_typed_data(web3.eth.chain_id, smart_contract, state), status=status.HTTP_200_OK)
+
+@api_view(["POST"])
+def offchain_sign_contract_api(request, contract_id):
+    """
+    Recebe a assinatura EIP-712 de uma das partes (pronta, em "signature", ou
+    gerada a partir de "private_key"). Quando as duas estão guardadas, envia
+    uma única transação signAgreementWithSignatures com ambas.
+    """
+    rental_contract = get_object_or_404(RentalContract, id=contract_id)
+    user_type = request.data.get("user_type")
+    private_key = request.data.get("private_key")
+    signature = request.data.get("signature")
+
+    if user_type not in ("landlord", "tenant"):
+        return Response({"error": "Tipo de usuário inválido."}, status=status.HTTP_400_BAD_REQUEST)
+    if not private_key and not signature:
+        return Response(
+            {"error": "Informe a assinatura EIP-712 ou a chave privada."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        web3 = check_connection()
+        smart_contract = get_rental_contract(web3, rental_contract)
+        if not supports_offchain_signatures(smart_contract):
+            return Response(
+                {"error": "Este contrato não aceita assinaturas EIP-712."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        state = read_contract_state(web3, smart_contract)
+        if state.is_fully_signed:
+            return Response({"error": "O contrato já foi assinado por ambas as partes."}, status=403)
+        if not state.is_contract_active:
+            return Response({"error": "O contrato já foi encerrado e não pode ser assinado."}, status=403)
+
+        typed_data = terms_typed_data(web3.eth.chain_id, smart_contract, state)
+        try:
+            if private_key:
+                signature = sign_terms(typed_data, private_key)
+            signer = recover_signer(typed_data, signature)
+        except (ValueError, TypeError):
+            return Response({"error": "Assinatura ou chave privada inválida."}, status=400)
+
+        expected = state.landlord if user_type == "landlord" else state.tenant
+        if signer.lower() != expected.lower():
+            return Response(
+                {"error": f"A assinatura não pertence ao {'locador' if user_type == 'landlord' else 'inquilino'}."},
+                status=403,
+            )
+
+        # Fica pendente até a transação confirmar; is_fully_signed() continua falso
+        setattr(rental_contract, f"pending_{user_type}_signature", signature)
+        rental_contract.save(update_fields=[f"pending_{user_type}_signature"])
+
+        if not (
+            is_offchain_signature(rental_contract.pending_landlord_signature)
+            and is_offchain_signature(rental_contract.pending_tenant_signature)
+        ):
+            return Response(
+                {"message": "Assinatura registrada. Aguardando a assinatura da outra parte."},
+                status=status.HTTP_200_OK,
+            )
+
+        # As duas assinaturas estão prontas: uma única transação registra ambas
+        payer_key = private_key or settings.RELAYER_PRIVATE_KEY
+        if not payer_key:
+            return Response(
+                {"error": "Informe a chave privada ou configure RELAYER_PRIVATE_KEY para enviar a transação."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        payer = web3.eth.account.from_key(payer_key)
+
+        tx_hash = send_transaction(
+            web3,
+            smart_contract.functions.signAgreementWithSignatures(
+                rental_contract.pending_landlord_signature, rental_contract.pending_tenant_signature
+            ),
+            payer,
+            fee_tier=request.data.get("urgency"),
+        )
+        if async_requested(request):
+            return submit_async(request, tx_hash, "sign_offchain", {}, rental_contract)
+
+        tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+        if tx_receipt["status"] != 1:
+            return Response({"error": "Falha na execução da transação."}, status=500)
+
+        register_offchain_signatures(rental_contract, tx_hash.hex())
+        refresh_after_write(web3, [rental_contract])
+        return Response(
+            {
+                "message": "Contrato assinado pelas duas partes em uma única transação.",
+                "tx_hash": tx_hash.hex(),
+                "status": rental_contract.status,
+            },
+            status=status.HTTP_200_OK,
+        )
+    except TransactionReverted as e:
+        return revert_response(e)
+    except Exception as e:
+        return Response({"error": f"Erro inesperado: {str(e)}"}, status=500)
+
 @api_view(["POST"])
 def register_payment_api(request, contract_id):
     try:
@@ -293,13 +662,11 @@ def register_payment_api(request, contract_id):
                 status=403,
             )
 
-        smart_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(rental_contract.contract_address),
-            abi=contract_abi,
-        )
+        smart_contract = get_rental_contract(web3, rental_contract)
 
         try:
-            contract_state = smart_contract.functions.getContractState().call()
+            # getContractState() já traz os valores de aluguel e depósito
+            contract_state = read_contract_state(web3, smart_contract)
         except Exception as e:
             return Response(
                 {"error": f"Erro ao obter estado do contrato: {str(e)}"}, status=500
@@ -307,10 +674,10 @@ def register_payment_api(request, contract_id):
 
         if payment_type == "Aluguel":
             tx_function = smart_contract.functions.payRent()
-            expected_amount = smart_contract.functions.getRentAmount().call()
+            expected_amount = contract_state.rent_amount
         elif payment_type == "Depósito":
             tx_function = smart_contract.functions.payDeposit()
-            expected_amount = smart_contract.functions.getDepositAmount().call()
+            expected_amount = contract_state.deposit_amount
         else:
             return Response({"error": "Tipo de pagamento inválido."}, status=400)
 
@@ -323,44 +690,30 @@ def register_payment_api(request, contract_id):
             )
 
         try:
-            tx = tx_function.build_transaction(
-                {
-                    "from": account_to_pay.address,
-                    "value": int(amount),
-                    "nonce": web3.eth.get_transaction_count(account_to_pay.address),
-                    "gas": 200000,
-                    "gasPrice": web3.to_wei("20", "gwei"),
-                }
+            tx_hash = send_transaction(
+                web3, tx_function, account_to_pay, value=int(amount), fee_tier=request.data.get("urgency")
             )
 
-            signed_tx = web3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            if async_requested(request):
+                return submit_async(
+                    request,
+                    tx_hash,
+                    "pay_rent" if payment_type == "Aluguel" else "pay_deposit",
+                    {
+                        "from_address": account_to_pay.address,
+                        "amount": amount,
+                        "payment_type": payment_type,
+                    },
+                    rental_contract,
+                )
 
             tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
 
             if tx_receipt["status"] == 1:
-                Payment.objects.create(
-                    contract=rental_contract,
-                    amount=amount,
-                    payment_type="rent" if payment_type == "Aluguel" else "deposit",
-                    transaction_hash=tx_hash.hex(),
-                    is_verified=True,
-                )
-
-                # Registrar o evento de pagamento
-                ContractEvent.objects.create(
-                    contract=rental_contract,
-                    event_type=(
-                        "pay_rent" if payment_type == "Aluguel" else "pay_deposit"
-                    ),
-                    event_data={
-                        "tx_hash": tx_hash.hex(),
-                        "from_address": account_to_pay.address,
-                        "amount": amount,
-                    },
-                    transaction_hash=tx_hash.hex(),
-                    user_address=account_to_pay.address,
+                register_payment(
+                    rental_contract, amount, payment_type, account_to_pay.address, tx_hash.hex()
                 )
+                refresh_after_write(web3, [rental_contract])
 
                 return Response(
                     {
@@ -374,6 +727,8 @@ def register_payment_api(request, contract_id):
                     {"error": "Falha na transação de pagamento."}, status=500
                 )
 
+        except TransactionReverted as e:
+            return revert_response(e)
         except Exception as e:
             return Response(
                 {"error": f"Erro ao registrar pagamento: {str(e)}"}, status=500
@@ -388,38 +743,273 @@ def register_payment_api(request, contract_id):
             status=500,
         )
 
+PAYMENT_FUNCTIONS = {"Aluguel": "payRent", "Depósito": "payDeposit"}
+
+@api_view(["POST"])
+@buffered_events()
+def batch_register_payments_api(request):
+    """
+    Paga vários contratos em uma requisição. Os valores são conferidos com o
+    aluguel e o depósito lidos da blockchain (em cache, pois não mudam), as
+    transações são assinadas com nonces sequenciais e transmitidas em
+    sequência. Itens inválidos ou que falham não interrompem os demais; a
+    resposta traz o resultado de cada um, na ordem recebida.
+    """
+    try:
+        web3 = check_connection()
+    except Exception as e:
+        return Response(
+            {"error": "Falha na conexão com a rede Ethereum: " + str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    specs = request.data.get("payments")
+    if not isinstance(specs, list) or not specs:
+        return Response(
+            {"error": "O campo 'payments' deve ser uma lista não vazia."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(specs) > settings.BATCH_PAYMENT_MAX_ITEMS:
+        return Response(
+            {"error": f"O lote aceita no máximo {settings.BATCH_PAYMENT_MAX_ITEMS} pagamentos."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        account = web3.eth.account.from_key(request.data.get("private_key"))
+    except (TypeError, ValueError):
+        return Response({"error": "Chave privada inválida."}, status=status.HTTP_400_BAD_REQUEST)
+
+    items = [{"index": index, "status": "failed"} for index in range(len(specs))]
+    valid = []
+    for index, spec in enumerate(specs):
+        spec = spec if isinstance(spec, dict) else {}
+        try:
+            contract_id = int(spec.get("contract_id"))
+            amount = int(spec.get("amount"))
+        except (TypeError, ValueError):
+            items[index]["error"] = "Os campos 'contract_id' e 'amount' devem ser inteiros."
+            continue
+        if amount <= 0:
+            items[index]["error"] = "Valor do pagamento inválido."
+        elif spec.get("payment_type") not in PAYMENT_FUNCTIONS:
+            items[index]["error"] = "Tipo de pagamento inválido."
+        else:
+            valid.append((index, contract_id, spec["payment_type"], amount))
+        items[index]["contract_id"] = contract_id
+
+    try:
+        rental_contracts = RentalContract.objects.in_bulk([contract_id for _, contract_id, _, _ in valid])
+        payable = []
+        for index, contract_id, payment_type, amount in valid:
+            rental_contract = rental_contracts.get(contract_id)
+            if rental_contract is None:
+                items[index]["error"] = "Contrato não encontrado."
+            elif account.address.lower() not in (rental_contract.landlord.lower(), rental_contract.tenant.lower()):
+                items[index]["error"] = "Somente o locador ou o inquilino podem registrar pagamentos."
+            else:
+                payable.append((index, rental_contract, payment_type, amount))
+
+        smart_contracts = [get_rental_contract(web3, rental_contract) for _, rental_contract, _, _ in payable]
+        terms = read_payment_terms(web3, smart_contracts)
+
+        calls, to_send = [], []
+        for (index, rental_contract, payment_type, amount), smart_contract, contract_terms in zip(
+            payable, smart_contracts, terms
+        ):
+            expected_amount = (
+                contract_terms.rent_amount if payment_type == "Aluguel" else contract_terms.deposit_amount
+            )
+            if amount != expected_amount:
+                items[index]["error"] = (
+                    f"Valor incorreto para {payment_type}. Esperado: {expected_amount} Wei, Recebido: {amount} Wei"
+                )
+                continue
+            tx_function = getattr(smart_contract.functions, PAYMENT_FUNCTIONS[payment_type])()
+            calls.append((tx_function, None, amount))
+            to_send.append((index, rental_contract, payment_type, amount))
+
+        sent = []
+        for (index, rental_contract, payment_type, amount), (tx_hash, error) in zip(
+            to_send, send_batch(web3, calls, account, request.data.get("urgency"))
+        ):
+            if tx_hash is None:
+                items[index]["error"] = error
+                continue
+            items[index]["tx_hash"] = tx_hash.hex()
+            sent.append((index, rental_contract, payment_type, amount, tx_hash))
+
+        receipts = wait_for_receipts(
+            web3, [tx_hash for *_, tx_hash in sent], timeout=settings.TRANSACTION_RECEIPT_TIMEOUT
+        )
+
+        paid, unconfirmed = [], []
+        for index, rental_contract, payment_type, amount, tx_hash in sent:
+            receipt = receipts.get(tx_hash)
+            if receipt is None:
+                unconfirmed.append((index, rental_contract, payment_type, amount))
+            elif receipt["status"] == 1:
+                paid.append((index, rental_contract, payment_type, amount))
+            else:
+                items[index]["error"] = "Falha na transação de pagamento."
+
+        with db_transaction.atomic():
+            register_payments(
+                [
+                    (rental_contract, amount, payment_type, account.address, items[index]["tx_hash"])
+                    for index, rental_contract, payment_type, amount in paid
+                ]
+            )
+            # Sem recibo no prazo: o worker continua acompanhando como no modo assíncrono
+            pending_transactions = PendingTransaction.objects.bulk_create(
+                [
+                    PendingTransaction(
+                        tx_hash=items[index]["tx_hash"],
+                        action="pay_rent" if payment_type == "Aluguel" else "pay_deposit",
+                        contract=rental_contract,
+                        payload={"from_address": account.address, "amount": amount, "payment_type": payment_type},
+                    )
+                    for index, rental_contract, payment_type, amount in unconfirmed
+                ]
+            )
+            for pending in pending_transactions:
+                db_transaction.on_commit(lambda pending_id=pending.id: acompanhar_transacao.delay(pending_id))
+        refresh_after_write(
+            web3, list({rental_contract.id: rental_contract for _, rental_contract, _, _ in paid}.values())
+        )
+
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    for index, *_ in paid:
+        items[index]["status"] = "paid"
+    for index, *_ in unconfirmed:
+        items[index].update(
+            status="pending",
+            status_url=request.build_absolute_uri(reverse("transaction_status", args=[items[index]["tx_hash"]])),
+        )
+
+    return Response(
+        {"paid": len(paid), "failed": len(items) - len(paid) - len(unconfirmed), "items": items},
+        status=status.HTTP_200_OK if len(paid) == len(items) else status.HTTP_207_MULTI_STATUS,
+    )
+
+CHAIN_STATE_FILTERS = {
+    "terminated": "chain_state__is_terminated",
+    "active": "chain_state__is_active",
+    "landlord_signed": "chain_state__landlord_signed",
+    "tenant_signed": "chain_state__tenant_signed",
+}
+
+
+def filter_chain_state(contracts, params):
+    """Filtros pelo snapshot on-chain (`?terminated=true`, `?fully_signed=false`...)."""
+    for param, lookup in CHAIN_STATE_FILTERS.items():
+        if params.get(param) is not None:
+            contracts = contracts.filter(**{lookup: params[param].lower() == "true"})
+
+    fully_signed = params.get("fully_signed")
+    if fully_signed is not None:
+        signed = Q(chain_state__landlord_signed=True, chain_state__tenant_signed=True)
+        contracts = contracts.filter(signed if fully_signed.lower() == "true" else ~signed)
+    return contracts
+
+
+def chain_state_data(rental_contract):
+    try:
+        chain_state = rental_contract.chain_state
+    except ContractChainState.DoesNotExist:
+        return None
+    return format_chain_state({field: getattr(chain_state, field) for field in SNAPSHOT_FIELDS})
+
+
+def format_chain_state(values):
+    # Sem snapshot, o LEFT JOIN de `.values()` traz todos os campos nulos
+    if values["block_number"] is None:
+        return None
+    return {
+        "landlord_signed": values["landlord_signed"],
+        "tenant_signed": values["tenant_signed"],
+        "is_fully_signed": values["landlord_signed"] and values["tenant_signed"],
+        "is_terminated": values["is_terminated"],
+        "is_active": values["is_active"],
+        "rent_amount": str(values["rent_amount"]),
+        "deposit_amount": str(values["deposit_amount"]),
+        "end_timestamp": values["end_timestamp"],
+        "block_number": values["block_number"],
+        "updated_at": values["updated_at"],
+    }
+
+
+CONTRACT_LIST_FIELDS = [
+    "id",
+    "landlord",
+    "tenant",
+    "rent_amount",
+    "deposit_amount",
+    "start_date",
+    "end_date",
+    "contract_address",
+    "agreement_id",
+    "status",
+    "created_at",
+    "chain_state",
+]
+
+
+def contract_list_columns(fields):
+    """Colunas para `.values()`: as pedidas mais a chave do cursor (created_at, id)."""
+    columns = {"id", "created_at", *fields} - {"chain_state"}
+    if "chain_state" in fields:
+        columns |= {f"chain_state__{field}" for field in SNAPSHOT_FIELDS}
+    return sorted(columns)
+
+
+def contract_list_item(row, fields):
+    item = {}
+    for field in fields:
+        if field == "chain_state":
+            item[field] = format_chain_state({name: row[f"chain_state__{name}"] for name in SNAPSHOT_FIELDS})
+        elif field in ("rent_amount", "deposit_amount", "start_date", "end_date"):
+            item[field] = str(row[field])
+        else:
+            item[field] = row[field]
+    return item
+
 @api_view(["GET"])
 def contract_list_api(request):
-    tenant = request.query_params.get("tenant", None)
-    contract_status = request.query_params.get("status", None)
+    """
+    Lista contratos do mais recente ao mais antigo, paginados por cursor:
+    `?cursor=` recebe o `next_cursor` da página anterior e `?limit=` vai até
+    CONTRACT_LIST_MAX_LIMIT. `?fields=id,status` restringe as colunas lidas
+    do banco. Filtros: landlord, tenant, status e os do snapshot on-chain.
+    """
+    params = request.query_params
+    try:
+        limit = parse_limit(params.get("limit"), settings.CONTRACT_LIST_DEFAULT_LIMIT, settings.CONTRACT_LIST_MAX_LIMIT)
+        fields = parse_fields(params.get("fields"), CONTRACT_LIST_FIELDS)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
     contracts = RentalContract.objects.all()
+    for param in ("landlord", "tenant", "status"):
+        if params.get(param):
+            contracts = contracts.filter(**{param: params[param]})
 
-    # Filtrar pelo tenant (inquilino)
-    if tenant:
-        contracts = contracts.filter(tenant=tenant)
+    # Estado on-chain vem do snapshot em ContractChainState, sem consultar o nó
+    contracts = filter_chain_state(contracts, params)
 
-    # Filtrar pelo status do contrato
-    if contract_status:
-        contracts = contracts.filter(status=contract_status)
+    try:
+        rows, next_cursor = keyset_page(
+            contracts.values(*contract_list_columns(fields)), "created_at", params.get("cursor"), limit
+        )
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Formatar os dados dos contratos como no 'contract_list_api'
-    contracts_data = [
-        {
-            "id": contract.id,
-            "landlord": contract.landlord,
-            "tenant": contract.tenant,
-            "rent_amount": str(contract.rent_amount),
-            "deposit_amount": str(contract.deposit_amount),
-            "start_date": str(contract.start_date),
-            "end_date": str(contract.end_date),
-            "contract_address": contract.contract_address,
-            "status": contract.status,
-            "created_at": contract.created_at,
-        }
-        for contract in contracts
-    ]
-    return Response(contracts_data, status=status.HTTP_200_OK)
+    return Response(
+        {"results": [contract_list_item(row, fields) for row in rows], "next_cursor": next_cursor},
+        status=status.HTTP_200_OK,
+    )
 
 @api_view(["POST"])
 def terminate_contract_api(request, contract_id):
@@ -450,46 +1040,30 @@ def terminate_contract_api(request, contract_id):
             status=400,
         )
 
-    smart_contract = web3.eth.contract(
-        address=Web3.to_checksum_address(rental_contract.contract_address),
-        abi=contract_abi,
-    )
+    smart_contract = get_rental_contract(web3, rental_contract)
 
     try:
-        tx = smart_contract.functions.terminateContract().build_transaction(
-            {
-                "from": account_to_terminate.address,
-                "nonce": web3.eth.get_transaction_count(account_to_terminate.address),
-                "gas": 200000,
-                "gasPrice": web3.to_wei("20", "gwei"),
-            }
+        tx_hash = send_transaction(
+            web3,
+            smart_contract.functions.terminateContract(),
+            account_to_terminate,
+            fee_tier=request.data.get("urgency"),
         )
 
-        signed_tx = web3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        if async_requested(request):
+            return submit_async(
+                request,
+                tx_hash,
+                "terminate",
+                {"from_address": account_to_terminate.address},
+                rental_contract,
+            )
 
         tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
 
         if tx_receipt["status"] == 1:
-            rental_contract.status = "terminated"
-            rental_contract.save()
-
-            ContractTermination.objects.create(
-                contract=rental_contract,
-                terminated_by=account_to_terminate.address,
-                termination_transaction_hash=tx_hash.hex(),
-            )
-
-            ContractEvent.objects.create(
-                contract=rental_contract,
-                event_type="terminate",
-                event_data={
-                    "from_address": account_to_terminate.address,
-                    "details": "Contrato encerrado.",
-                },
-                transaction_hash=tx_hash.hex(),
-                user_address=account_to_terminate.address,
-            )
+            register_termination(rental_contract, account_to_terminate.address, tx_hash.hex())
+            refresh_after_write(web3, [rental_contract])
 
             return Response(
                 {
@@ -503,26 +1077,96 @@ def terminate_contract_api(request, contract_id):
                 {"error": "Falha na transação de encerramento."}, status=500
             )
 
+    except TransactionReverted as e:
+        return revert_response(e)
     except Exception as e:
         return Response({"error": str(e)}, status=500)
 
+CONTRACT_EVENT_COLUMNS = [
+    "id",
+    "event_type",
+    "transaction_hash",
+    "user_address",
+    "event_data",
+    "timestamp",
+    "block_number",
+    "gas_used",
+]
+
 @api_view(["GET"])
 def contract_events_api(request, contract_id):
+    """
+    Eventos do contrato do mais recente ao mais antigo, paginados por cursor
+    em (timestamp, id). Filtros: `event_type` (um ou vários, separados por
+    vírgula) e a janela `since`/`until`.
+    """
+    params = request.query_params
+    try:
+        limit = parse_limit(
+            params.get("limit"), settings.CONTRACT_EVENTS_DEFAULT_LIMIT, settings.CONTRACT_EVENTS_MAX_LIMIT
+        )
+        since = parse_date_param(params.get("since"))
+        until = parse_date_param(params.get("until"), end_of_day=True)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     rental_contract = get_object_or_404(RentalContract, id=contract_id)
     events = rental_contract.events.all()
+    if params.get("event_type"):
+        events = events.filter(event_type__in=params["event_type"].split(","))
+    if since:
+        events = events.filter(timestamp__gte=since)
+    if until:
+        events = events.filter(timestamp__lte=until)
+
+    try:
+        rows, next_cursor = keyset_page(
+            events.values(*CONTRACT_EVENT_COLUMNS),
+            "timestamp",
+            params.get("cursor"),
+            limit,
+        )
+    except InvalidCursor as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     event_data = [
         {
-            "event_type": event.event_type,
-            "tx_hash": event.transaction_hash,
-            "from_address": event.user_address,
-            "event_data": event.event_data,
-            "timestamp": event.timestamp,
-            "block_number": event.block_number,
-            "gas_used": event.gas_used,
+            "id": row["id"],
+            "event_type": row["event_type"],
+            "tx_hash": row["transaction_hash"],
+            "from_address": row["user_address"],
+            "event_data": row["event_data"],
+            "timestamp": row["timestamp"],
+            "block_number": row["block_number"],
+            "gas_used": row["gas_used"],
         }
-        for event in events
+        for row in rows
     ]
-    return Response(event_data)
+    return Response({"results": event_data, "next_cursor": next_cursor})
+
+# View Django simples: no DRF, `?format=` é reservado para a negociação de conteúdo
+@require_GET
+def export_api(request, dataset):
+    """
+    Exporta contratos, pagamentos ou eventos em NDJSON (padrão) ou CSV
+    (`?format=csv`), transmitindo as linhas à medida que saem do banco.
+    Filtros: `since`/`until` (AAAA-MM-DD) e `status` do contrato.
+    """
+    output_format = request.GET.get("format", "ndjson")
+    try:
+        lines = stream_export(
+            dataset,
+            output_format,
+            since=parse_date_param(request.GET.get("since")),
+            until=parse_date_param(request.GET.get("until"), end_of_day=True),
+            contract_status=request.GET.get("status"),
+        )
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[output_format])
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{output_format}"'
+    return response
 
 @api_view(["POST"])
 def simular_tempo(request, contract_id):
@@ -552,12 +1196,10 @@ def simular_tempo(request, contract_id):
                 {"error": "A data simulada deve ser no futuro."}, status=400
             )
 
-        contract_instance = web3.eth.contract(
-            address=contrato.contract_address, abi=contract_abi
-        )
+        contract_instance = get_rental_contract(web3, contrato)
 
         # Verificar se o contrato está ativo
-        is_active = contract_instance.functions.isContractActive().call()
+        is_active = cached_call(web3, contract_instance.functions.isContractActive())
         if not is_active:
             return Response({"error": "O contrato não está ativo."}, status=400)
 
@@ -568,8 +1210,7 @@ def simular_tempo(request, contract_id):
             ).transact(
                 {
                     "from": web3.eth.account.from_key(private_key).address,
-                    "gas": 3000000,
-                    "gasPrice": web3.to_wei("20", "gwei"),
+                    **get_fee_oracle().fee_params(web3),
                 }
             )
 
@@ -638,47 +1279,48 @@ def get_landlord_address(request):
         return JsonResponse({"success": False, "error": "Locador não encontrado"}, status=404)
     
 @api_view(["POST"])
+@buffered_events()
 def check_and_auto_renew(request):
     web3 = check_connection()
     contracts = RentalContract.objects.filter(status="active")
 
     for contract in contracts:
         try:
-            smart_contract = web3.eth.contract(
-                address=Web3.to_checksum_address(contract.contract_address),
-                abi=contract_abi,
-            )
+            smart_contract = get_rental_contract(web3, contract)
 
             # Obter a data de término do contrato no blockchain
-            contract_end_date = smart_contract.functions.getContractEndDate().call()
+            contract_end_date = cached_call(web3, smart_contract.functions.getContractEndDate())
 
             # Verificar se o contrato precisa ser renovado
             if int(time.time()) >= contract_end_date:
-                # Chamar a função de renovação automaticamente
-                tx = smart_contract.functions.autoRenew().build_transaction({
-                    "from": contract.landlord,
-                    "nonce": web3.eth.get_transaction_count(contract.landlord),
-                    "gas": 200000,
-                    "gasPrice": web3.to_wei("20", "gwei"),
-                })
-
                 # Descriptografar a chave privada do locador
                 landlord_user = Usuario.objects.get(wallet_address=contract.landlord)
                 private_key = decrypt_key(landlord_user.private_key)
 
-                # Assinar e enviar a transação
-                signed_tx = web3.eth.account.sign_transaction(tx, private_key)
-                tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                # Chamar a função de renovação automaticamente
+                tx_hash = send_transaction(
+                    web3,
+                    smart_contract.functions.autoRenew(),
+                    web3.eth.account.from_key(private_key),
+                )
 
-                # Atualizar a nova data de término no modelo
-                new_end_date = smart_contract.functions.getContractEndDate().call()
+                # A nova data vem do evento ContractRenewed do recibo; uma leitura
+                # antes da mineração devolveria a data antiga
+                receipt = web3.eth.wait_for_transaction_receipt(
+                    tx_hash, timeout=settings.TRANSACTION_RECEIPT_TIMEOUT
+                )
+                if receipt["status"] != 1:
+                    raise Exception(f"Falha na transação de renovação (tx {tx_hash.hex()}).")
+                new_end_date = renewed_end_date(receipt, smart_contract)
+                if new_end_date is None:
+                    raise Exception("A transação de renovação não emitiu ContractRenewed.")
                 contract.end_date = datetime.fromtimestamp(new_end_date)
 
                 contract.status = "active"
                 contract.save()
 
                 # Logar evento de renovação no banco
-                ContractEvent.objects.create(
+                record_event(
                     contract=contract,
                     event_type="auto_renew",
                     event_data={"tx_hash": tx_hash.hex(), "new_end_date": new_end_date},
@@ -687,7 +1329,7 @@ def check_and_auto_renew(request):
                 )
 
         except Exception as e:
-            ContractEvent.objects.create(
+            record_event(
                 contract=contract,
                 event_type="error",
                 event_data={"details": str(e)},
@@ -712,11 +1354,11 @@ def get_pending_contracts(request):
             )
 
         if user_type == "landlord":
-            contracts = RentalContract.objects.filter(
+            contracts = RentalContract.objects.select_related("chain_state").filter(
                 landlord=user_address, status="pending"
             )
         elif user_type == "tenant":
-            contracts = RentalContract.objects.filter(
+            contracts = RentalContract.objects.select_related("chain_state").filter(
                 tenant=user_address, status="pending"
             )
         else:
@@ -741,3 +1383,44 @@ def fetch_users(request):
         return Response(users, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["GET"])
+def transaction_status_api(request, tx_hash):
+    """
+    Retorna o estado de uma transação enviada em modo assíncrono.
+    """
+    pending = get_object_or_404(
+        PendingTransaction.objects.select_related("contract__chain_state"), tx_hash=tx_hash
+    )
+    return Response(
+        {
+            "tx_hash": pending.tx_hash,
+            "action": pending.action,
+            "status": pending.status,
+            "contract_id": pending.contract_id,
+            "chain_state": chain_state_data(pending.contract) if pending.contract else None,
+            "block_number": pending.block_number,
+            "gas_used": pending.gas_used,
+            "error": pending.error,
+            "created_at": pending.created_at,
+            "resolved_at": pending.resolved_at,
+        },
+        status=status.HTTP_200_OK,
+    )
+
+@api_view(["GET"])
+def blockchain_metrics_api(request):
+    """
+    Retorna métricas da camada de acesso à blockchain do worker atual.
+    """
+    return Response(
+        {
+            "connection_pool": get_connection_pool().get_stats(),
+            "contract_cache": get_contract_cache().get_stats(),
+            "fee_oracle": get_fee_oracle().get_stats(),
+            "gas_estimates": get_gas_estimator().get_stats(),
+            "view_cache": get_view_cache().get_stats(),
+        },
+        status=status.HTTP_200_OK,
+    )
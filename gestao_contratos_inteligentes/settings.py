@@ -46,6 +46,63 @@ CELERY_RESULT_BACKEND = "django-db"  # Salvar resultados das tarefas no banco
 CELERY_ACCEPT_CONTENT = ["json"]  # Aceitar apenas JSON
 CELERY_TASK_SERIALIZER = "json"  # Serializar tarefas como JSON
 
+# Envio assíncrono de transações: a API responde 202 e um worker Celery acompanha o recibo
+ASYNC_TRANSACTIONS = os.getenv("ASYNC_TRANSACTIONS", "False") == "True"
+TRANSACTION_RECEIPT_TIMEOUT = int(os.getenv("TRANSACTION_RECEIPT_TIMEOUT", "30"))
+# Intervalo entre consultas do worker ao recibo de uma transação ainda não minerada
+TRANSACTION_RECEIPT_POLL_SECONDS = int(os.getenv("TRANSACTION_RECEIPT_POLL_SECONDS", "15"))
+# Criação otimista: responde com o endereço previsto (remetente + nonce) antes da mineração
+OPTIMISTIC_CREATE = os.getenv("OPTIMISTIC_CREATE", "False") == "True"
+# Máximo de contratos por requisição em /api/contracts/batch_create/
+BATCH_CREATE_MAX_ITEMS = int(os.getenv("BATCH_CREATE_MAX_ITEMS", "50"))
+# Máximo de pagamentos por requisição em /api/payments/batch/
+BATCH_PAYMENT_MAX_ITEMS = int(os.getenv("BATCH_PAYMENT_MAX_ITEMS", "100"))
+# Paginação por cursor de /api/contracts/: tamanho padrão e máximo de `?limit=`
+CONTRACT_LIST_DEFAULT_LIMIT = int(os.getenv("CONTRACT_LIST_DEFAULT_LIMIT", "50"))
+CONTRACT_LIST_MAX_LIMIT = int(os.getenv("CONTRACT_LIST_MAX_LIMIT", "500"))
+# Paginação por cursor de /api/contracts/<id>/events/
+CONTRACT_EVENTS_DEFAULT_LIMIT = int(os.getenv("CONTRACT_EVENTS_DEFAULT_LIMIT", "50"))
+CONTRACT_EVENTS_MAX_LIMIT = int(os.getenv("CONTRACT_EVENTS_MAX_LIMIT", "500"))
+# Linhas lidas do banco por vez nas exportações em /api/export/ e no comando exportar_dados
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+# Eventos acumulados por buffered_events antes de cada bulk_create
+EVENT_BUFFER_FLUSH_SIZE = int(os.getenv("EVENT_BUFFER_FLUSH_SIZE", "200"))
+# Contratos lidos e gravados por lote na renovação automática
+RENEWAL_CHUNK_SIZE = int(os.getenv("RENEWAL_CHUNK_SIZE", "1000"))
+
+# Oráculo de taxas: amostra eth_feeHistory em segundo plano e sugere taxas EIP-1559 por urgência
+FEE_ORACLE_BACKGROUND = os.getenv("FEE_ORACLE_BACKGROUND", "True") == "True"
+FEE_REFRESH_SECONDS = float(os.getenv("FEE_REFRESH_SECONDS", "12"))
+FEE_HISTORY_BLOCKS = int(os.getenv("FEE_HISTORY_BLOCKS", "20"))
+FEE_MIN_PRIORITY_GWEI = float(os.getenv("FEE_MIN_PRIORITY_GWEI", "1"))
+FEE_DEFAULT_TIER = os.getenv("FEE_DEFAULT_TIER", "standard")  # slow, standard ou fast
+# Estimativas de gás por função, reaproveitadas por GAS_ESTIMATE_TTL segundos
+GAS_ESTIMATE_TTL = float(os.getenv("GAS_ESTIMATE_TTL", "600"))
+GAS_ESTIMATE_MARGIN = float(os.getenv("GAS_ESTIMATE_MARGIN", "1.25"))
+# Renovação em segundo plano (pela thread do oráculo de taxas) e limite de funções guardadas
+GAS_ESTIMATE_REFRESH_SECONDS = float(os.getenv("GAS_ESTIMATE_REFRESH_SECONDS", "120"))
+GAS_ESTIMATE_MAX_ENTRIES = int(os.getenv("GAS_ESTIMATE_MAX_ENTRIES", "256"))
+# Nonces reservados localmente; a rede só é consultada periodicamente ou após falhas
+NONCE_RESYNC_SECONDS = int(os.getenv("NONCE_RESYNC_SECONDS", "60"))
+NONCE_GAP_GRACE_SECONDS = int(os.getenv("NONCE_GAP_GRACE_SECONDS", "120"))
+
+# Indexador de eventos on-chain (ContractEvent a partir de eth_getLogs)
+INDEXER_START_BLOCK = int(os.getenv("INDEXER_START_BLOCK", "0"))
+INDEXER_BLOCK_RANGE = int(os.getenv("INDEXER_BLOCK_RANGE", "2000"))
+INDEXER_CONFIRMATIONS = int(os.getenv("INDEXER_CONFIRMATIONS", "0"))
+# Snapshots do estado on-chain (ContractChainState): contratos lidos por requisição na varredura
+CHAIN_STATE_SWEEP_BATCH = int(os.getenv("CHAIN_STATE_SWEEP_BATCH", "100"))
+
+# Fábrica de clones EIP-1167; sem endereço, cada contrato é implantado por completo
+RENTAL_FACTORY_ADDRESS = os.getenv("RENTAL_FACTORY_ADDRESS") or None
+
+# "contract": um contrato por locação; "registry": acordos dentro do RentalRegistry
+RENTAL_BACKEND = os.getenv("RENTAL_BACKEND", "contract")
+RENTAL_REGISTRY_ADDRESS = os.getenv("RENTAL_REGISTRY_ADDRESS") or None
+
+# Conta que paga o envio das assinaturas EIP-712 quando a requisição não traz chave privada
+RELAYER_PRIVATE_KEY = os.getenv("RELAYER_PRIVATE_KEY") or None
+
 CORS_ALLOWED_ORIGINS = [
     "https://gestaocontratosinteligentes-a3apaqfsc7b0abgh.brazilsouth-01.azurewebsites.net",
     "https://gestaocontratosinteligentes-a3apaqfsc7b0abgh.brazilsouth-01.azurewebsites.net:8501",
@@ -173,6 +230,11 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        'contratos_inteligentes': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         'myapp': {  # Configuração para um app específico, se necessário
             'handlers': ['file', 'console'],
             'level': 'DEBUG',
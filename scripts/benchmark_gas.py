@@ -0,0 +1,126 @@
+"""
+Compara o gás de implantação e das funções principais entre as versões do
+RentalAgreement em uma cadeia eth-tester em memória.
+
+Com --criacoes N, compara também a criação de N contratos implantando o
+bytecode completo e por clones EIP-1167 da RentalAgreementFactory.
+
+Uso: python scripts/compilar_contrato.py && python scripts/benchmark_gas.py
+"""
+import argparse
+import json
+import os
+import time
+
+from eth_tester import EthereumTester, PyEVMBackend  # type: ignore
+from web3 import Web3  # type: ignore
+from web3.providers.eth_tester import EthereumTesterProvider  # type: ignore
+
+base_path = os.path.dirname(os.path.abspath(__file__))
+build_dir = os.path.join(base_path, "..", "build")
+
+VERSIONS = ["RentalAgreement", "RentalAgreementV2"]
+RENT = Web3.to_wei(1, "ether")
+DEPOSIT = Web3.to_wei(2, "ether")
+
+
+def load_artifact(name):
+    path = os.path.join(build_dir, f"{name}.artifact.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as artifact_file:
+        return json.load(artifact_file)
+
+
+def measure(artifact):
+    # Cadeia nova para cada versão, com as mesmas contas e o mesmo roteiro
+    web3 = Web3(EthereumTesterProvider(EthereumTester(PyEVMBackend())))
+    landlord, tenant = web3.eth.accounts[:2]
+    now = int(time.time())
+    results = {}
+
+    def transact(label, fn, sender, value=0):
+        tx_hash = fn.transact({"from": sender, "value": value})
+        results[label] = web3.eth.wait_for_transaction_receipt(tx_hash)["gasUsed"]
+
+    factory = web3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+    tx_hash = factory.constructor(tenant, RENT, DEPOSIT, now, now + 30 * 24 * 3600).transact({"from": landlord})
+    receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    results["deploy"] = receipt["gasUsed"]
+
+    contract = web3.eth.contract(address=receipt["contractAddress"], abi=artifact["abi"])
+    transact("signAgreement (locador)", contract.functions.signAgreement(), landlord)
+    transact("signAgreement (inquilino)", contract.functions.signAgreement(), tenant)
+    transact("payDeposit", contract.functions.payDeposit(), tenant, DEPOSIT)
+    transact("payRent", contract.functions.payRent(), tenant, RENT)
+    transact("configurarDataVencimento", contract.functions.configurarDataVencimento(5), landlord)
+    transact("terminateContract", contract.functions.terminateContract(), landlord)
+    return results
+
+
+def measure_creation(count):
+    direct = load_artifact("RentalAgreement")
+    factory_artifact = load_artifact("RentalAgreementFactory")
+    if factory_artifact is None:
+        print("RentalAgreementFactory: artefato não encontrado em build/; execute scripts/compilar_contrato.py.")
+        return
+
+    web3 = Web3(EthereumTesterProvider(EthereumTester(PyEVMBackend())))
+    landlord, tenant = web3.eth.accounts[:2]
+    now = int(time.time())
+    args = (tenant, RENT, DEPOSIT, now, now + 30 * 24 * 3600)
+
+    factory = web3.eth.contract(abi=factory_artifact["abi"], bytecode=factory_artifact["bytecode"])
+    receipt = web3.eth.wait_for_transaction_receipt(factory.constructor().transact({"from": landlord}))
+    factory = web3.eth.contract(address=receipt["contractAddress"], abi=factory_artifact["abi"])
+    print(f"implantação única da fábrica: {receipt['gasUsed']:,} gás")
+
+    paths = {
+        "bytecode completo": lambda: web3.eth.contract(
+            abi=direct["abi"], bytecode=direct["bytecode"]
+        ).constructor(*args),
+        "clone EIP-1167": lambda: factory.functions.createAgreement(*args),
+    }
+    for label, build_call in paths.items():
+        gas = 0
+        started = time.perf_counter()
+        for _ in range(count):
+            tx_hash = build_call().transact({"from": landlord, "gas": 3000000})
+            gas += web3.eth.wait_for_transaction_receipt(tx_hash)["gasUsed"]
+        elapsed = time.perf_counter() - started
+        print(f"{label:<20} {count} criações: {gas // count:>12,} gás/contrato {elapsed / count * 1000:>10.1f} ms/contrato")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório de gás das versões do RentalAgreement.")
+    parser.add_argument("--criacoes", type=int, default=0, help="Compara N criações diretas e por clone.")
+    args = parser.parse_args()
+
+    if args.criacoes:
+        measure_creation(args.criacoes)
+        print()
+
+    report = {}
+    for name in VERSIONS:
+        artifact = load_artifact(name)
+        if artifact is None:
+            print(f"{name}: artefato não encontrado em build/; execute scripts/compilar_contrato.py.")
+            continue
+        report[name] = measure(artifact)
+
+    if not report:
+        return
+
+    labels = list(next(iter(report.values())))
+    names = list(report)
+    print(f"{'operação':<28}" + "".join(f"{name:>20}" for name in names) + (f"{'diferença':>12}" if len(names) == 2 else ""))
+    for label in labels:
+        row = f"{label:<28}" + "".join(f"{report[name][label]:>20,}" for name in names)
+        if len(names) == 2:
+            before, after = (report[name][label] for name in names)
+            row += f"{(after - before) / before:>12.1%}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,154 @@
+import argparse
+import hashlib
 import json
 import os
-from solcx import compile_standard, install_solc
 
-# Instalar a versão do compilador Solidity
-install_solc("0.8.18")
+from solcx import compile_standard, get_installed_solc_versions, install_solc
+
+SOLC_VERSION = "0.8.18"
 
 # Diretório base (o caminho absoluto da pasta do projeto)
 base_path = os.path.dirname(os.path.abspath(__file__))
-build_dir = os.path.join(base_path, "../build")
-os.makedirs(build_dir, exist_ok=True)
-
-# Ler o arquivo do contrato Solidity
-with open("contracts/RentalAgreement.sol", "r") as file:
-    rental_agreement_source = file.read()
-
-compiled_sol = compile_standard({
-    "language": "Solidity",
-    "sources": {
-        "RentalAgreement.sol": {
-            "content": rental_agreement_source
-        }
+project_dir = os.path.join(base_path, "..")
+contracts_dir = os.path.join(project_dir, "contracts")
+build_dir = os.path.join(project_dir, "build")
+
+# Contratos compilados: fonte, configuração do otimizador e arquivos gerados.
+# A v1 mantém os nomes de saída históricos e compila sem otimizador.
+CONTRACTS = {
+    "RentalAgreement": {
+        "source": "RentalAgreement.sol",
+        "optimizer": None,
+        "compiled": "compiled_contract.json",
+        "abi": "RentalAgreementABI.json",
+    },
+    "RentalAgreementV2": {
+        "source": "RentalAgreementV2.sol",
+        "optimizer": {"enabled": True, "runs": 200},
+        "compiled": "RentalAgreementV2.compiled.json",
+        "abi": "RentalAgreementV2ABI.json",
     },
-    "settings": {
+    "RentalAgreementClone": {
+        "source": "RentalAgreementFactory.sol",
+        "imports": ["RentalAgreementV2.sol"],
+        "optimizer": {"enabled": True, "runs": 200},
+        "compiled": "RentalAgreementClone.compiled.json",
+        "abi": "RentalAgreementCloneABI.json",
+    },
+    "RentalAgreementFactory": {
+        "source": "RentalAgreementFactory.sol",
+        "imports": ["RentalAgreementV2.sol"],
+        "optimizer": {"enabled": True, "runs": 200},
+        "compiled": "RentalAgreementFactory.compiled.json",
+        "abi": "RentalAgreementFactoryABI.json",
+    },
+    "RentalRegistry": {
+        "source": "RentalRegistry.sol",
+        "optimizer": {"enabled": True, "runs": 200},
+        "compiled": "RentalRegistry.compiled.json",
+        "abi": "RentalRegistryABI.json",
+    },
+}
+
+
+def outputs(name):
+    config = CONTRACTS[name]
+    return [config["compiled"], config["abi"], f"{name}.artifact.json"]
+
+
+def build_input(name):
+    config = CONTRACTS[name]
+    # Ler o arquivo do contrato Solidity e os que ele importa
+    sources = {}
+    for filename in [config["source"], *config.get("imports", [])]:
+        with open(os.path.join(contracts_dir, filename), "r") as file:
+            sources[filename] = {"content": file.read()}
+
+    settings = {
         "outputSelection": {
             "*": {
                 "*": ["abi", "metadata", "evm.bytecode", "evm.sourceMap"]
             }
         }
     }
-}, solc_version="0.8.18")
+    if config["optimizer"]:
+        settings["optimizer"] = config["optimizer"]
+
+    return {
+        "language": "Solidity",
+        "sources": sources,
+        "settings": settings,
+    }
+
+
+def input_hash(standard_input):
+    # Fontes, configurações e versão do compilador determinam a saída
+    payload = json.dumps({"solc": SOLC_VERSION, "input": standard_input}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def is_up_to_date(name, source_hash):
+    # O hash da entrada fica no próprio artefato versionado, então um checkout
+    # novo já reconhece a compilação sem precisar de um arquivo de cache local
+    if not all(os.path.exists(os.path.join(build_dir, output)) for output in outputs(name)):
+        return False
+    try:
+        with open(os.path.join(build_dir, f"{name}.artifact.json"), "r") as artifact_file:
+            return json.load(artifact_file).get("input_hash") == source_hash
+    except ValueError:
+        return False
+
+
+def ensure_solc():
+    # Instala o compilador apenas se a versão ainda não estiver disponível
+    if SOLC_VERSION not in {str(version) for version in get_installed_solc_versions()}:
+        install_solc(SOLC_VERSION)
+
+
+def write_outputs(name, compiled_sol, source_hash):
+    config = CONTRACTS[name]
+    contract = compiled_sol["contracts"][config["source"]][name]
+
+    # Escrever a ABI e Bytecode em arquivos JSON dentro da pasta build
+    with open(os.path.join(build_dir, config["compiled"]), "w") as f:
+        json.dump(compiled_sol, f)
+
+    abi = contract["abi"]
+    with open(os.path.join(build_dir, config["abi"]), "w") as abi_file:
+        json.dump(abi, abi_file)
+
+    # Artefato enxuto lido pela aplicação em tempo de execução (sem metadata e
+    # source maps). Ele é escrito por último: o hash da entrada só aparece
+    # depois que todas as saídas foram gravadas.
+    bytecode = contract["evm"]["bytecode"]["object"]
+    content_hash = hashlib.sha256(json.dumps({"abi": abi, "bytecode": bytecode}, sort_keys=True).encode()).hexdigest()
+    with open(os.path.join(build_dir, f"{name}.artifact.json"), "w") as artifact_file:
+        json.dump(
+            {"abi": abi, "bytecode": bytecode, "content_hash": content_hash, "input_hash": source_hash},
+            artifact_file,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila os contratos Solidity para a pasta build.")
+    parser.add_argument("--force", action="store_true", help="Recompila mesmo que as fontes não tenham mudado.")
+    args = parser.parse_args()
+
+    os.makedirs(build_dir, exist_ok=True)
+
+    for name in CONTRACTS:
+        standard_input = build_input(name)
+        source_hash = input_hash(standard_input)
+
+        if not args.force and is_up_to_date(name, source_hash):
+            print(f"{name} sem alterações; usando a compilação em cache.")
+            continue
 
-# Escrever a ABI e Bytecode em arquivos JSON dentro da pasta build
-with open("build/compiled_contract.json", "w") as f:
-    json.dump(compiled_sol, f)
+        ensure_solc()
+        compiled_sol = compile_standard(standard_input, solc_version=SOLC_VERSION)
+        write_outputs(name, compiled_sol, source_hash)
+        print(f"{name} compilado com sucesso.")
 
-with open("build/RentalAgreementABI.json", "w") as abi_file:
-    abi = compiled_sol["contracts"]["RentalAgreement.sol"]["RentalAgreement"]["abi"]
-    json.dump(abi, abi_file)
 
-print("Contrato compilado com sucesso.")
+if __name__ == "__main__":
+    main()
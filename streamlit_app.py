@@ -4,6 +4,7 @@ import random
 import pandas as pd
 import os
 import base64
+from urllib.parse import urlencode
 from datetime import datetime, date, timedelta
 from dotenv import load_dotenv # type:ignore
 from web3 import Web3 # type:ignore
@@ -38,19 +39,44 @@ def get_address_from_private_key(private_key):
     account = Web3().eth.account.from_key(private_key)
     return account.address
 
-def fetch_contract_events(contract_id):
-    data, success = api_get(f"api/contracts/{contract_id}/events/")
+CONTRACTS_PAGE_SIZE = 50
+EVENTS_PAGE_SIZE = 20
+
+def page_endpoint(path, cursor, limit):
+    params = {"limit": limit}
+    if cursor:
+        params["cursor"] = cursor
+    return f"{path}?{urlencode(params)}"
+
+def fetch_contract_events(contract_id, cursor=None, limit=EVENTS_PAGE_SIZE):
+    # Uma página de eventos, do mais recente ao mais antigo, e o cursor da seguinte
+    data, success = api_get(page_endpoint(f"api/contracts/{contract_id}/events/", cursor, limit))
     if success:
-        return data
+        return data["results"], data["next_cursor"]
     else:
-        return []
+        return [], None
 
-def fetch_contracts():
-    data, success = api_get("api/contracts/")
+def fetch_contracts(cursor=None, limit=CONTRACTS_PAGE_SIZE):
+    # Uma página de contratos e o cursor da seguinte (None na última)
+    data, success = api_get(page_endpoint("api/contracts/", cursor, limit))
     if success:
-        return data
+        return data["results"], data["next_cursor"]
     else:
-        return []
+        return [], None
+
+def current_cursor(key):
+    # Pilha de cursores das páginas visitadas; o topo é a página atual
+    return st.session_state.setdefault(key, [None])[-1]
+
+def pagination_controls(key, next_cursor):
+    cursors = st.session_state.setdefault(key, [None])
+    previous_column, next_column = st.columns(2)
+    if len(cursors) > 1 and previous_column.button("Página anterior", key=f"{key}_previous"):
+        cursors.pop()
+        st.rerun()
+    if next_cursor and next_column.button("Próxima página", key=f"{key}_next"):
+        cursors.append(next_cursor)
+        st.rerun()
     
 def fetch_users():
     response, success = api_get("api/get_users/")
@@ -82,7 +108,8 @@ def preencher_contrato_automaticamente():
 
 def show_visualizar_contratos_page():
     st.title("Lista de Contratos de Aluguel")
-    contracts = fetch_contracts()
+    contracts, next_cursor = fetch_contracts(current_cursor("contracts_cursors"))
+    pagination_controls("contracts_cursors", next_cursor)
 
     if contracts:
         # Exibir tabela inicial com IDs, Locador e locatário
@@ -116,7 +143,8 @@ def show_visualizar_contratos_page():
                 # end_timestamp = int(datetime.combine(end_date, end_time).timestamp())
 
                 # Buscar eventos relacionados ao contrato
-                events = fetch_contract_events(selected_contract["id"])
+                events_key = f"events_cursors_{selected_contract['id']}"
+                events, next_events_cursor = fetch_contract_events(selected_contract["id"], current_cursor(events_key))
 
                 # Mostrar eventos diretamente, sem aninhar expanders
                 st.subheader("Eventos do Contrato")
@@ -132,6 +160,7 @@ def show_visualizar_contratos_page():
                         - **Gas Usado:** {event['gas_used']}  
                         """)
                         st.markdown("---")
+                    pagination_controls(events_key, next_events_cursor)
                 else:
                     st.info("Nenhum evento encontrado para este contrato.")
 
@@ -182,12 +211,12 @@ def buscar_contrato_pendente():
         return None
 
     # Determina o tipo de busca baseado no tipo de usuário
-    endpoint = f"api/contracts/?{'landlord' if is_landlord else 'tenant'}={user_address}&status=pending"
+    endpoint = f"api/contracts/?{'landlord' if is_landlord else 'tenant'}={user_address}&status=pending&limit=1"
     
     response, success = api_get(endpoint)
 
-    if success and response:
-        return response[0]  # Supondo que retorna o contrato pendente mais recente
+    if success and response["results"]:
+        return response["results"][0]  # A API ordena do mais recente ao mais antigo
     else:
         st.error("Nenhum contrato pendente encontrado.")
         return None